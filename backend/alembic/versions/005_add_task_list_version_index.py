@@ -0,0 +1,32 @@
+"""Add (user_id, updated_at) index for task list versions
+
+Backs the ETag query on GET /api/tasks (count and max(updated_at) per user),
+so unchanged polls are answered from the index without touching task rows.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create idx_tasks_user_updated_at"""
+    op.create_index(
+        'idx_tasks_user_updated_at',
+        'tasks',
+        ['user_id', 'updated_at'],
+        postgresql_using='btree'
+    )
+
+
+def downgrade():
+    """Drop idx_tasks_user_updated_at"""
+    op.drop_index('idx_tasks_user_updated_at', table_name='tasks')
@@ -0,0 +1,94 @@
+"""Partial index for pending reminders, archive tables for retention
+
+idx_reminders_scheduled_time indexed every reminder, although fired and
+cancelled rows make up almost all of the table over time. The due-reminder
+claim only reads pending rows, so a partial index on (scheduled_time) WHERE
+status = 'pending' keeps that scan proportional to pending work. Fired and
+cancelled reminders and old notifications are moved to *_archive tables by
+app.workers.retention, keeping the hot tables small.
+
+Indexes are built CONCURRENTLY so the migration does not block writes.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Swap the reminders scheduling index for a partial one, create archive tables"""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_reminders_pending_scheduled_time',
+            'reminders',
+            ['scheduled_time'],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_reminders_scheduled_time',
+            table_name='reminders',
+            postgresql_concurrently=True
+        )
+
+    op.create_table(
+        'reminders_archive',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('scheduled_time', sa.TIMESTAMP(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('notification_channels', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+        sa.Column('fired_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('archived_at', sa.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_reminders_archive_archived_at', 'reminders_archive', ['archived_at'])
+
+    op.create_table(
+        'notifications_archive',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('reminder_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('channel', sa.String(length=20), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempt', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=False),
+        sa.Column('sent_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('archived_at', sa.TIMESTAMP(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_notifications_archive_archived_at', 'notifications_archive', ['archived_at'])
+
+
+def downgrade():
+    """Drop archive tables, restore the full scheduling index"""
+    op.drop_index('ix_notifications_archive_archived_at', table_name='notifications_archive')
+    op.drop_table('notifications_archive')
+    op.drop_index('ix_reminders_archive_archived_at', table_name='reminders_archive')
+    op.drop_table('reminders_archive')
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_reminders_scheduled_time',
+            'reminders',
+            ['scheduled_time'],
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_reminders_pending_scheduled_time',
+            table_name='reminders',
+            postgresql_concurrently=True
+        )
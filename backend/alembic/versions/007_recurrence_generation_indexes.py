@@ -0,0 +1,66 @@
+"""Indexes for the recurring task generator
+
+uq_tasks_recurrence_instance makes generated instances idempotent: the
+generator derives recurrence_instance_id from (pattern, occurrence number)
+and inserts with ON CONFLICT DO NOTHING, so a rerun or an overlapping shard
+never duplicates a task. idx_recurrence_last_generated becomes
+(last_generated_at, id) to back the generator's keyset paging.
+
+Indexes are built CONCURRENTLY so the migration does not block writes.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the instance uniqueness index and the keyset index"""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_tasks_recurrence_instance',
+            'tasks',
+            ['recurrence_instance_id'],
+            unique=True,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_recurrence_last_generated_id',
+            'recurrence_patterns',
+            ['last_generated_at', 'id'],
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_recurrence_last_generated',
+            table_name='recurrence_patterns',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    """Restore the single-column generation index"""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_recurrence_last_generated',
+            'recurrence_patterns',
+            ['last_generated_at'],
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_recurrence_last_generated_id',
+            table_name='recurrence_patterns',
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'uq_tasks_recurrence_instance',
+            table_name='tasks',
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,60 @@
+"""Retry scheduling for the notification dispatcher
+
+notifications.next_attempt_at is when a pending notification may be claimed
+next: creation time at first, then the retry backoff after a failed send, or
+the lease deadline while a dispatcher is sending it. The dispatcher's claim
+reads pending rows in next_attempt_at order, so the partial index keeps that
+scan proportional to pending work. notifications_archive gets the column too,
+since the retention job copies every column.
+
+NOW() is not volatile, so the default is evaluated once and adding the
+column does not rewrite the table; the index is built CONCURRENTLY so the
+migration does not block writes.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add next_attempt_at and the pending-claim index"""
+    op.add_column(
+        'notifications',
+        sa.Column('next_attempt_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()'))
+    )
+    op.add_column(
+        'notifications_archive',
+        sa.Column('next_attempt_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()'))
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_notifications_pending_next_attempt',
+            'notifications',
+            ['next_attempt_at'],
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    """Drop the pending-claim index and next_attempt_at"""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_notifications_pending_next_attempt',
+            table_name='notifications',
+            postgresql_concurrently=True
+        )
+
+    op.drop_column('notifications_archive', 'next_attempt_at')
+    op.drop_column('notifications', 'next_attempt_at')
@@ -0,0 +1,65 @@
+"""Link table for digest notifications
+
+A digest notification delivers every reminder of one user on one channel
+that fired within NOTIFICATION_DIGEST_WINDOW_SECONDS, so notifications to
+reminders becomes many-to-many. notifications.reminder_id stays (the first
+reminder of the digest); notification_reminders links a notification to all
+of its reminders and is backfilled with the existing one-to-one pairs.
+idx_notifications_open_digest covers the lookup of a user's open digests and
+is built CONCURRENTLY so the migration does not block writes.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create and backfill notification_reminders, add the open-digest index"""
+    op.create_table(
+        'notification_reminders',
+        sa.Column('notification_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('reminder_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.PrimaryKeyConstraint('notification_id', 'reminder_id'),
+        sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['reminder_id'], ['reminders.id'], ondelete='CASCADE')
+    )
+    op.create_index('ix_notification_reminders_reminder_id', 'notification_reminders', ['reminder_id'])
+
+    op.execute(
+        "INSERT INTO notification_reminders (notification_id, reminder_id) "
+        "SELECT id, reminder_id FROM notifications"
+    )
+
+    # Open digests a newly fired reminder may join (unsent first attempts)
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_notifications_open_digest',
+            'notifications',
+            ['user_id', 'created_at'],
+            postgresql_where=sa.text("status = 'pending' AND attempt = 0"),
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    """Drop the open-digest index and notification_reminders"""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_notifications_open_digest',
+            table_name='notifications',
+            postgresql_concurrently=True
+        )
+
+    op.drop_index('ix_notification_reminders_reminder_id', table_name='notification_reminders')
+    op.drop_table('notification_reminders')
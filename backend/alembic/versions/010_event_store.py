@@ -0,0 +1,88 @@
+"""Event store positions and projection checkpoints
+
+events.position is the global append order the event store replays in,
+drawn from events_position_seq. Existing events are numbered in created_at
+order before the column becomes NOT NULL. Replay pages by position
+(ix_events_position) and stream reads by (aggregate_type, aggregate_id,
+position) (idx_events_stream, which replaces idx_events_aggregate, its
+prefix). event_checkpoints holds each projection's last applied position.
+
+Backfilling rewrites the events table once inside the migration
+transaction; the new indexes are built CONCURRENTLY afterwards.
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add events.position, event_checkpoints and the replay indexes"""
+    op.execute("CREATE SEQUENCE events_position_seq AS BIGINT")
+    op.add_column('events', sa.Column('position', sa.BigInteger(), nullable=True))
+    op.execute(
+        "UPDATE events SET position = numbered.position "
+        "FROM (SELECT id, row_number() OVER (ORDER BY created_at, id) AS position FROM events) AS numbered "
+        "WHERE events.id = numbered.id"
+    )
+    op.execute("SELECT setval('events_position_seq', COALESCE(MAX(position), 0) + 1, false) FROM events")
+    op.alter_column(
+        'events',
+        'position',
+        nullable=False,
+        server_default=sa.text("nextval('events_position_seq')")
+    )
+    op.execute("ALTER SEQUENCE events_position_seq OWNED BY events.position")
+
+    op.create_table(
+        'event_checkpoints',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('position', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()')),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_position',
+            'events',
+            ['position'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_events_stream',
+            'events',
+            ['aggregate_type', 'aggregate_id', 'position'],
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'idx_events_aggregate',
+            table_name='events',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    """Drop the replay indexes, event_checkpoints and events.position"""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_events_aggregate',
+            'events',
+            ['aggregate_type', 'aggregate_id'],
+            postgresql_concurrently=True
+        )
+        op.drop_index('idx_events_stream', table_name='events', postgresql_concurrently=True)
+        op.drop_index('ix_events_position', table_name='events', postgresql_concurrently=True)
+
+    op.drop_table('event_checkpoints')
+    # Drops events_position_seq too (owned by the column)
+    op.drop_column('events', 'position')
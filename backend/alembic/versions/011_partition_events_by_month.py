@@ -0,0 +1,127 @@
+"""Partition events by month on created_at
+
+events grows by one row per task mutation. As one table, every insert pays
+for B-tree indexes spanning all of history, and old rows can only leave
+through large DELETEs. After this migration events is range-partitioned by
+month:
+
+- inserts touch only the current month's partition and its indexes
+- queries filtered on created_at are pruned to the matching months
+- app.workers.partition_maintenance creates months ahead and can detach
+  (or drop) months past a retention period, which is instant instead of a
+  DELETE. Retention is off by default: events are the source of task
+  history and projections, and a retired month is gone from both (older
+  task histories start truncated, rebuilt projections miss its events).
+
+Partitions are named events_YYYY_MM. The migration creates them from the
+oldest event's month through PARTITIONS_AHEAD months ahead. Rows
+outside every month land in events_default; the maintenance job moves them
+out when it creates their month.
+
+Partitioned tables need the partition key in every unique index, so the
+primary key becomes (id, created_at); ids are random UUIDs, so this does not
+weaken it in practice. created_at gets a BRIN index, which is a few pages per
+partition and nearly free to maintain for append-ordered rows. Position and
+stream reads keep their B-trees.
+
+Existing rows are copied inside the migration transaction. The table is
+locked while they are copied, so run it in a maintenance window for large
+tables.
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+PARTITIONS_AHEAD = 3
+
+COLUMNS = "id, position, event_type, aggregate_type, aggregate_id, user_id, payload, metadata, created_at"
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_table(name: str, partitioned: bool):
+    """events columns and constraints, as a partitioned parent or a plain table"""
+    key = "id, created_at" if partitioned else "id"
+    op.execute(
+        f"""
+        CREATE TABLE {name} (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            position BIGINT NOT NULL DEFAULT nextval('events_position_seq'),
+            event_type VARCHAR(50) NOT NULL,
+            aggregate_type VARCHAR(50) NOT NULL,
+            aggregate_id UUID NOT NULL,
+            user_id UUID,
+            payload JSONB NOT NULL,
+            metadata JSONB,
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            CONSTRAINT {name}_pkey PRIMARY KEY ({key}),
+            CONSTRAINT ck_events_event_type_not_empty CHECK (length(event_type) > 0),
+            CONSTRAINT ck_events_aggregate_type_not_empty CHECK (length(aggregate_type) > 0)
+        ){" PARTITION BY RANGE (created_at)" if partitioned else ""}
+        """
+    )
+
+
+def _replace(old: str):
+    """Copy old into the new events table, drop old and re-own the position sequence"""
+    op.execute(f"INSERT INTO events ({COLUMNS}) SELECT {COLUMNS} FROM {old}")
+    op.execute("ALTER SEQUENCE events_position_seq OWNED BY NONE")
+    op.drop_table(old)
+    op.execute("ALTER SEQUENCE events_position_seq OWNED BY events.position")
+
+
+def upgrade():
+    """Recreate events as a monthly partitioned table"""
+    op.rename_table('events', 'events_unpartitioned')
+    op.execute("ALTER TABLE events_unpartitioned RENAME CONSTRAINT events_pkey TO events_unpartitioned_pkey")
+    _create_table('events', partitioned=True)
+
+    oldest = op.get_bind().execute(
+        sa.text("SELECT date_trunc('month', MIN(created_at))::date FROM events_unpartitioned")
+    ).scalar()
+    current = date.today().replace(day=1)
+    month = min(oldest or current, current)
+    while month <= _add_months(current, PARTITIONS_AHEAD):
+        upper = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE events_{month:%Y_%m} PARTITION OF events "
+            f"FOR VALUES FROM ('{month}') TO ('{upper}')"
+        )
+        month = upper
+    op.execute("CREATE TABLE events_default PARTITION OF events DEFAULT")
+
+    _replace('events_unpartitioned')
+
+    # Defined on the parent, created on every partition (present and future)
+    op.create_index('ix_events_position', 'events', ['position'])
+    op.create_index('idx_events_stream', 'events', ['aggregate_type', 'aggregate_id', 'position'])
+    op.create_index('idx_events_created_at', 'events', ['created_at'], postgresql_using='brin')
+
+
+def downgrade():
+    """Recreate events as a single table"""
+    op.rename_table('events', 'events_partitioned')
+    op.execute("ALTER TABLE events_partitioned RENAME CONSTRAINT events_pkey TO events_partitioned_pkey")
+    _create_table('events', partitioned=False)
+
+    # Dropping the parent drops its partitions
+    _replace('events_partitioned')
+
+    op.create_index('ix_events_position', 'events', ['position'])
+    op.create_index('idx_events_stream', 'events', ['aggregate_type', 'aggregate_id', 'position'])
+    op.create_index('idx_events_created_at', 'events', ['created_at'])
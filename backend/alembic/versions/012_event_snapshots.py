@@ -0,0 +1,41 @@
+"""Aggregate snapshots for the event store
+
+event_snapshots holds an aggregate's state folded up to a position. Task
+history starts from the latest snapshot before the page it serves, so it
+replays a bounded number of events however often a task was edited.
+app.workers.projections writes the snapshots. The primary key
+(aggregate_type, aggregate_id, position) serves the "latest snapshot before
+a position" lookup.
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create event_snapshots"""
+    op.create_table(
+        'event_snapshots',
+        sa.Column('aggregate_type', sa.String(length=50), nullable=False),
+        sa.Column('aggregate_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('position', sa.BigInteger(), nullable=False),
+        sa.Column('state', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=False, server_default=sa.text('NOW()')),
+        sa.PrimaryKeyConstraint('aggregate_type', 'aggregate_id', 'position')
+    )
+
+
+def downgrade():
+    """Drop event_snapshots"""
+    op.drop_table('event_snapshots')
@@ -2,12 +2,16 @@
 
 import os
 import json
+import time
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from sqlmodel import Session, select
 from openai import AsyncOpenAI
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from app.context import request_context
+from app.database import read_session
+from app.metrics import OPENAI_REQUEST_DURATION, OPENAI_TOKENS
 from app.models import ConversationHistory
 try:
     from app.mcp.server import get_tool_definitions, execute_tool
@@ -17,7 +21,7 @@ except ImportError:
         """Fallback when MCP is not available."""
         return []
 
-    async def execute_tool(tool_name: str, session, user_id: int, **kwargs):
+    async def execute_tool(tool_name: str, session=None, user_id: int | None = None, **kwargs):
         """Fallback when MCP is not available."""
         return {"success": False, "error": "MCP tools not available"}
 from app.ai.prompts import SYSTEM_PROMPT
@@ -117,12 +121,15 @@ class TodoAgent:
         Returns:
             dict: Response with message and optional metadata
         """
+        # Read the history before saving the new message, so the read can
+        # go to a replica without waiting for our own write to replicate
+        with read_session(session, "conversation_history") as reader:
+            history = await self.get_conversation_context(reader, user_id, limit=9)
+        history.append({"role": "user", "content": user_message})
+
         # Save user message to history
         await self.save_message(session, user_id, "user", user_message)
 
-        # Get conversation context
-        history = await self.get_conversation_context(session, user_id)
-
         # Build messages for OpenAI
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT}
@@ -138,7 +145,7 @@ class TodoAgent:
         # Only use tools if they are available
         if self.tools is None or len(self.tools) == 0:
             # If no tools available, send request without tools
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
                 model=self.model,
                 messages=messages,
                 max_tokens=self.max_tokens,
@@ -153,7 +160,7 @@ class TodoAgent:
             assistant_message = None
 
             for _ in range(max_tool_rounds):
-                response = await self.client.chat.completions.create(
+                response = await self._create_completion(
                     model=self.model,
                     messages=messages,
                     tools=self.tools,
@@ -172,12 +179,15 @@ class TodoAgent:
                     tool_name = tool_call.function.name
                     tool_args = json.loads(tool_call.function.arguments)
 
-                    tool_result = await execute_tool(
-                        tool_name=tool_name,
-                        session=session,
-                        user_id=user_id,
-                        **tool_args
-                    )
+                    # Tools (and anything they spawn) see this user, session
+                    # and the caller's trace id through the request context.
+                    with request_context(user_id=user_id, session=session):
+                        tool_result = await execute_tool(
+                            tool_name=tool_name,
+                            session=session,
+                            user_id=user_id,
+                            **tool_args
+                        )
 
                     # Keep the latest successful metadata (final action usually matters most).
                     tool_metadata = self._generate_metadata(tool_name, tool_result)
@@ -219,6 +229,32 @@ class TodoAgent:
             "metadata": metadata
         }
 
+    async def _create_completion(self, **kwargs):
+        """Call the chat completions API, recording latency and token usage.
+
+        Args:
+            **kwargs: Arguments for chat.completions.create
+
+        Returns:
+            The chat completion response
+        """
+        outcome = "error"
+        started = time.perf_counter()
+        try:
+            response = await self.client.chat.completions.create(**kwargs)
+            outcome = "ok"
+        finally:
+            OPENAI_REQUEST_DURATION.labels(model=self.model, outcome=outcome).observe(
+                time.perf_counter() - started
+            )
+
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            OPENAI_TOKENS.labels(model=self.model, kind="prompt").inc(usage.prompt_tokens or 0)
+            OPENAI_TOKENS.labels(model=self.model, kind="completion").inc(usage.completion_tokens or 0)
+
+        return response
+
     def _generate_metadata(
         self,
         tool_name: str,
@@ -1,15 +1,22 @@
-"""Authentication utilities for password hashing and JWT."""
+"""Authentication utilities for password hashing and JWT.
+
+passlib (with bcrypt) and jose are imported on first use, not at startup.
+"""
 
 import os
 from datetime import datetime, timedelta
-from passlib.context import CryptContext
-from jose import JWTError, jwt
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def get_pwd_context():
+    """Password hashing context (created on first use)."""
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
 
 # JWT configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "fallback-secret-key-for-development-only")
@@ -19,16 +26,18 @@ ACCESS_TOKEN_EXPIRE_HOURS = int(os.getenv("ACCESS_TOKEN_EXPIRE_HOURS", "24"))
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def create_jwt(user_id: int) -> str:
     """Create a JWT token for a user."""
+    from jose import jwt
+
     expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
     payload = {
         "user_id": user_id,
@@ -39,6 +48,8 @@ def create_jwt(user_id: int) -> str:
 
 def decode_jwt(token: str) -> dict | None:
     """Decode and validate a JWT token."""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         return payload
@@ -0,0 +1,221 @@
+"""Per-user read-through cache for task lists.
+
+A user's tasks only change through the write paths in app/routers/tasks.py
+and app/mcp/tools.py, so list reads can be served from cache until one of
+those paths invalidates the user.
+
+Entries are keyed on (user id, version, filter hash). Invalidation bumps the
+user's version, which orphans every cached list for that user in O(1); the old
+entries age out through LRU eviction or TTL.
+
+Callers put the list ETag (app.http_cache.task_list_etag) in the filters, so
+a write from another worker, replica or job changes the key even when this
+process's version was not bumped.
+
+Backends:
+- memory: in-process LRU (default). Each worker process has its own copy and
+  versions; the ETag in the key keeps the copies consistent.
+- redis:  shared across workers and replicas (requires the redis package and
+  REDIS_URL).
+- none:   caching disabled.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Protocol
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TASK_CACHE_BACKEND = os.getenv("TASK_CACHE_BACKEND", "memory").lower()
+TASK_CACHE_MAX_ENTRIES = int(os.getenv("TASK_CACHE_MAX_ENTRIES", "10000"))
+TASK_CACHE_TTL_SECONDS = float(os.getenv("TASK_CACHE_TTL_SECONDS", "10"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+
+class CacheBackend(Protocol):
+    """Storage interface used by TaskListCache."""
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None on a miss."""
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store bytes or a JSON-compatible value for ttl seconds."""
+
+    def get_version(self, user_id: int) -> int:
+        """Return the user's current cache version."""
+
+    def bump_version(self, user_id: int) -> int:
+        """Invalidate the user's entries by moving to a new version."""
+
+
+class MemoryBackend:
+    """In-process LRU backend with per-entry TTL."""
+
+    def __init__(self, max_entries: int = TASK_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._versions: OrderedDict[int, int] = OrderedDict()
+        # Versions are drawn from one process-wide counter, so a user whose
+        # version was evicted never comes back to a number still in use.
+        self._version_counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_version(self, user_id: int) -> int:
+        with self._lock:
+            version = self._versions.get(user_id)
+            if version is None:
+                version = next(self._version_counter)
+                self._versions[user_id] = version
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self.max_entries:
+                self._versions.popitem(last=False)
+            return version
+
+    def bump_version(self, user_id: int) -> int:
+        with self._lock:
+            version = next(self._version_counter)
+            self._versions[user_id] = version
+            self._versions.move_to_end(user_id)
+            return version
+
+
+# Marks raw bytes values in Redis; JSON text never starts with a NUL byte
+_BYTES_TAG = b"\x00"
+
+
+class RedisBackend:
+    """Redis backend shared by all workers and replicas."""
+
+    def __init__(self, url: str = REDIS_URL, prefix: str = "todo:tasks"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(f"{self.prefix}:{key}")
+        if raw is None:
+            return None
+        return raw[1:] if raw.startswith(_BYTES_TAG) else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        raw = _BYTES_TAG + value if isinstance(value, bytes) else json.dumps(value, default=str)
+        self.client.set(f"{self.prefix}:{key}", raw, px=int(ttl * 1000))
+
+    def get_version(self, user_id: int) -> int:
+        key = f"{self.prefix}:version:{user_id}"
+        version = self.client.get(key)
+        if version is None:
+            # Seed from the clock so a lost version key never reuses old entries
+            self.client.set(key, time.time_ns(), nx=True)
+            version = self.client.get(key)
+        return int(version)
+
+    def bump_version(self, user_id: int) -> int:
+        key = f"{self.prefix}:version:{user_id}"
+        self.get_version(user_id)
+        return int(self.client.incr(key))
+
+
+def filter_hash(view: str, filters: dict) -> str:
+    """Hash a view name and its filters into a short cache key component."""
+    raw = json.dumps({"view": view, **filters}, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+
+class TaskListCache:
+    """Versioned read-through cache for per-user task lists."""
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: float = TASK_CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    def get_or_load(self, user_id: int, view: str, filters: dict, loader: Callable[[], Any]) -> Any:
+        """Return the cached list for these filters, loading it on a miss.
+
+        Args:
+            user_id: Owner of the tasks
+            view: Name of the caller's result shape (e.g. "api", "mcp")
+            filters: Query parameters that affect the result
+            loader: Called on a miss; must return bytes or a JSON-compatible value
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        if self.backend is None:
+            return loader()
+
+        try:
+            version = self.backend.get_version(user_id)
+            key = f"{user_id}:{version}:{filter_hash(view, filters)}"
+            cached = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Task cache read failed for user {user_id}: {e}")
+            return loader()
+
+        if cached is not None:
+            return cached
+
+        value = loader()
+        try:
+            self.backend.set(key, value, self.ttl)
+        except Exception as e:
+            logger.warning(f"Task cache write failed for user {user_id}: {e}")
+        return value
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop every cached list for a user (call after any task write)."""
+        if self.backend is None:
+            return
+        try:
+            self.backend.bump_version(user_id)
+        except Exception as e:
+            logger.error(f"Task cache invalidation failed for user {user_id}: {e}")
+
+
+def _create_backend() -> Optional[CacheBackend]:
+    """Build the backend selected by TASK_CACHE_BACKEND."""
+    if TASK_CACHE_BACKEND == "none":
+        return None
+    if TASK_CACHE_BACKEND == "redis":
+        try:
+            return RedisBackend()
+        except ImportError:
+            logger.warning("redis package not installed, falling back to in-memory task cache")
+    return MemoryBackend()
+
+
+task_cache = TaskListCache(_create_backend())
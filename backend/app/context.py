@@ -0,0 +1,82 @@
+"""Request-scoped context.
+
+Carries the authenticated user, the database session and a trace id for the
+unit of work being served (an API request, an MCP connection, a worker job).
+
+The context lives in a ContextVar, so it follows the work into awaited
+coroutines, asyncio tasks and threadpool calls, and disappears with it. There
+is no shared registry to clean up and nothing to lock.
+"""
+
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from typing import Iterator, Optional
+
+from sqlmodel import Session
+
+
+@dataclass(frozen=True)
+class RequestContext:
+    """Identity and resources of the current unit of work.
+
+    Attributes:
+        user_id: Authenticated user's ID
+        session: Database session bound to the work, if any
+        trace_id: Identifier used to correlate logs and events
+    """
+
+    user_id: Optional[int] = None
+    session: Optional[Session] = None
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+
+_request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Get the context of the current unit of work, if one is bound."""
+    return _request_context.get()
+
+
+@contextmanager
+def request_context(
+    user_id: Optional[int] = None,
+    session: Optional[Session] = None,
+    trace_id: Optional[str] = None
+) -> Iterator[RequestContext]:
+    """Bind a request context for the duration of a block.
+
+    Values that are not given are inherited from the enclosing context, so a
+    nested binding can add a session without losing the caller's trace id.
+
+    Args:
+        user_id: Authenticated user's ID
+        session: Database session to expose to tools and helpers
+        trace_id: Correlation id (e.g. from the X-Request-ID header)
+
+    Yields:
+        RequestContext: The bound context
+    """
+    parent = _request_context.get()
+    if parent is None:
+        ctx = RequestContext(user_id=user_id, session=session, trace_id=trace_id or uuid.uuid4().hex)
+    else:
+        updates = {}
+        if user_id is not None:
+            updates["user_id"] = user_id
+        if session is not None:
+            updates["session"] = session
+        if trace_id:
+            updates["trace_id"] = trace_id
+        ctx = replace(parent, **updates)
+
+    token = _request_context.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _request_context.reset(token)
+
@@ -1,32 +1,232 @@
-"""Database connection and session management."""
+"""Database connection and session management.
+
+Two engines:
+- engine: the primary, used for every write and by default for reads
+- read_engine: a read replica when DATABASE_READ_URL is set, else the primary
+
+Read-only endpoints use get_read_session() and reads inside other work use
+read_session(). Reads go to the primary instead of the replica when the
+current request has already committed to the tables being read, or when the
+client committed something within READ_YOUR_WRITES_SECONDS (tracked with the
+db_primary_until cookie set by the HTTP layer after a write), so users always
+see their own changes despite replica lag.
+
+Both engines are created on first use (``from app.database import engine``
+creates them), so modules that only import helpers from here, like the MCP
+tools in the standalone MCP process, need no DATABASE_URL and open no pool.
+"""
 
 import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+from sqlalchemy import event
 from sqlmodel import create_engine, Session, SQLModel
 from dotenv import load_dotenv
+from app.metrics import DB_POOL_CHECKOUT_WAIT
+from app.query_stats import instrument_engine
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL")
+
+# Pool sizing, per engine and per worker process: the total connection count
+# is roughly workers x replicas x (pool size + max overflow)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", str(DB_POOL_SIZE)))
+DB_READ_MAX_OVERFLOW = int(os.getenv("DB_READ_MAX_OVERFLOW", str(DB_MAX_OVERFLOW)))
+
+# How long after a write the same client keeps reading from the primary
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+PRIMARY_COOKIE = "db_primary_until"
+
+# SQL statement logging (very verbose; development only)
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() == "true"
+
+# Alembic owns the schema; create_all on startup is for local development only
+DB_CREATE_ALL = os.getenv("DB_CREATE_ALL", "false").lower() == "true"
+
+
+def _create_engine(url: str, pool_size: int, max_overflow: int):
+    # Connection pooling for Neon serverless
+    return instrument_engine(create_engine(
+        url,
+        echo=SQL_ECHO,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=True,  # Verify connections before using
+    ))
+
+
+_engine = None
+_read_engine = None
+
+
+def get_engine():
+    """Get the primary engine (created on first use)."""
+    global _engine
+    if _engine is None:
+        if not DATABASE_URL:
+            raise ValueError("DATABASE_URL environment variable is not set")
+        _engine = _create_engine(DATABASE_URL, DB_POOL_SIZE, DB_MAX_OVERFLOW)
+    return _engine
+
+
+def get_read_engine():
+    """Get the read engine: the replica if configured, else the primary."""
+    global _read_engine
+    if _read_engine is None:
+        _read_engine = (
+            _create_engine(DATABASE_READ_URL, DB_READ_POOL_SIZE, DB_READ_MAX_OVERFLOW)
+            if DATABASE_READ_URL
+            else get_engine()
+        )
+    return _read_engine
+
+
+def __getattr__(name: str):
+    # Module attributes engine/read_engine, resolved on first access
+    if name == "engine":
+        return get_engine()
+    if name == "read_engine":
+        return get_read_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass
+class WriteTracker:
+    """Read routing state of one request.
+
+    Attributes:
+        sticky: The client wrote recently (db_primary_until cookie)
+        tables: Tables this request has committed writes to
+    """
+
+    sticky: bool = False
+    tables: set[str] = field(default_factory=set)
+
+    @property
+    def wrote(self) -> bool:
+        """Whether this request has committed any write."""
+        return bool(self.tables)
 
-if not DATABASE_URL:
-    raise ValueError("DATABASE_URL environment variable is not set")
 
-# Create engine with connection pooling for Neon serverless
-engine = create_engine(
-    DATABASE_URL,
-    echo=True,  # SQL logging for development
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Verify connections before using
-)
+_write_tracker: ContextVar[Optional[WriteTracker]] = ContextVar("write_tracker", default=None)
+
+
+@contextmanager
+def track_writes(sticky: bool = False) -> Iterator[WriteTracker]:
+    """Track commits for the duration of a block (one request)."""
+    tracker = WriteTracker(sticky=sticky)
+    token = _write_tracker.set(tracker)
+    try:
+        yield tracker
+    finally:
+        _write_tracker.reset(token)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flush(session, flush_context):
+    if _write_tracker.get() is None:
+        return
+    pending = session.info.setdefault("written_tables", set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        pending.add(getattr(obj, "__tablename__", type(obj).__name__))
+
+
+@event.listens_for(Session, "after_commit")
+def _record_commit(session):
+    tracker = _write_tracker.get()
+    pending = session.info.pop("written_tables", None)
+    if tracker is not None and pending:
+        tracker.tables |= pending
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_flush(session):
+    session.info.pop("written_tables", None)
+
+
+def primary_until_cookie(cookie_header: Optional[str]) -> bool:
+    """Check whether a Cookie header pins reads to the primary."""
+    if not cookie_header or PRIMARY_COOKIE not in cookie_header:
+        return False
+    for item in cookie_header.split(";"):
+        name, _, value = item.strip().partition("=")
+        if name == PRIMARY_COOKIE:
+            try:
+                return float(value) > time.time()
+            except ValueError:
+                return False
+    return False
+
+
+def reads_use_primary(*tables: str) -> bool:
+    """Whether reads in the current context must go to the primary.
+
+    Args:
+        tables: Tables the read touches; a write to any other table in this
+            request does not pin it (default: any write pins)
+    """
+    if get_read_engine() is get_engine():
+        return True
+    tracker = _write_tracker.get()
+    if tracker is None:
+        return False
+    if tracker.sticky:
+        return True
+    if tables:
+        return not tracker.tables.isdisjoint(tables)
+    return tracker.wrote
+
+
+def _open_session(bind) -> Iterator[Session]:
+    with Session(bind) as session:
+        # Check out the connection up front to measure pool wait
+        started = time.perf_counter()
+        session.connection()
+        DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+        yield session
 
 
 def get_session():
-    """FastAPI dependency for database sessions."""
-    with Session(engine) as session:
+    """FastAPI dependency for database sessions (primary)."""
+    yield from _open_session(get_engine())
+
+
+def get_read_session():
+    """FastAPI dependency for read-only endpoints (replica when allowed)."""
+    yield from _open_session(get_engine() if reads_use_primary() else get_read_engine())
+
+
+@contextmanager
+def read_session(fallback: Session, *tables: str) -> Iterator[Session]:
+    """Session for a read-only query inside other work.
+
+    Yields a replica session when reads may use the replica, otherwise the
+    given (primary) session.
+
+    Args:
+        fallback: Session to use when reads must stay on the primary
+        tables: Tables the read touches (see reads_use_primary)
+    """
+    # A session not bound to the API engine (e.g. the MCP process pool) has
+    # no replica to move to; _engine is checked so this never creates one
+    if fallback.get_bind() is not _engine or reads_use_primary(*tables):
+        yield fallback
+        return
+    with Session(get_read_engine()) as session:
         yield session
 
 
 def create_db_and_tables():
     """Create all database tables."""
-    SQLModel.metadata.create_all(engine)
+    SQLModel.metadata.create_all(get_engine())
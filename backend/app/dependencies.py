@@ -4,16 +4,13 @@ import os
 from fastapi import Depends, HTTPException, status, Cookie
 from sqlmodel import Session
 from typing import Optional
-from app.database import get_session
+from app.database import get_read_session, get_session
 from app.auth import decode_jwt
 from app.models import User
 
 
-async def get_current_user(
-    access_token: Optional[str] = Cookie(None),
-    session: Session = Depends(get_session)
-) -> User:
-    """Get the current authenticated user from JWT cookie."""
+def _user_from_token(access_token: Optional[str], session: Session) -> User:
+    """Resolve the user a JWT cookie belongs to, or raise 401."""
     if not access_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -44,6 +41,26 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    access_token: Optional[str] = Cookie(None),
+    session: Session = Depends(get_session)
+) -> User:
+    """Get the current authenticated user from JWT cookie."""
+    return _user_from_token(access_token, session)
+
+
+async def get_current_user_for_read(
+    access_token: Optional[str] = Cookie(None),
+    session: Session = Depends(get_read_session)
+) -> User:
+    """Same as get_current_user, for read-only endpoints.
+
+    Shares the request's read session so a read-only endpoint does not also
+    check out a primary connection just to load the user.
+    """
+    return _user_from_token(access_token, session)
+
+
 # ============================================================================
 # DEV-ONLY AUTHENTICATION BYPASS - DO NOT USE IN PRODUCTION
 # ============================================================================
@@ -0,0 +1,30 @@
+"""Domain events: the append-only event store (store), task activity history
+(task_history) and the Dapr event publisher."""
+
+from app.events.store import (
+    NewEvent,
+    Projection,
+    StoredEvent,
+    append,
+    load_checkpoint,
+    load_snapshot,
+    read_stream,
+    replay,
+    run_projection,
+    save_checkpoint,
+    save_snapshot,
+)
+
+__all__ = [
+    "NewEvent",
+    "Projection",
+    "StoredEvent",
+    "append",
+    "load_checkpoint",
+    "load_snapshot",
+    "read_stream",
+    "replay",
+    "run_projection",
+    "save_checkpoint",
+    "save_snapshot",
+]
@@ -0,0 +1,364 @@
+"""Event store: append-only writes and streaming replay over the events table.
+
+Every event gets a global position from events_position_seq (migration 010),
+the order in which events are replayed. An aggregate's events (one task, one
+reminder) form its stream, read by (aggregate_type, aggregate_id, position)
+through idx_events_stream.
+
+- append() inserts a batch of events with multi-row INSERTs in the caller's
+  transaction, so events commit or roll back with the change they describe
+- read_stream() pages through one aggregate's stream by position, both ways
+- save_snapshot() / load_snapshot() keep an aggregate's folded state at a
+  position (event_snapshots, migration 012), so rebuilding it replays only
+  the events after the latest snapshot
+- replay() iterates over all events (or some types) after a position through a
+  server-side cursor, batch by batch: memory stays bounded by the batch size
+  however large the table is
+- run_projection() feeds replay() into a read model and saves its checkpoint
+  in event_checkpoints in the same transaction as each batch it applies, so
+  a projection resumes where it stopped and rebuilds from position 0
+
+Positions are taken from a sequence at insert time, so a transaction can
+commit a lower position after a higher one is already visible. Projections
+therefore only read up to the newest event older than
+EVENT_PROJECTION_SETTLE_SECONDS; keep append transactions shorter than that.
+
+Configuration:
+- EVENT_APPEND_CHUNK: rows per INSERT statement (default 1000)
+- EVENT_REPLAY_BATCH_SIZE: rows fetched per cursor round trip (default 1000)
+- EVENT_PROJECTION_SETTLE_SECONDS: age before an event is projected (default 5)
+"""
+
+import os
+import logging
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Collection, Iterable, Iterator, Optional, Protocol
+from uuid import UUID, uuid4
+
+from dotenv import load_dotenv
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects.postgresql import insert as upsert
+from sqlmodel import Session
+
+from app.database import get_engine
+from app.metrics import EVENTS_APPENDED
+from app.models import Event, EventCheckpoint, EventSnapshot
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EVENT_APPEND_CHUNK = int(os.getenv("EVENT_APPEND_CHUNK", "1000"))
+EVENT_REPLAY_BATCH_SIZE = int(os.getenv("EVENT_REPLAY_BATCH_SIZE", "1000"))
+EVENT_PROJECTION_SETTLE_SECONDS = float(os.getenv("EVENT_PROJECTION_SETTLE_SECONDS", "5"))
+
+_events = Event.__table__
+_checkpoints = EventCheckpoint.__table__
+_snapshots = EventSnapshot.__table__
+
+
+@dataclass(frozen=True)
+class NewEvent:
+    """An event to append."""
+
+    event_type: str
+    aggregate_type: str
+    aggregate_id: UUID
+    payload: dict[str, Any]
+    user_id: Optional[UUID] = None
+    metadata: Optional[dict[str, Any]] = None
+
+
+@dataclass(frozen=True)
+class StoredEvent:
+    """An event read back from the store."""
+
+    position: int
+    id: UUID
+    event_type: str
+    aggregate_type: str
+    aggregate_id: UUID
+    user_id: Optional[UUID]
+    payload: dict[str, Any]
+    metadata: Optional[dict[str, Any]]
+    created_at: datetime
+
+
+_COLUMNS = (
+    _events.c.position,
+    _events.c.id,
+    _events.c.event_type,
+    _events.c.aggregate_type,
+    _events.c.aggregate_id,
+    _events.c.user_id,
+    _events.c.payload,
+    _events.c.metadata,
+    _events.c.created_at,
+)
+
+
+def _stored(row) -> StoredEvent:
+    return StoredEvent(*row)
+
+
+def append(
+    session: Session,
+    events: Iterable[NewEvent],
+    now: Optional[datetime] = None,
+    chunk_size: int = EVENT_APPEND_CHUNK,
+) -> list[UUID]:
+    """Append events in order; the caller commits.
+
+    Args:
+        session: Database session (primary)
+        events: Events to append, in stream order
+        now: created_at of the events (default: utcnow)
+        chunk_size: Rows per INSERT statement
+
+    Returns:
+        list: Ids of the appended events
+    """
+    now = now or datetime.utcnow()
+    rows = [
+        {
+            "id": uuid4(),
+            "event_type": event.event_type,
+            "aggregate_type": event.aggregate_type,
+            "aggregate_id": event.aggregate_id,
+            "user_id": event.user_id,
+            "payload": event.payload,
+            "metadata": event.metadata,
+            "created_at": now,
+        }
+        for event in events
+    ]
+    # One statement per chunk: positions follow the order of `events`
+    for offset in range(0, len(rows), chunk_size):
+        session.execute(insert(_events), rows[offset:offset + chunk_size])
+
+    for aggregate_type, count in Counter(row["aggregate_type"] for row in rows).items():
+        EVENTS_APPENDED.labels(aggregate_type=aggregate_type).inc(count)
+    return [row["id"] for row in rows]
+
+
+def read_stream(
+    session: Session,
+    aggregate_type: str,
+    aggregate_id: UUID,
+    after: int = 0,
+    before: Optional[int] = None,
+    limit: Optional[int] = None,
+    newest_first: bool = False,
+) -> list[StoredEvent]:
+    """Events of one aggregate between two positions (keyset cursors).
+
+    Args:
+        session: Database session
+        aggregate_type: Aggregate type (e.g. task)
+        aggregate_id: Aggregate id
+        after: Only events after this position (0: from the start)
+        before: Only events before this position (default: to the end)
+        limit: Maximum events (default: all)
+        newest_first: Read the stream backwards
+
+    Returns:
+        list: Events in stream order (reversed with newest_first)
+    """
+    statement = select(*_COLUMNS).where(
+        _events.c.aggregate_type == aggregate_type,
+        _events.c.aggregate_id == aggregate_id,
+        _events.c.position > after,
+    )
+    if before is not None:
+        statement = statement.where(_events.c.position < before)
+    order = _events.c.position.desc() if newest_first else _events.c.position
+    return [_stored(row) for row in session.execute(statement.order_by(order).limit(limit))]
+
+
+def replay(
+    bind=None,
+    after: int = 0,
+    until: Optional[int] = None,
+    event_types: Optional[Collection[str]] = None,
+    batch_size: int = EVENT_REPLAY_BATCH_SIZE,
+) -> Iterator[list[StoredEvent]]:
+    """Stream events after a position in batches, through a server-side cursor.
+
+    Holds one connection (and on Postgres one open cursor) until the
+    iterator is exhausted or closed; only one batch is in memory at a time.
+
+    Args:
+        bind: Engine (default: app engine)
+        after: Position to replay after (0: from the start)
+        until: Last position to replay (default: the end)
+        event_types: Only these event types (default: all)
+        batch_size: Rows per batch and per fetch
+
+    Yields:
+        list: Up to batch_size events in position order
+    """
+    statement = select(*_COLUMNS).where(_events.c.position > after).order_by(_events.c.position)
+    if until is not None:
+        statement = statement.where(_events.c.position <= until)
+    if event_types is not None:
+        statement = statement.where(_events.c.event_type.in_(event_types))
+
+    with (bind or get_engine()).connect() as connection:
+        result = connection.execution_options(stream_results=True, yield_per=batch_size).execute(statement)
+        for rows in result.partitions():
+            yield [_stored(row) for row in rows]
+
+
+def load_checkpoint(session: Session, name: str, for_update: bool = False) -> int:
+    """Position of the last event a projection applied (0 if it never ran)."""
+    statement = select(_checkpoints.c.position).where(_checkpoints.c.name == name)
+    if for_update:
+        statement = statement.with_for_update()
+    return session.execute(statement).scalar() or 0
+
+
+def save_checkpoint(session: Session, name: str, position: int, now: Optional[datetime] = None) -> None:
+    """Store a projection's checkpoint; the caller commits."""
+    values = {"name": name, "position": position, "updated_at": now or datetime.utcnow()}
+    statement = upsert(_checkpoints).values(values)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[_checkpoints.c.name],
+            set_={"position": statement.excluded.position, "updated_at": statement.excluded.updated_at},
+        )
+    )
+
+
+def load_snapshot(
+    session: Session,
+    aggregate_type: str,
+    aggregate_id: UUID,
+    before: Optional[int] = None,
+) -> tuple[int, Optional[dict[str, Any]]]:
+    """Latest snapshot of an aggregate, optionally taken before a position.
+
+    Returns:
+        tuple: (position, state), or (0, None) without a snapshot
+    """
+    statement = select(_snapshots.c.position, _snapshots.c.state).where(
+        _snapshots.c.aggregate_type == aggregate_type,
+        _snapshots.c.aggregate_id == aggregate_id,
+    )
+    if before is not None:
+        statement = statement.where(_snapshots.c.position < before)
+    row = session.execute(statement.order_by(_snapshots.c.position.desc()).limit(1)).first()
+    return (row.position, row.state) if row else (0, None)
+
+
+def save_snapshot(
+    session: Session,
+    aggregate_type: str,
+    aggregate_id: UUID,
+    position: int,
+    state: dict[str, Any],
+    now: Optional[datetime] = None,
+) -> None:
+    """Store an aggregate's state as of a position (idempotent); the caller commits."""
+    statement = upsert(_snapshots).values(
+        aggregate_type=aggregate_type,
+        aggregate_id=aggregate_id,
+        position=position,
+        state=state,
+        created_at=now or datetime.utcnow(),
+    )
+    session.execute(statement.on_conflict_do_nothing())
+
+
+class Projection(Protocol):
+    """A read model derived from the event stream.
+
+    apply() must only write through the given session: the checkpoint is
+    saved in the same transaction.
+    """
+
+    name: str
+    event_types: Optional[Collection[str]]
+
+    def reset(self, session: Session) -> None:
+        """Empty the read model before a rebuild."""
+        ...
+
+    def apply(self, session: Session, events: list[StoredEvent]) -> None:
+        """Apply a batch of events, in position order."""
+        ...
+
+
+def run_projection(
+    projection: Projection,
+    bind=None,
+    rebuild: bool = False,
+    batch_size: int = EVENT_REPLAY_BATCH_SIZE,
+    settle_seconds: float = EVENT_PROJECTION_SETTLE_SECONDS,
+    now: Optional[datetime] = None,
+) -> int:
+    """Bring a projection up to date from its checkpoint, one transaction per batch.
+
+    Stops early, without error, if another runner moves the checkpoint.
+
+    Args:
+        projection: Projection to run
+        bind: Engine (default: app engine)
+        rebuild: Reset the read model and replay from position 0
+        batch_size: Events per batch (and per transaction)
+        settle_seconds: Only project events at least this old
+        now: Current time (default: utcnow)
+
+    Returns:
+        int: Events applied
+    """
+    bind = bind or get_engine()
+    now = now or datetime.utcnow()
+
+    with Session(bind) as session:
+        # The checkpoint row exists before the first batch locks it
+        session.execute(
+            upsert(_checkpoints).values(name=projection.name, position=0, updated_at=now).on_conflict_do_nothing()
+        )
+        if rebuild:
+            projection.reset(session)
+            save_checkpoint(session, projection.name, 0, now)
+        checkpoint = load_checkpoint(session, projection.name)
+        head = session.execute(
+            select(func.max(_events.c.position)).where(_events.c.created_at <= now - timedelta(seconds=settle_seconds))
+        ).scalar() or 0
+        session.commit()
+    if head <= checkpoint:
+        return 0
+
+    applied = 0
+    batches = replay(bind, after=checkpoint, until=head, event_types=projection.event_types, batch_size=batch_size)
+    try:
+        for events in batches:
+            if not _apply(bind, projection, events, checkpoint, events[-1].position, now):
+                return applied
+            checkpoint = events[-1].position
+            applied += len(events)
+        # Events of other types after the last applied one need no replay
+        if checkpoint < head and not _apply(bind, projection, [], checkpoint, head, now):
+            return applied
+    finally:
+        batches.close()
+
+    logger.info(f"Projection {projection.name}: applied {applied} events up to position {head}")
+    return applied
+
+
+def _apply(bind, projection: Projection, events: list[StoredEvent], expected: int, position: int, now: datetime) -> bool:
+    """Apply one batch and move the checkpoint, unless another runner moved it first."""
+    with Session(bind) as session:
+        current = load_checkpoint(session, projection.name, for_update=True)
+        if current != expected:
+            logger.warning(f"Projection {projection.name}: checkpoint moved to {current} by another runner, stopping")
+            return False
+        if events:
+            projection.apply(session, events)
+        save_checkpoint(session, projection.name, position, now)
+        session.commit()
+    return True
@@ -0,0 +1,196 @@
+"""Task activity history from the event stream.
+
+The tasks API appends a task.created, task.updated or task.deleted event for
+every change, in the same transaction as the change (record_task_event).
+Payloads carry the new values of the fields that changed; task_history()
+folds the stream to show each change as old -> new.
+
+Replaying a task's whole stream for every page would cost more the longer a
+task is edited, so TaskSnapshotProjection (run by app.workers.projections)
+saves the folded state every TASK_SNAPSHOT_INTERVAL events. A page replays
+only the events between the nearest snapshot before it and the page itself:
+about the interval plus the page size, however long the history is.
+
+A stream can start after its task.created: tasks created before history was
+recorded, or whose early events were retired with their partition
+(app.workers.partition_maintenance). Such a history is reported as
+truncated, and a change is only shown once the field's old value is known.
+
+Task ids are still integers (see the note on Reminder); a task's stream id
+is uuid5(TASK_NAMESPACE, str(task_id)).
+"""
+
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional
+from uuid import UUID, uuid5
+
+from dotenv import load_dotenv
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from app.events.store import NewEvent, StoredEvent, append, load_snapshot, read_stream, save_snapshot
+from app.models import EventSnapshot
+
+load_dotenv()
+
+TASK_SNAPSHOT_INTERVAL = int(os.getenv("TASK_SNAPSHOT_INTERVAL", "50"))
+
+AGGREGATE_TYPE = "task"
+TASK_EVENT_TYPES = ("task.created", "task.updated", "task.deleted")
+# Task fields whose changes are recorded
+TRACKED_FIELDS = ("title", "description", "priority", "is_complete", "due_date", "reminder_time", "reminder_config")
+TASK_NAMESPACE = UUID("6f1c2d7e-3b4a-5c8d-9e0f-a1b2c3d4e5f6")
+
+
+def task_stream_id(task_id: int) -> UUID:
+    """Event stream (aggregate) id of a task."""
+    return uuid5(TASK_NAMESPACE, str(task_id))
+
+
+def _json(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def task_fields(task) -> dict[str, Any]:
+    """Tracked fields of a task, JSON-ready."""
+    return {field: _json(getattr(task, field, None)) for field in TRACKED_FIELDS}
+
+
+def record_task_event(
+    session: Session,
+    event_type: str,
+    task_id: int,
+    fields: dict[str, Any],
+    user_id: Optional[int] = None,
+) -> None:
+    """Append a task event in the caller's transaction.
+
+    Args:
+        session: Database session (primary); the caller commits
+        event_type: task.created, task.updated or task.deleted
+        task_id: Task id
+        fields: New values of the changed fields (all tracked fields on creation)
+        user_id: User who made the change
+    """
+    payload = {"task_id": task_id, "fields": {field: _json(value) for field, value in fields.items()}}
+    metadata = {"user_id": user_id} if user_id is not None else None
+    append(session, [NewEvent(event_type, AGGREGATE_TYPE, task_stream_id(task_id), payload, metadata=metadata)])
+
+
+def apply_event(
+    state: dict[str, Any],
+    event: StoredEvent,
+    partial: bool = False,
+) -> tuple[dict[str, Any], dict[str, tuple]]:
+    """Fold one event into a task's state.
+
+    Args:
+        state: State before the event
+        event: Event to apply
+        partial: The stream's start is missing, so fields absent from the
+            state have no known old value and are left out of the changes
+
+    Returns:
+        tuple: (new state, {field: (old value, new value)} for each change)
+    """
+    if event.event_type == "task.deleted":
+        return {}, {}
+    base = {} if event.event_type == "task.created" else state
+    fields = event.payload.get("fields", {})
+    changes = {
+        field: (base.get(field), value)
+        for field, value in fields.items()
+        if base.get(field) != value and (field in base or not partial)
+    }
+    return {**base, **fields}, changes
+
+
+@dataclass(frozen=True)
+class HistoryEntry:
+    """One change to a task."""
+
+    position: int
+    event_type: str
+    occurred_at: datetime
+    changes: dict[str, tuple]
+
+
+def task_history(
+    session: Session,
+    task_id: int,
+    before: Optional[int] = None,
+    limit: int = 20,
+) -> tuple[list[HistoryEntry], Optional[int], bool]:
+    """One page of a task's history, newest first.
+
+    Args:
+        session: Database session
+        task_id: Task id
+        before: Cursor from the previous page (default: newest)
+        limit: Entries per page
+
+    Returns:
+        tuple: (entries, cursor for the next page or None on the last page,
+            whether the stream starts after the task's creation)
+    """
+    stream_id = task_stream_id(task_id)
+    page = read_stream(session, AGGREGATE_TYPE, stream_id, before=before, limit=limit + 1, newest_first=True)
+    has_more = len(page) > limit
+    page = page[:limit]
+    if not page:
+        return [], None, False
+    truncated = read_stream(session, AGGREGATE_TYPE, stream_id, limit=1)[0].event_type != "task.created"
+
+    # State just before the page: nearest snapshot, then the events after it
+    oldest = page[-1].position
+    position, state = load_snapshot(session, AGGREGATE_TYPE, stream_id, before=oldest)
+    state = state or {}
+    for event in read_stream(session, AGGREGATE_TYPE, stream_id, after=position, before=oldest):
+        state, _ = apply_event(state, event, partial=truncated)
+
+    entries = []
+    for event in reversed(page):
+        state, changes = apply_event(state, event, partial=truncated)
+        entries.append(HistoryEntry(event.position, event.event_type, event.created_at, changes))
+    entries.reverse()
+    return entries, oldest if has_more else None, truncated
+
+
+class TaskSnapshotProjection:
+    """Saves a task's folded state every `interval` events of its stream.
+
+    Args:
+        interval: Events between snapshots
+    """
+
+    name = "task_snapshots"
+    event_types = TASK_EVENT_TYPES
+
+    def __init__(self, interval: int = TASK_SNAPSHOT_INTERVAL):
+        self.interval = interval
+
+    def reset(self, session: Session) -> None:
+        session.execute(delete(EventSnapshot).where(EventSnapshot.aggregate_type == AGGREGATE_TYPE))
+
+    def apply(self, session: Session, events: list[StoredEvent]) -> None:
+        last = {}
+        for event in events:
+            last[event.aggregate_id] = event.position
+        for stream_id, until in last.items():
+            position, state = load_snapshot(session, AGGREGATE_TYPE, stream_id, before=until + 1)
+            pending = read_stream(session, AGGREGATE_TYPE, stream_id, after=position, before=until + 1)
+            if len(pending) < self.interval:
+                continue
+            state = state or {}
+            for event in pending:
+                state, _ = apply_event(state, event)
+            # Deleted tasks have no history to serve
+            if state:
+                save_snapshot(session, AGGREGATE_TYPE, stream_id, until, state)
@@ -0,0 +1,182 @@
+"""Readiness checks for GET /ready.
+
+/health stays a pure liveness check (the process is up). /ready reports
+whether this pod can serve traffic right now:
+
+- database: a recent successful pool checkout (checkouts are pre-pinged) or
+  a SELECT 1 when the pool has been idle
+- db_pool: checked-out connections below READINESS_POOL_SATURATION of the
+  pool capacity
+- event_publisher: the Dapr sidecar answers its health endpoint (skipped
+  when event publishing is disabled)
+
+Each result is cached for READINESS_CACHE_TTL_SECONDS and concurrent probes
+share one in-flight check, so probes add no load under traffic and at most
+one SELECT 1 per TTL when idle.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from dotenv import load_dotenv
+from sqlalchemy import event, text
+
+from app.database import engine
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+READINESS_CACHE_TTL_SECONDS = float(os.getenv("READINESS_CACHE_TTL_SECONDS", "5"))
+READINESS_CHECK_TIMEOUT_SECONDS = float(os.getenv("READINESS_CHECK_TIMEOUT_SECONDS", "2"))
+READINESS_POOL_SATURATION = float(os.getenv("READINESS_POOL_SATURATION", "0.9"))
+DAPR_HOST = os.getenv("DAPR_HOST", "localhost")
+DAPR_HTTP_PORT = os.getenv("DAPR_HTTP_PORT", "3500")
+
+
+@dataclass(frozen=True)
+class CheckResult:
+    """Outcome of one readiness check."""
+
+    ok: bool
+    detail: str
+    checked_at: float
+
+
+CheckFunction = Callable[[], Awaitable[tuple[bool, str]]]
+
+
+class ReadinessChecks:
+    """Runs named checks with a per-check result cache.
+
+    Args:
+        checks: Check name -> coroutine function returning (ok, detail)
+        ttl: Seconds a result is reused
+        timeout: Seconds before a running check counts as failed
+    """
+
+    def __init__(
+        self,
+        checks: dict[str, CheckFunction],
+        ttl: float = READINESS_CACHE_TTL_SECONDS,
+        timeout: float = READINESS_CHECK_TIMEOUT_SECONDS,
+    ):
+        self.checks = checks
+        self.ttl = ttl
+        self.timeout = timeout
+        self._results: dict[str, CheckResult] = {}
+        self._locks = {name: asyncio.Lock() for name in checks}
+
+    async def run(self) -> tuple[bool, dict[str, CheckResult]]:
+        """Run (or reuse) every check.
+
+        Returns:
+            tuple: (all checks passed, results by check name)
+        """
+        names = list(self.checks)
+        results = await asyncio.gather(*(self._run_check(name) for name in names))
+        by_name = dict(zip(names, results))
+        return all(result.ok for result in results), by_name
+
+    async def _run_check(self, name: str) -> CheckResult:
+        cached = self._results.get(name)
+        if cached and time.monotonic() - cached.checked_at < self.ttl:
+            return cached
+
+        async with self._locks[name]:
+            # Another probe may have refreshed it while we waited
+            cached = self._results.get(name)
+            if cached and time.monotonic() - cached.checked_at < self.ttl:
+                return cached
+
+            try:
+                ok, detail = await asyncio.wait_for(self.checks[name](), self.timeout)
+            except asyncio.TimeoutError:
+                ok, detail = False, f"timed out after {self.timeout:g}s"
+            except Exception as e:
+                ok, detail = False, f"{type(e).__name__}: {e}"
+
+            if not ok:
+                logger.warning(f"Readiness check {name} failed: {detail}")
+
+            result = CheckResult(ok=ok, detail=detail, checked_at=time.monotonic())
+            self._results[name] = result
+            return result
+
+
+# Last successful pool checkout; with pool_pre_ping every checkout has
+# already verified its connection, so recent traffic proves the DB is up
+_last_checkout = 0.0
+
+
+@event.listens_for(engine, "checkout")
+def _record_checkout(dbapi_connection, connection_record, connection_proxy):
+    global _last_checkout
+    _last_checkout = time.monotonic()
+
+
+def _pool_usage() -> tuple[int, int] | None:
+    """Return (checked out, capacity) for a QueuePool, None for other pools."""
+    pool = engine.pool
+    if not hasattr(pool, "checkedout") or not hasattr(pool, "size"):
+        return None
+    max_overflow = getattr(pool, "_max_overflow", 0)
+    if max_overflow < 0:
+        # Unlimited overflow never saturates
+        return None
+    return pool.checkedout(), pool.size() + max_overflow
+
+
+def _select_one() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def check_database() -> tuple[bool, str]:
+    """Database reachable: recent verified checkout, or SELECT 1."""
+    if time.monotonic() - _last_checkout < READINESS_CACHE_TTL_SECONDS:
+        return True, "recent checkout"
+
+    usage = _pool_usage()
+    if usage and usage[0] >= usage[1]:
+        # A SELECT 1 would only queue behind the requests holding the pool
+        return False, "pool exhausted, ping skipped"
+
+    await asyncio.to_thread(_select_one)
+    return True, "SELECT 1"
+
+
+async def check_db_pool() -> tuple[bool, str]:
+    """Connection pool below the saturation threshold."""
+    usage = _pool_usage()
+    if usage is None:
+        return True, "unbounded pool"
+
+    checked_out, capacity = usage
+    detail = f"{checked_out}/{capacity} connections in use"
+    return checked_out < capacity * READINESS_POOL_SATURATION, detail
+
+
+async def check_event_publisher() -> tuple[bool, str]:
+    """Dapr sidecar healthy (only when event publishing is enabled)."""
+    import httpx
+    from app.events.publisher import get_event_publisher
+
+    if not get_event_publisher().enabled:
+        return True, "disabled"
+
+    url = f"http://{DAPR_HOST}:{DAPR_HTTP_PORT}/v1.0/healthz"
+    async with httpx.AsyncClient(timeout=READINESS_CHECK_TIMEOUT_SECONDS) as client:
+        response = await client.get(url)
+    return response.is_success, f"sidecar returned {response.status_code}"
+
+
+readiness = ReadinessChecks({
+    "database": check_database,
+    "db_pool": check_db_pool,
+    "event_publisher": check_event_publisher,
+})
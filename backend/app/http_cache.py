@@ -0,0 +1,90 @@
+"""Conditional GET support (ETag / If-None-Match) for task reads.
+
+ETags are derived from cheap version queries instead of the response body,
+so an unchanged poll costs one indexed aggregate and returns 304 without
+loading or serializing any rows.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Response, status
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models import Task
+
+# Clients must revalidate every time, but may reuse the body on a 304
+CACHE_CONTROL = "private, no-cache"
+
+
+def weak_etag(*parts) -> str:
+    """Build a weak ETag from the given version components."""
+    digest = hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison).
+
+    Args:
+        if_none_match: Raw If-None-Match header value
+        etag: Current ETag of the resource
+
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    current = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        if candidate.strip().removeprefix("W/") == current:
+            return True
+    return False
+
+
+def task_list_etag(session: Session, user_id: int) -> str:
+    """Compute the ETag of a user's task list without loading rows.
+
+    Uses the task count plus the latest updated_at: every create, update,
+    toggle and delete changes at least one of the two. Served by
+    idx_tasks_user_updated_at.
+
+    Args:
+        session: Database session
+        user_id: Owner of the tasks
+
+    Returns:
+        str: Weak ETag for the task list
+    """
+    statement = select(func.count(Task.id), func.max(Task.updated_at)).where(Task.user_id == user_id)
+    count, last_updated = session.exec(statement).one()
+    return weak_etag("tasks", user_id, count, _timestamp(last_updated))
+
+
+def task_etag(task_id: int, updated_at: Optional[datetime]) -> str:
+    """Compute the ETag of a single task from its updated_at."""
+    return weak_etag("task", task_id, _timestamp(updated_at))
+
+
+def not_modified(etag: str) -> Response:
+    """Build an empty 304 response carrying the current ETag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach validator headers to a full response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def _timestamp(value: Optional[datetime]) -> str:
+    return value.isoformat() if value else "-"
@@ -5,13 +5,23 @@ Phase: Phase V - Event-Driven Architecture
 """
 
 import os
+import time
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, Response, status
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from app.database import create_db_and_tables
+from app.database import DB_CREATE_ALL, create_db_and_tables, engine
 from app.routers import auth, tasks, chat, recurring, reminders
 from app.events.publisher import close_event_publisher
+from app.health import readiness
+from app.metrics import PROMETHEUS_AVAILABLE, mark_worker_dead, render_metrics
+from app.middleware import CompressionMiddleware, HTTPLayerMiddleware
+from app.shutdown import SHUTDOWN_DRAIN_TIMEOUT, drain
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,10 +29,67 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+
+async def on_startup():
+    """Initialize server on startup and report time spent per phase.
+
+    The schema is owned by Alembic; create_all only runs with
+    DB_CREATE_ALL=true (local development). The agent and MCP tools load on
+    the first chat turn.
+    """
+    phases = {"imports": _IMPORT_FINISHED - _IMPORT_STARTED}
+
+    started = time.perf_counter()
+    if DB_CREATE_ALL:
+        create_db_and_tables()
+        phases["create_all"] = time.perf_counter() - started
+
+    # T-563: Log event publisher status
+    started = time.perf_counter()
+    from app.events.publisher import get_event_publisher
+    publisher = get_event_publisher()
+    logger.info(f"Event publisher initialized: enabled={publisher.enabled}")
+    phases["event_publisher"] = time.perf_counter() - started
+
+    report = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in phases.items())
+    logger.info(f"Startup: {report} (total {sum(phases.values()) * 1000:.0f} ms)")
+
+
+async def on_shutdown():
+    """Drain in-flight work, then release resources.
+
+    Task: T-563 - Extend main.py for event publisher lifecycle
+    """
+    started = time.monotonic()
+    logger.info(f"Shutdown: draining in-flight work (up to {SHUTDOWN_DRAIN_TIMEOUT:g}s)...")
+    drained = await drain(SHUTDOWN_DRAIN_TIMEOUT)
+    logger.info(f"Shutdown: drain {'complete' if drained else 'timed out'} after {time.monotonic() - started:.1f}s")
+
+    # Close event publisher HTTP client (nothing publishes after the drain)
+    logger.info("Shutting down event publisher...")
+    await close_event_publisher()
+    logger.info("Event publisher closed")
+
+    engine.dispose()
+    logger.info("Database engine disposed")
+
+    mark_worker_dead()
+    logger.info(f"Shutdown complete in {time.monotonic() - started:.1f}s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: startup, then graceful shutdown."""
+    await on_startup()
+    yield
+    await on_shutdown()
+
+
 app = FastAPI(
     title="Todo API",
     description="Phase-II Full-Stack Todo Application API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration for local development
@@ -53,46 +120,12 @@ app.add_middleware(
 )
 
 
-@app.middleware("http")
-async def add_security_headers(request, call_next):
-    """Add security headers to all responses."""
-    response = await call_next(request)
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    return response
+# gzip/brotli for large task lists and chat payloads
+app.add_middleware(CompressionMiddleware)
 
-
-@app.on_event("startup")
-async def on_startup():
-    """Initialize server on startup."""
-    # Create database tables
-    create_db_and_tables()
-
-    # Initialize MCP tools cache to avoid asyncio.run() in request handlers
-    try:
-        from app.mcp.server import initialize_tools
-        await initialize_tools()
-    except ImportError:
-        # MCP module not available, skip initialization
-        logger.warning("MCP module not available, skipping initialization")
-
-    # T-563: Log event publisher status
-    from app.events.publisher import get_event_publisher
-    publisher = get_event_publisher()
-    logger.info(f"Event publisher initialized: enabled={publisher.enabled}")
-
-
-@app.on_event("shutdown")
-async def on_shutdown():
-    """Cleanup on server shutdown.
-
-    Task: T-563 - Extend main.py for event publisher lifecycle
-    """
-    # Close event publisher HTTP client
-    logger.info("Shutting down event publisher...")
-    await close_event_publisher()
-    logger.info("Event publisher closed")
+# Security headers, request metrics and query timing in one pure ASGI layer.
+# Outermost so latency covers CORS, compression and error handling too.
+app.add_middleware(HTTPLayerMiddleware)
 
 
 # Mount routers
@@ -112,5 +145,30 @@ def root():
 
 @app.get("/health")
 def health():
-    """Health check endpoint."""
+    """Liveness check endpoint (the process is up)."""
     return {"status": "ok"}
+
+
+@app.get("/ready", include_in_schema=False)
+async def ready():
+    """Readiness check endpoint: 503 while dependencies are unhealthy."""
+    ok, results = await readiness.run()
+    return JSONResponse(
+        {
+            "status": "ready" if ok else "not_ready",
+            "checks": {name: {"ok": r.ok, "detail": r.detail} for name, r in results.items()},
+        },
+        status_code=status.HTTP_200_OK if ok else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus metrics endpoint."""
+    if not PROMETHEUS_AVAILABLE:
+        return Response("prometheus_client not installed", status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    body, content_type = render_metrics()
+    return Response(body, media_type=content_type)
+
+
+_IMPORT_FINISHED = time.perf_counter()
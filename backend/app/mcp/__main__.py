@@ -0,0 +1,6 @@
+"""Run the standalone MCP server: ``python -m app.mcp``."""
+
+from app.mcp.standalone import main
+
+if __name__ == "__main__":
+    main()
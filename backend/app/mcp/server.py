@@ -1,7 +1,9 @@
 """MCP server setup using Official MCP SDK."""
 
 import json
-from app.database import get_session
+from sqlmodel import Session
+from app.context import get_request_context
+from app.database import get_engine, read_session
 from app.mcp.tools import (
     create_task,
     list_tasks,
@@ -50,42 +52,6 @@ except ImportError:
     TextContent = StubTextContent
     MCP_AVAILABLE = False
 
-# Store user context (set by FastAPI on each request)
-# Maps request_id -> user_id
-_user_context: dict[str, int] = {}
-
-
-def set_user_context(request_id: str, user_id: int):
-    """Set user context for the current request.
-
-    Args:
-        request_id: Unique identifier for this request
-        user_id: Authenticated user's ID from JWT
-    """
-    _user_context[request_id] = user_id
-
-
-def get_user_context(request_id: str) -> int | None:
-    """Get user context for the current request.
-
-    Args:
-        request_id: Unique identifier for this request
-
-    Returns:
-        User ID if found, None otherwise
-    """
-    return _user_context.get(request_id)
-
-
-def clear_user_context(request_id: str):
-    """Clear user context after request completes.
-
-    Args:
-        request_id: Unique identifier for this request
-    """
-    _user_context.pop(request_id, None)
-
-
 # List available tools
 if MCP_AVAILABLE:
     @server.list_tools()
@@ -242,19 +208,21 @@ else:
 # Handle tool calls
 if MCP_AVAILABLE:
     @server.call_tool()
-    async def call_tool(name: str, arguments: dict, request_id: str = None) -> list[TextContent]:
+    async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         """Execute MCP tool calls.
 
+        The user is taken from the request context bound by the caller (the
+        chat request, or the MCP connection in the standalone server).
+
         Args:
             name: Name of the tool to execute
             arguments: Tool arguments from OpenAI function call
-            request_id: Request identifier for user context lookup
 
         Returns:
             List of TextContent with JSON-encoded results
         """
-        # Get user context
-        user_id = get_user_context(request_id) if request_id else None
+        ctx = get_request_context()
+        user_id = ctx.user_id if ctx else None
 
         if not user_id:
             return [TextContent(
@@ -262,34 +230,21 @@ if MCP_AVAILABLE:
                 text=json.dumps({"success": False, "error": "Unauthorized"})
             )]
 
-        # Get database session
-        session = next(get_session())
+        # Reuse the request's session, or open one for this call
+        owns_session = ctx.session is None
+        session = Session(get_engine()) if owns_session else ctx.session
 
-        # Route to appropriate tool
         try:
-            if name == "create_task":
-                result = await create_task(session=session, user_id=user_id, **arguments)
-            elif name == "list_tasks":
-                result = await list_tasks(session=session, user_id=user_id, **arguments)
-            elif name == "update_task":
-                result = await update_task(session=session, user_id=user_id, **arguments)
-            elif name == "toggle_task_completion":
-                result = await toggle_task_completion(session=session, user_id=user_id, **arguments)
-            elif name == "delete_task":
-                result = await delete_task(session=session, user_id=user_id, **arguments)
-            elif name == "get_task":
-                result = await get_task(session=session, user_id=user_id, **arguments)
-            else:
-                result = {"success": False, "error": f"Unknown tool: {name}"}
+            result = await execute_tool(name, session=session, user_id=user_id, **arguments)
         except Exception as e:
             result = {"success": False, "error": f"Tool execution failed: {str(e)}"}
         finally:
-            # Close session
-            session.close()
+            if owns_session:
+                session.close()
 
         return [TextContent(type="text", text=json.dumps(result))]
 else:
-    async def call_tool(name: str, arguments: dict, request_id: str = None) -> list:
+    async def call_tool(name: str, arguments: dict) -> list:
         """Stub function when MCP is not available."""
         return []
 
@@ -374,15 +329,16 @@ def get_tool_definitions() -> list[dict]:
     return _cached_tools
 
 
-async def execute_tool(tool_name: str, session, user_id: int, **kwargs) -> dict:
+async def execute_tool(tool_name: str, session=None, user_id: int | None = None, **kwargs) -> dict:
     """Execute a tool by name (wrapper for agent compatibility).
 
     This wraps the MCP call_tool interface for easier use from the agent.
+    The session and user default to the ones in the current request context.
 
     Args:
         tool_name: Name of the tool to execute
-        session: Database session
-        user_id: User ID for authorization
+        session: Database session (default: request context session)
+        user_id: User ID for authorization (default: request context user)
         **kwargs: Tool-specific arguments
 
     Returns:
@@ -391,21 +347,22 @@ async def execute_tool(tool_name: str, session, user_id: int, **kwargs) -> dict:
     if not MCP_AVAILABLE:
         return {"success": False, "error": "MCP tools not available"}
 
-    import json
-    from app.mcp.tools import (
-        create_task,
-        list_tasks,
-        update_task,
-        toggle_task_completion,
-        delete_task,
-        get_task
-    )
+    ctx = get_request_context()
+    if ctx is not None:
+        if user_id is not None and ctx.user_id is not None and user_id != ctx.user_id:
+            return {"success": False, "error": "Unauthorized"}
+        user_id = user_id if user_id is not None else ctx.user_id
+        session = session if session is not None else ctx.session
+
+    if session is None:
+        return {"success": False, "error": "No database session available"}
 
     # Route to appropriate tool function
     if tool_name == "create_task":
         return await create_task(session=session, user_id=user_id, **kwargs)
     elif tool_name == "list_tasks":
-        return await list_tasks(session=session, user_id=user_id, **kwargs)
+        with read_session(session, "tasks") as reader:
+            return await list_tasks(session=reader, user_id=user_id, **kwargs)
     elif tool_name == "update_task":
         return await update_task(session=session, user_id=user_id, **kwargs)
     elif tool_name == "toggle_task_completion":
@@ -413,6 +370,7 @@ async def execute_tool(tool_name: str, session, user_id: int, **kwargs) -> dict:
     elif tool_name == "delete_task":
         return await delete_task(session=session, user_id=user_id, **kwargs)
     elif tool_name == "get_task":
-        return await get_task(session=session, user_id=user_id, **kwargs)
+        with read_session(session, "tasks") as reader:
+            return await get_task(session=reader, user_id=user_id, **kwargs)
     else:
         return {"success": False, "error": f"Unknown tool: {tool_name}"}
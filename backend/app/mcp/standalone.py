@@ -0,0 +1,261 @@
+"""Standalone MCP server process.
+
+Serves the todo tools over stdio or HTTP so external agents can call them
+directly, and so tool execution can be scaled separately from the chat API.
+
+The process owns its own database connection pool (configured through the
+MCP_* environment variables); the API engine in app.database is never created
+here, so DATABASE_URL is only needed as the MCP_DATABASE_URL default. It
+authenticates every connection with the same JWT used by the web app. The
+identity is bound as the connection's request context (see app.context):
+
+- stdio: the token is read once from MCP_AUTH_TOKEN when the process starts
+- http:  the token is read from the ``Authorization: Bearer <jwt>`` header of
+         each request (streamable HTTP, or SSE on older MCP SDKs)
+
+Usage:
+    python -m app.mcp --transport stdio
+    python -m app.mcp --transport http --host 0.0.0.0 --port 8001
+"""
+
+import os
+import json
+import logging
+import argparse
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlmodel import Session, create_engine
+
+from app.auth import decode_jwt
+from app.context import get_request_context, request_context
+from app.query_stats import instrument_engine
+from app.mcp.server import MCP_AVAILABLE, list_tools as list_todo_tools, execute_tool
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Database pool owned by the MCP process (defaults to the API database)
+MCP_DATABASE_URL = os.getenv("MCP_DATABASE_URL") or os.getenv("DATABASE_URL")
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "5"))
+MCP_MAX_OVERFLOW = int(os.getenv("MCP_MAX_OVERFLOW", "10"))
+MCP_POOL_TIMEOUT = int(os.getenv("MCP_POOL_TIMEOUT", "30"))
+
+
+_engine = None
+
+
+def get_mcp_engine():
+    """Get the connection pool used for tool execution (created on first use)."""
+    global _engine
+    if _engine is None:
+        if not MCP_DATABASE_URL:
+            raise ValueError("MCP_DATABASE_URL or DATABASE_URL environment variable is not set")
+        _engine = instrument_engine(create_engine(
+            MCP_DATABASE_URL,
+            pool_size=MCP_POOL_SIZE,
+            max_overflow=MCP_MAX_OVERFLOW,
+            pool_timeout=MCP_POOL_TIMEOUT,
+            pool_pre_ping=True,
+        ))
+    return _engine
+
+
+def authenticate_token(token: Optional[str]) -> Optional[int]:
+    """Resolve a JWT into the user ID a connection acts as.
+
+    Args:
+        token: Raw JWT (without the "Bearer " prefix)
+
+    Returns:
+        User ID if the token is valid, None otherwise
+    """
+    if not token:
+        return None
+
+    payload = decode_jwt(token)
+    if not payload:
+        return None
+
+    return payload.get("user_id")
+
+
+if MCP_AVAILABLE:
+    from mcp.server import Server
+    from mcp.types import TextContent
+
+    mcp_server = Server("todo-mcp-server")
+
+    @mcp_server.list_tools()
+    async def list_tools():
+        """List the todo tools (same schemas the chat agent uses)."""
+        return await list_todo_tools()
+
+    @mcp_server.call_tool()
+    async def call_tool(name: str, arguments: dict) -> list[TextContent]:
+        """Execute a tool for the user authenticated on this connection."""
+        ctx = get_request_context()
+
+        if ctx is None or not ctx.user_id:
+            result = {"success": False, "error": "Unauthorized"}
+        else:
+            with Session(get_mcp_engine()) as session, request_context(session=session):
+                try:
+                    result = await execute_tool(name, **(arguments or {}))
+                except Exception as e:
+                    session.rollback()
+                    logger.error(
+                        f"MCP tool {name} failed for user {ctx.user_id} (trace {ctx.trace_id}): {e}",
+                        exc_info=True
+                    )
+                    result = {"success": False, "error": f"Tool execution failed: {str(e)}"}
+
+        return [TextContent(type="text", text=json.dumps(result))]
+else:
+    mcp_server = None
+
+
+async def run_stdio() -> None:
+    """Serve a single authenticated client over stdin/stdout."""
+    from mcp.server.stdio import stdio_server
+
+    user_id = authenticate_token(os.getenv("MCP_AUTH_TOKEN"))
+    if user_id is None:
+        raise SystemExit("MCP_AUTH_TOKEN is missing or invalid")
+
+    logger.info(f"MCP stdio server started for user {user_id}")
+
+    with request_context(user_id=user_id):
+        async with stdio_server() as (read_stream, write_stream):
+            await mcp_server.run(
+                read_stream,
+                write_stream,
+                mcp_server.create_initialization_options()
+            )
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    """Get a request header from an ASGI scope."""
+    for key, value in scope.get("headers", []):
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _bearer_token(scope) -> Optional[str]:
+    """Extract the bearer token from an ASGI scope's headers."""
+    scheme, _, token = (_header(scope, b"authorization") or "").partition(" ")
+    if scheme.lower() == "bearer":
+        return token.strip()
+    return None
+
+
+async def _send_unauthorized(send) -> None:
+    """Reply 401 to an unauthenticated HTTP request."""
+    body = json.dumps({"detail": "Not authenticated"}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": 401,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"www-authenticate", b"Bearer"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_http_app():
+    """Build the ASGI app serving MCP over HTTP.
+
+    Uses the streamable HTTP transport in stateless mode when the installed
+    MCP SDK provides it (any replica can serve any request), and falls back to
+    the SSE transport on older SDKs.
+    """
+    from contextlib import asynccontextmanager
+    from starlette.applications import Starlette
+    from starlette.routing import Mount, Route
+
+    try:
+        from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+    except ImportError:
+        StreamableHTTPSessionManager = None
+
+    async def health(request):
+        from starlette.responses import JSONResponse
+        return JSONResponse({"status": "ok"})
+
+    if StreamableHTTPSessionManager is not None:
+        session_manager = StreamableHTTPSessionManager(app=mcp_server, stateless=True)
+
+        async def handle_mcp(scope, receive, send):
+            user_id = authenticate_token(_bearer_token(scope))
+            if user_id is None:
+                await _send_unauthorized(send)
+                return
+            with request_context(user_id=user_id, trace_id=_header(scope, b"x-request-id")):
+                await session_manager.handle_request(scope, receive, send)
+
+        @asynccontextmanager
+        async def lifespan(app):
+            async with session_manager.run():
+                yield
+            get_mcp_engine().dispose()
+
+        return Starlette(
+            routes=[Route("/health", health), Mount("/mcp", app=handle_mcp)],
+            lifespan=lifespan,
+        )
+
+    from mcp.server.sse import SseServerTransport
+
+    sse = SseServerTransport("/messages/")
+
+    async def handle_sse(scope, receive, send):
+        user_id = authenticate_token(_bearer_token(scope))
+        if user_id is None:
+            await _send_unauthorized(send)
+            return
+        with request_context(user_id=user_id, trace_id=_header(scope, b"x-request-id")):
+            async with sse.connect_sse(scope, receive, send) as (read_stream, write_stream):
+                await mcp_server.run(
+                    read_stream,
+                    write_stream,
+                    mcp_server.create_initialization_options()
+                )
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        get_mcp_engine().dispose()
+
+    return Starlette(
+        routes=[
+            Route("/health", health),
+            Mount("/sse", app=handle_sse),
+            Mount("/messages/", app=sse.handle_post_message),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Todo MCP server")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--host", default=os.getenv("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("MCP_PORT", "8001")))
+    args = parser.parse_args(argv)
+
+    # stdout belongs to the protocol on stdio, so log to stderr
+    logging.basicConfig(level=logging.INFO)
+
+    if not MCP_AVAILABLE:
+        raise SystemExit("The mcp package is not installed")
+
+    if args.transport == "stdio":
+        import anyio
+        anyio.run(run_stdio)
+    else:
+        import uvicorn
+        uvicorn.run(create_http_app(), host=args.host, port=args.port)
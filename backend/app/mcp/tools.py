@@ -5,8 +5,10 @@ All tools enforce row-level security by filtering operations to the authenticate
 
 from sqlmodel import Session, select
 from sqlalchemy import func, or_
+from app.cache import task_cache
+from app.events.task_history import record_task_event, task_fields
+from app.http_cache import task_list_etag
 from app.models import Task
-from app.database import get_session
 from datetime import datetime
 from typing import Optional
 
@@ -46,8 +48,11 @@ async def create_task(
     )
 
     session.add(task)
+    session.flush()
+    record_task_event(session, "task.created", task.id, task_fields(task), user_id)
     session.commit()
     session.refresh(task)
+    task_cache.invalidate_user(user_id)
 
     return {
         "success": True,
@@ -87,43 +92,42 @@ async def list_tasks(
     if not user_id:
         return {"success": False, "error": "Unauthorized"}
 
-    # Build query
-    statement = select(Task).where(Task.user_id == user_id)
+    def load_tasks() -> list[dict]:
+        # Build query
+        statement = select(Task).where(Task.user_id == user_id)
 
-    # Apply filters
-    if is_complete is not None:
-        statement = statement.where(Task.is_complete == is_complete)
+        # Apply filters
+        if is_complete is not None:
+            statement = statement.where(Task.is_complete == is_complete)
 
-    if priority:
-        statement = statement.where(Task.priority == priority)
+        if priority:
+            statement = statement.where(Task.priority == priority)
 
-    if title_query:
-        query = title_query.strip().lower()
-        if query:
-            # Case-insensitive partial matching, plus a simple plural/singular "close match"
-            # (e.g., grocery <-> groceries)
-            like_patterns = [
-                f"%{query}%",
-            ]
+        if title_query:
+            query = title_query.strip().lower()
+            if query:
+                # Case-insensitive partial matching, plus a simple plural/singular "close match"
+                # (e.g., grocery <-> groceries)
+                like_patterns = [
+                    f"%{query}%",
+                ]
 
-            if query.endswith("s"):
-                like_patterns.append(f"%{query[:-1]}%")
-            else:
-                like_patterns.append(f"%{query}s%")
+                if query.endswith("s"):
+                    like_patterns.append(f"%{query[:-1]}%")
+                else:
+                    like_patterns.append(f"%{query}s%")
 
-            statement = statement.where(
-                or_(*[func.lower(Task.title).like(p) for p in like_patterns])
-            )
+                statement = statement.where(
+                    or_(*[func.lower(Task.title).like(p) for p in like_patterns])
+                )
 
-    # Apply limit and order
-    statement = statement.limit(limit).order_by(Task.created_at.desc())
+        # Apply limit and order
+        statement = statement.limit(limit).order_by(Task.created_at.desc())
 
-    # Execute query
-    tasks = session.exec(statement).all()
+        # Execute query
+        tasks = session.exec(statement).all()
 
-    return {
-        "success": True,
-        "tasks": [
+        return [
             {
                 "id": task.id,
                 "title": task.title,
@@ -134,7 +138,21 @@ async def list_tasks(
                 "updated_at": task.updated_at.isoformat()
             }
             for task in tasks
-        ],
+        ]
+
+    # Keyed on the list ETag like the REST list, so no cache serves a stale list
+    filters = {
+        "etag": task_list_etag(session, user_id),
+        "is_complete": is_complete,
+        "priority": priority,
+        "title_query": title_query,
+        "limit": limit
+    }
+    tasks = task_cache.get_or_load(user_id, "mcp", filters, load_tasks)
+
+    return {
+        "success": True,
+        "tasks": tasks,
         "count": len(tasks)
     }
 
@@ -170,6 +188,8 @@ async def update_task(
     if not task:
         return {"success": False, "error": "Task not found"}
 
+    previous = task_fields(task)
+
     # Update fields
     if title is not None:
         task.title = title.strip()
@@ -185,9 +205,13 @@ async def update_task(
     # Update timestamp
     task.updated_at = datetime.utcnow()
 
+    changes = {field: value for field, value in task_fields(task).items() if previous[field] != value}
     session.add(task)
+    if changes:
+        record_task_event(session, "task.updated", task.id, changes, user_id)
     session.commit()
     session.refresh(task)
+    task_cache.invalidate_user(user_id)
 
     return {
         "success": True,
@@ -231,12 +255,16 @@ async def toggle_task_completion(
         return {"success": False, "error": "Task not found"}
 
     # Update completion status
+    changed = task.is_complete != is_complete
     task.is_complete = is_complete
     task.updated_at = datetime.utcnow()
 
     session.add(task)
+    if changed:
+        record_task_event(session, "task.updated", task.id, {"is_complete": is_complete}, user_id)
     session.commit()
     session.refresh(task)
+    task_cache.invalidate_user(user_id)
 
     return {
         "success": True,
@@ -279,7 +307,9 @@ async def delete_task(
 
     # Delete task
     session.delete(task)
+    record_task_event(session, "task.deleted", task_id, {}, user_id)
     session.commit()
+    task_cache.invalidate_user(user_id)
 
     return {
         "success": True,
@@ -0,0 +1,210 @@
+"""Prometheus metrics for the backend.
+
+Exposed at GET /metrics. Collected:
+- HTTP request latency per route template, request counts, in-flight requests
+- DB pool checkout wait
+- OpenAI call latency and token usage (TodoAgent)
+- Event publish latency
+- Reminder worker: reminders fired, firing lag, claim latency and batch size
+- Retention job: rows moved to archive tables
+- Recurring task generator: task instances inserted
+- Notification dispatcher: outcomes, send latency and delivery lag per channel;
+  reminder notifications merged into digests
+- Event store: events appended per aggregate type
+
+Multiple uvicorn workers: set PROMETHEUS_MULTIPROC_DIR to an empty, writable
+directory before the workers start. Each worker then writes its samples to
+that directory and /metrics aggregates all of them, whichever worker serves
+the scrape.
+
+If prometheus_client is not installed, every metric is a no-op and /metrics
+returns 503.
+"""
+
+import os
+import time
+import logging
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST,
+        REGISTRY,
+        CollectorRegistry,
+        Counter,
+        Gauge,
+        Histogram,
+        generate_latest,
+        multiprocess,
+        start_http_server,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    # prometheus_client not available, create no-op implementations
+    class StubMetric:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def labels(self, *args, **kwargs):
+            return self
+
+        def observe(self, value):
+            pass
+
+        def inc(self, amount=1):
+            pass
+
+        def dec(self, amount=1):
+            pass
+
+        def set(self, value):
+            pass
+
+    Counter = Gauge = Histogram = StubMetric
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    PROMETHEUS_AVAILABLE = False
+
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+OPENAI_REQUEST_DURATION = Histogram(
+    "openai_request_duration_seconds",
+    "OpenAI chat completion latency",
+    ["model", "outcome"],
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0),
+)
+OPENAI_TOKENS = Counter(
+    "openai_tokens_total",
+    "OpenAI tokens consumed",
+    ["model", "kind"],
+)
+EVENT_PUBLISH_DURATION = Histogram(
+    "event_publish_duration_seconds",
+    "Event publish latency",
+    ["event_type", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+REMINDERS_FIRED = Counter(
+    "reminders_fired_total",
+    "Reminders fired by the reminder worker",
+)
+REMINDER_FIRE_LAG = Histogram(
+    "reminder_fire_lag_seconds",
+    "Delay between a reminder's scheduled time and its firing",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+REMINDER_CLAIM_DURATION = Histogram(
+    "reminder_claim_duration_seconds",
+    "Reminder worker claim transaction latency",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+REMINDER_BATCH_SIZE = Gauge(
+    "reminder_batch_size",
+    "Current reminder worker claim batch size",
+    multiprocess_mode="liveall",
+)
+
+ROWS_ARCHIVED = Counter(
+    "rows_archived_total",
+    "Rows moved to archive tables by the retention job",
+    ["table"],
+)
+
+RECURRING_TASKS_GENERATED = Counter(
+    "recurring_tasks_generated_total",
+    "Task instances inserted by the recurring task generator",
+)
+
+EVENTS_APPENDED = Counter(
+    "events_appended_total",
+    "Events appended to the event store",
+    ["aggregate_type"],
+)
+
+NOTIFICATIONS_COALESCED = Counter(
+    "notifications_coalesced_total",
+    "Reminder notifications merged into a digest (sends saved)",
+)
+
+NOTIFICATIONS_DISPATCHED = Counter(
+    "notifications_dispatched_total",
+    "Notification send attempts by outcome (sent, retry, dead_letter)",
+    ["channel", "outcome"],
+)
+NOTIFICATION_SEND_DURATION = Histogram(
+    "notification_send_duration_seconds",
+    "Channel backend send latency",
+    ["channel"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+NOTIFICATION_DELIVERY_LAG = Histogram(
+    "notification_delivery_lag_seconds",
+    "Delay between a notification's creation and its delivery",
+    ["channel"],
+    buckets=(0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0, 3600.0),
+)
+
+
+@contextmanager
+def observe_event_publish(event_type: str) -> Iterator[None]:
+    """Time an event publish call.
+
+    Usage:
+        with observe_event_publish("task.created"):
+            await publisher.publish_task_event(event)
+    """
+    outcome = "error"
+    started = time.perf_counter()
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EVENT_PUBLISH_DURATION.labels(event_type=event_type, outcome=outcome).observe(
+            time.perf_counter() - started
+        )
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Render all metrics in the Prometheus text format.
+
+    Returns:
+        tuple: (body, content type)
+    """
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def start_metrics_server(port: int) -> None:
+    """Serve /metrics from a background thread (worker processes)."""
+    if PROMETHEUS_AVAILABLE and port:
+        start_http_server(port)
+        logger.info(f"Metrics served on port {port}")
+
+
+def mark_worker_dead() -> None:
+    """Drop this worker's live gauges from the multiprocess directory."""
+    if PROMETHEUS_AVAILABLE and MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
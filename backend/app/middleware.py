@@ -0,0 +1,332 @@
+"""Pure ASGI middleware for per-request cross-cutting concerns.
+
+``@app.middleware("http")`` (BaseHTTPMiddleware) wraps every request and
+response in extra tasks and memory streams, which costs throughput and breaks
+streaming responses. HTTPLayerMiddleware does the same jobs in one plain ASGI
+layer that only touches the ``http.response.start`` message:
+
+- security headers
+- request metrics (latency per route template, in-flight requests)
+- query stats (per-request DB metrics, optional Server-Timing header)
+- read-your-writes routing (tracks commits, sets the db_primary_until cookie
+  so the client's next reads skip the replica; see app.database)
+
+CompressionMiddleware negotiates gzip/brotli response compression.
+"""
+
+import os
+import time
+import zlib
+from typing import Optional
+
+from dotenv import load_dotenv
+
+from app.database import (
+    PRIMARY_COOKIE,
+    READ_YOUR_WRITES_SECONDS,
+    engine,
+    primary_until_cookie,
+    read_engine,
+    track_writes,
+)
+from app.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT
+from app.query_stats import SERVER_TIMING_ENABLED, track_queries
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+load_dotenv()
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+SECURITY_HEADERS: tuple[tuple[bytes, bytes], ...] = (
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"x-xss-protection", b"1; mode=block"),
+)
+_SECURITY_HEADER_NAMES = frozenset(name for name, _ in SECURITY_HEADERS)
+
+
+class HTTPLayerMiddleware:
+    """Single ASGI layer for security headers, metrics and query timing.
+
+    Args:
+        app: Wrapped ASGI application
+        exclude_paths: Paths served without metrics or query stats
+            (security headers are still added)
+        server_timing: Send query stats as a Server-Timing header
+    """
+
+    def __init__(
+        self,
+        app,
+        exclude_paths: tuple[str, ...] = ("/metrics",),
+        server_timing: bool = SERVER_TIMING_ENABLED,
+    ):
+        self.app = app
+        self.exclude_paths = frozenset(exclude_paths)
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["path"] in self.exclude_paths:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start":
+                    message["headers"] = _with_security_headers(message.get("headers", ()))
+                await send(message)
+
+            await self.app(scope, receive, send_with_headers)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(method=method)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            sticky = _has_replica and primary_until_cookie(_header(scope["headers"], b"cookie"))
+            with track_queries() as stats, track_writes(sticky=sticky) as writes:
+                async def send_wrapper(message):
+                    nonlocal status_code
+                    if message["type"] == "http.response.start":
+                        status_code = message["status"]
+                        headers = _with_security_headers(message.get("headers", ()))
+                        if self.server_timing:
+                            headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                        if _has_replica and writes.wrote:
+                            headers.append((b"set-cookie", _primary_cookie()))
+                        message["headers"] = headers
+                    await send(message)
+
+                await self.app(scope, receive, send_wrapper)
+        finally:
+            in_flight.dec()
+            # Set by the router once the request matched a route
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method=method,
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            ).observe(time.perf_counter() - started)
+
+
+_has_replica = read_engine is not engine
+
+
+def _primary_cookie() -> bytes:
+    until = time.time() + READ_YOUR_WRITES_SECONDS
+    return (
+        f"{PRIMARY_COOKIE}={until:.0f}; Max-Age={READ_YOUR_WRITES_SECONDS}; "
+        "Path=/; HttpOnly; SameSite=Lax"
+    ).encode("latin-1")
+
+
+def _with_security_headers(headers) -> list[tuple[bytes, bytes]]:
+    """Return the response headers with the security headers applied."""
+    merged = [(name, value) for name, value in headers if name.lower() not in _SECURITY_HEADER_NAMES]
+    merged.extend(SECURITY_HEADERS)
+    return merged
+
+
+_COMPRESSIBLE_TYPES = (
+    b"text/",
+    b"application/json",
+    b"application/javascript",
+    b"application/xml",
+    b"application/problem+json",
+)
+
+# Creating a deflate stream allocates its window and hash tables; copying a
+# pristine template is cheaper than configuring a new one per response.
+# 16 + MAX_WBITS selects the gzip container.
+_GZIP_TEMPLATE = zlib.compressobj(COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = _GZIP_TEMPLATE.copy()
+
+    def encode(self, data: bytes, flush: bool) -> bytes:
+        chunk = self._compressor.compress(data)
+        if flush:
+            # Sync flush emits everything buffered so far (SSE events arrive
+            # immediately) while keeping the stream open
+            chunk += self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return chunk
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=COMPRESSION_BROTLI_QUALITY)
+
+    def encode(self, data: bytes, flush: bool) -> bytes:
+        chunk = self._compressor.process(data)
+        if flush:
+            chunk += self._compressor.flush()
+        return chunk
+
+    def finish(self, data: bytes = b"") -> bytes:
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+_ENCODERS = {"gzip": _GzipEncoder}
+if BROTLI_AVAILABLE:
+    _ENCODERS["br"] = _BrotliEncoder
+
+
+class CompressionMiddleware:
+    """Pure ASGI gzip/brotli compression negotiated from Accept-Encoding.
+
+    - Brotli is preferred when the client accepts it and the brotli package
+      is installed, gzip otherwise.
+    - Single-body responses smaller than minimum_size go out uncompressed.
+    - Streaming responses (more_body) are compressed chunk by chunk with a
+      flush after each chunk, so server-sent events are not held back.
+    - Responses that are already encoded, not text-like, or have no body
+      (204, 304, HEAD) pass through untouched.
+
+    Args:
+        app: Wrapped ASGI application
+        minimum_size: Smallest single-body response worth compressing
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(_header(scope["headers"], b"accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        encoder = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                if _should_compress(message):
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                if start_message is None:
+                    await send(message)
+                    return
+
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                encoder = _ENCODERS[encoding]()
+                headers = [
+                    (name, value)
+                    for name, value in start_message.get("headers", ())
+                    if name.lower() != b"content-length"
+                ]
+                headers.append((b"content-encoding", encoding.encode("latin-1")))
+                headers.append((b"vary", b"Accept-Encoding"))
+
+                if not more_body:
+                    body = encoder.finish(body)
+                    headers.append((b"content-length", str(len(body)).encode("latin-1")))
+                    start_message["headers"] = headers
+                    await send(start_message)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                start_message["headers"] = headers
+                await send(start_message)
+
+            if more_body:
+                chunk = encoder.encode(body, flush=True)
+            else:
+                chunk = encoder.finish(body)
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Raw Accept-Encoding header value
+
+    Returns:
+        "br", "gzip", or None to send the body unencoded
+    """
+    if not accept_encoding:
+        return None
+
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    wildcard = accepted.get("*", 0.0)
+    for coding in ("br", "gzip"):
+        if coding in _ENCODERS and accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def _should_compress(message) -> bool:
+    status_code = message["status"]
+    if status_code < 200 or status_code in (204, 304):
+        return False
+
+    content_type = b""
+    for name, value in message.get("headers", ()):
+        name = name.lower()
+        if name == b"content-encoding":
+            return False
+        if name == b"content-type":
+            content_type = value.lower()
+    return content_type.startswith(_COMPRESSIBLE_TYPES) or content_type.endswith(b"+json")
+
+
+def _header(headers, name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
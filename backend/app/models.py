@@ -9,14 +9,33 @@ Added Reminder model for reminders table.
 
 from enum import Enum as PyEnum
 from sqlmodel import Field, SQLModel, Relationship
-from sqlalchemy import Text, Column, text, Enum as SAEnum
+from sqlalchemy import Text, Column, DateTime, Table, text, Enum as SAEnum
 from sqlalchemy.dialects.postgresql import JSONB, UUID as PostgreSQL_UUID, ARRAY
-from sqlalchemy import Integer
+from sqlalchemy import BigInteger, Integer, Sequence
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 from uuid import UUID, uuid4
 
 
+# ============================================================================
+# Integer / UUID Id Bridge
+# ============================================================================
+
+# Until users and tasks move to UUID keys, Phase V rows (reminders,
+# recurrence_patterns) refer to an integer user or task id as UUID(int=id).
+_BIGINT_MAX = (1 << 63) - 1
+
+
+def legacy_uuid(id: int) -> UUID:
+    """UUID standing for an integer user or task id in the Phase V tables."""
+    return UUID(int=id)
+
+
+def legacy_id(value: UUID) -> Optional[int]:
+    """Integer id a Phase V UUID stands for, or None if it is not one."""
+    return value.int if 0 < value.int <= _BIGINT_MAX else None
+
+
 # ============================================================================
 # Enum Definitions
 # ============================================================================
@@ -100,6 +119,20 @@ class Task(SQLModel, table=True):
         sa_column=Column(JSONB)
     )
 
+    # Phase V recurrence fields (from migration 004). recurrence_instance_id
+    # identifies a generated instance; it is unique (migration 007) so the
+    # recurrence generator can insert idempotently.
+    due_date: Optional[datetime] = Field(default=None)
+    is_recurring: bool = Field(default=False, sa_column_kwargs={"server_default": text("false")})
+    recurrence_pattern_id: Optional[UUID] = Field(
+        default=None,
+        sa_column=Column(PostgreSQL_UUID(as_uuid=True), nullable=True)
+    )
+    recurrence_instance_id: Optional[UUID] = Field(
+        default=None,
+        sa_column=Column(PostgreSQL_UUID(as_uuid=True), nullable=True, unique=True)
+    )
+
     # Relationship
     user: Optional[User] = Relationship(back_populates="tasks")
 
@@ -130,7 +163,8 @@ class RecurrencePattern(SQLModel, table=True):
 
     Attributes:
         id: UUID primary key
-        user_id: UUID foreign key to users (CASCADE delete)
+        user_id: UUID foreign key to users (CASCADE delete); legacy_uuid(users.id)
+            while users have integer ids
         task_template: JSONB template for task creation
         frequency: Pattern type (daily, weekly, monthly, yearly, custom)
         interval: Repeat interval (e.g., every 2 weeks)
@@ -182,7 +216,8 @@ class Reminder(SQLModel, table=True):
 
     Note: Migration schema uses UUID types for id, task_id, and user_id.
     Current Task and User models use integer IDs. This mismatch will be
-    resolved in a future Phase V migration that converts to UUIDs.
+    resolved in a future Phase V migration that converts to UUIDs; until
+    then an integer id is stored as legacy_uuid(id).
 
     For T-523, we use UUID types to match the migration schema.
     """
@@ -219,16 +254,22 @@ class Event(SQLModel, table=True):
     Phase: Phase V - Event-Driven Architecture
 
     This model maps to the events table created in migration 004 (T-510).
-    Stores all system events for audit trail and event replay.
+    Stores all system events for audit trail and event replay. Events are
+    appended and read through app.events.store.
+
+    Since migration 011 the table is partitioned by month on created_at and
+    its primary key is (id, created_at); see app.workers.partition_maintenance.
 
     Attributes:
         id: UUID primary key
+        position: Global append order (sequence, migration 010)
         event_type: Event type identifier (e.g., task.created)
         aggregate_type: Type of entity (e.g., task, reminder)
         aggregate_id: UUID of the entity
         user_id: Optional UUID of the user who triggered the event
         payload: JSONB event data
-        metadata: Optional JSONB metadata
+        event_metadata: Optional JSONB metadata (column "metadata", a
+            reserved attribute name in declarative models)
         created_at: Event timestamp
     """
 
@@ -238,6 +279,10 @@ class Event(SQLModel, table=True):
         default_factory=uuid4,
         sa_column=Column(PostgreSQL_UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     )
+    position: Optional[int] = Field(
+        default=None,
+        sa_column=Column(BigInteger, Sequence("events_position_seq"), nullable=False, index=True)
+    )
     event_type: str = Field(max_length=50, nullable=False)
     aggregate_type: str = Field(max_length=50, nullable=False)
     aggregate_id: UUID = Field(
@@ -250,9 +295,56 @@ class Event(SQLModel, table=True):
     payload: Dict[str, Any] = Field(
         sa_column=Column(JSONB, nullable=False)
     )
-    metadata: Optional[Dict[str, Any]] = Field(
+    event_metadata: Optional[Dict[str, Any]] = Field(
         default=None,
-        sa_column=Column(JSONB, nullable=True)
+        sa_column=Column("metadata", JSONB, nullable=True)
+    )
+    created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class EventCheckpoint(SQLModel, table=True):
+    """Replay position of a projection over the event store.
+
+    Maps to the event_checkpoints table created in migration 010. A
+    projection saves its checkpoint in the same transaction as the read
+    model rows it derived, so it resumes exactly where it stopped.
+
+    Attributes:
+        name: Projection name
+        position: Position of the last event applied
+        updated_at: Last save time
+    """
+
+    __tablename__ = "event_checkpoints"
+
+    name: str = Field(primary_key=True, max_length=100)
+    position: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+    updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class EventSnapshot(SQLModel, table=True):
+    """State of one aggregate folded from its stream up to a position.
+
+    Maps to the event_snapshots table created in migration 012. Readers
+    start from the latest snapshot and replay only the events after it.
+
+    Attributes:
+        aggregate_type: Type of entity (e.g., task)
+        aggregate_id: UUID of the entity
+        position: Position of the last event folded into the state
+        state: JSONB aggregate state
+        created_at: Snapshot timestamp
+    """
+
+    __tablename__ = "event_snapshots"
+
+    aggregate_type: str = Field(primary_key=True, max_length=50)
+    aggregate_id: UUID = Field(
+        sa_column=Column(PostgreSQL_UUID(as_uuid=True), primary_key=True)
+    )
+    position: int = Field(sa_column=Column(BigInteger, primary_key=True))
+    state: Dict[str, Any] = Field(
+        sa_column=Column(JSONB, nullable=False)
     )
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
@@ -276,6 +368,8 @@ class Notification(SQLModel, table=True):
         last_error: Error message if delivery failed
         created_at: Creation timestamp
         sent_at: Delivery timestamp
+        next_attempt_at: When a pending notification may be claimed next
+            (retry backoff, or the lease of a dispatcher sending it; migration 008)
     """
 
     __tablename__ = "notifications"
@@ -301,3 +395,49 @@ class Notification(SQLModel, table=True):
     last_error: Optional[str] = Field(default=None, sa_column=Column(Text, nullable=True))
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     sent_at: Optional[datetime] = Field(default=None, nullable=True)
+    next_attempt_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
+
+
+class NotificationReminder(SQLModel, table=True):
+    """Link between a notification and every reminder it delivers.
+
+    A digest notification (see app.notifications.digest) delivers several
+    reminders of one user on one channel; notifications.reminder_id keeps the
+    first of them. Maps to the notification_reminders table created in
+    migration 009 (foreign keys cascade from both sides).
+
+    Attributes:
+        notification_id: UUID of the notification
+        reminder_id: UUID of a reminder it delivers
+    """
+
+    __tablename__ = "notification_reminders"
+
+    notification_id: UUID = Field(
+        sa_column=Column(PostgreSQL_UUID(as_uuid=True), primary_key=True)
+    )
+    reminder_id: UUID = Field(
+        sa_column=Column(PostgreSQL_UUID(as_uuid=True), primary_key=True, index=True)
+    )
+
+
+# ============================================================================
+# Archive tables (retention job)
+# ============================================================================
+
+def _archive_table(source: Table) -> Table:
+    """Cold copy of a table for rows moved out by the retention job.
+
+    Same columns (no defaults, foreign keys or constraints) plus archived_at;
+    created in migration 006.
+    """
+    return Table(
+        f"{source.name}_archive",
+        SQLModel.metadata,
+        *(Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable) for c in source.columns),
+        Column("archived_at", DateTime, nullable=False, index=True),
+    )
+
+
+reminders_archive = _archive_table(Reminder.__table__)
+notifications_archive = _archive_table(Notification.__table__)
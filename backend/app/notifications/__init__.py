@@ -0,0 +1,5 @@
+"""Notification delivery channels."""
+
+from app.notifications.channels import ChannelBackend, DeliveryError, Message, create_backends
+
+__all__ = ["ChannelBackend", "DeliveryError", "Message", "create_backends"]
@@ -0,0 +1,142 @@
+"""Notification channel backends.
+
+A backend delivers one message on one channel (email, push, sms). The
+dispatcher (app.workers.notifications) only depends on the ChannelBackend
+protocol, so a provider integration is a class with an async send() added
+to BACKENDS.
+
+Only local fakes ship here: they simulate provider latency and failures and
+keep what they sent, for development, tests and load tests.
+
+Configuration:
+- NOTIFICATION_BACKEND: backend for every channel (default: fake)
+- NOTIFICATION_FAKE_LATENCY_MS: simulated send latency (default 20)
+- NOTIFICATION_FAKE_FAILURE_RATE: share of sends that fail, retryably (default 0)
+"""
+
+import os
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Optional, Protocol
+from uuid import UUID
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_BACKEND = os.getenv("NOTIFICATION_BACKEND", "fake").lower()
+NOTIFICATION_FAKE_LATENCY_MS = float(os.getenv("NOTIFICATION_FAKE_LATENCY_MS", "20"))
+NOTIFICATION_FAKE_FAILURE_RATE = float(os.getenv("NOTIFICATION_FAKE_FAILURE_RATE", "0"))
+
+
+@dataclass(frozen=True)
+class Message:
+    """One notification to deliver; a digest delivers several reminders (reminder_ids)."""
+
+    notification_id: UUID
+    user_id: UUID
+    reminder_id: UUID
+    channel: str
+    attempt: int
+    created_at: datetime
+    reminder_ids: tuple[UUID, ...] = ()
+
+
+class DeliveryError(Exception):
+    """A send failed.
+
+    Args:
+        message: Error description (stored in notifications.last_error)
+        retryable: False for permanent failures (bad address, unsubscribed),
+            which are dead-lettered without further attempts
+    """
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class ChannelBackend(Protocol):
+    """Delivers messages on one channel."""
+
+    async def send(self, message: Message) -> None:
+        """Deliver a message; raise DeliveryError (or anything else) on failure."""
+        ...
+
+
+class FakeChannel:
+    """Local stand-in for a provider: sleeps, fails at a given rate, records sends.
+
+    Args:
+        channel: Channel name
+        latency: Seconds per send
+        failure_rate: Probability that a send raises a retryable DeliveryError
+        rng: Random source (default: module random)
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        latency: float = NOTIFICATION_FAKE_LATENCY_MS / 1000,
+        failure_rate: float = NOTIFICATION_FAKE_FAILURE_RATE,
+        rng: Optional[random.Random] = None,
+    ):
+        self.channel = channel
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.rng = rng or random.Random()
+        self.sent: list[Message] = []
+
+    async def send(self, message: Message) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and self.rng.random() < self.failure_rate:
+            raise DeliveryError(f"fake {self.channel} provider unavailable")
+        self.sent.append(message)
+
+
+class FakeEmail(FakeChannel):
+    """Fake email provider."""
+
+    def __init__(self, **kwargs):
+        super().__init__("email", **kwargs)
+
+
+class FakePush(FakeChannel):
+    """Fake push provider."""
+
+    def __init__(self, **kwargs):
+        super().__init__("push", **kwargs)
+
+
+class FakeSms(FakeChannel):
+    """Fake SMS provider."""
+
+    def __init__(self, **kwargs):
+        super().__init__("sms", **kwargs)
+
+
+# Backend name -> channel -> factory
+BACKENDS: dict[str, dict[str, Callable[[], ChannelBackend]]] = {
+    "fake": {"email": FakeEmail, "push": FakePush, "sms": FakeSms},
+}
+
+
+def create_backends(name: str = NOTIFICATION_BACKEND) -> dict[str, ChannelBackend]:
+    """Instantiate one backend per channel.
+
+    Args:
+        name: Backend family (a key of BACKENDS)
+
+    Returns:
+        dict: Channel name -> backend
+    """
+    if name not in BACKENDS:
+        logger.warning(f"Unknown NOTIFICATION_BACKEND={name!r}, using fake channels")
+        name = "fake"
+    return {channel: factory() for channel, factory in BACKENDS[name].items()}
@@ -0,0 +1,126 @@
+"""Digest coalescing: one notification per user and channel for reminders that fire together.
+
+At the morning peak many users have several tasks due at the same minute;
+sending each reminder separately multiplies outbound sends and provider cost.
+When the reminder worker fires a batch, coalesce() queues notifications per
+(user, channel) instead of per (reminder, channel):
+
+- reminders of the same user and channel fired in one claim share a new
+  notification
+- a reminder joins an open digest, a pending notification of the same user
+  and channel created less than NOTIFICATION_DIGEST_WINDOW_SECONDS ago that
+  no dispatcher has claimed yet
+
+Every reminder is linked to its notification in notification_reminders
+(migration 009); the dispatcher passes all of them to the channel backend.
+
+Delivery is never delayed to wait for more reminders. A digest stays open
+only until the dispatcher claims it, which happens at once when it keeps up
+and later under load, so coalescing grows with the backlog. "Not claimed
+yet" is next_attempt_at <= created_at: a claim's lease and a retry's backoff
+both move next_attempt_at later. Open digests are locked FOR UPDATE SKIP
+LOCKED, and the dispatcher's claim takes the same row locks, so a reminder is
+never added to a notification that is already being sent.
+
+NOTIFICATION_DIGEST_WINDOW_SECONDS=0 turns coalescing off (one notification
+per reminder and channel).
+"""
+
+import os
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+from uuid import uuid4
+
+from dotenv import load_dotenv
+from sqlalchemy import insert, select, tuple_
+from sqlmodel import Session
+
+from app.metrics import NOTIFICATIONS_COALESCED
+from app.models import Notification, NotificationChannelEnum, NotificationReminder, NotificationStatusEnum
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_DIGEST_WINDOW_SECONDS = float(os.getenv("NOTIFICATION_DIGEST_WINDOW_SECONDS", "60"))
+
+_notifications = Notification.__table__
+_links = NotificationReminder.__table__
+
+
+def _open_digests(session: Session, keys: set, now: datetime, window: float) -> dict:
+    """Lock the newest unclaimed pending notification of each (user, channel) key."""
+    # Filter on the (user, channel) pairs so other channels' digests stay unlocked
+    pairs = [(user_id, NotificationChannelEnum(channel)) for user_id, channel in keys]
+    rows = session.execute(
+        select(_notifications.c.id, _notifications.c.user_id, _notifications.c.channel)
+        .where(
+            tuple_(_notifications.c.user_id, _notifications.c.channel).in_(pairs),
+            _notifications.c.status == NotificationStatusEnum.pending,
+            _notifications.c.attempt == 0,
+            _notifications.c.next_attempt_at <= _notifications.c.created_at,
+            _notifications.c.created_at >= now - timedelta(seconds=window),
+        )
+        .order_by(_notifications.c.created_at)
+        .with_for_update(skip_locked=True)
+    )
+    return {(row.user_id, getattr(row.channel, "value", row.channel)): row.id for row in rows}
+
+
+def coalesce(
+    session: Session,
+    fired: Iterable[Any],
+    now: datetime,
+    window: float = NOTIFICATION_DIGEST_WINDOW_SECONDS,
+) -> int:
+    """Queue notifications for fired reminders, merging them per user and channel.
+
+    Runs in the firing transaction; the caller commits.
+
+    Args:
+        session: Database session (primary)
+        fired: Fired reminders (id, user_id and channels attributes), in firing order
+        now: Firing time
+        window: Digest window in seconds (0: one notification per reminder and channel)
+
+    Returns:
+        int: Notifications created
+    """
+    groups: dict[tuple, list] = defaultdict(list)
+    for reminder in fired:
+        for channel in reminder.channels:
+            # Without a window every (reminder, channel) pair is its own group
+            key = (reminder.user_id, channel) if window > 0 else (reminder.user_id, channel, reminder.id)
+            groups[key].append(reminder.id)
+    if not groups:
+        return 0
+
+    existing = _open_digests(session, set(groups), now, window) if window > 0 else {}
+    notifications, links = [], []
+    for key, reminder_ids in groups.items():
+        notification_id = existing.get(key)
+        if notification_id is None:
+            notification_id = uuid4()
+            notifications.append({
+                "id": notification_id,
+                "reminder_id": reminder_ids[0],
+                "user_id": key[0],
+                "channel": NotificationChannelEnum(key[1]),
+                "status": NotificationStatusEnum.pending,
+                "attempt": 0,
+                "created_at": now,
+                "next_attempt_at": now,
+            })
+        links.extend({"notification_id": notification_id, "reminder_id": reminder_id} for reminder_id in reminder_ids)
+
+    if notifications:
+        session.execute(insert(_notifications), notifications)
+    session.execute(insert(_links), links)
+
+    coalesced = len(links) - len(notifications)
+    if coalesced:
+        NOTIFICATIONS_COALESCED.inc(coalesced)
+        logger.info(f"Coalesced {len(links)} reminder notifications into {len(notifications)} new and {len(existing)} open digests")
+    return len(notifications)
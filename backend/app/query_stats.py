@@ -0,0 +1,138 @@
+"""SQL query instrumentation.
+
+Engine event hooks that count and time every statement. Per request they
+collect:
+- query count and cumulative DB time (recorded as metrics, and sent as a
+  Server-Timing header when SERVER_TIMING_ENABLED=true: it exposes database
+  timings to every client, so keep it to debugging and internal deployments)
+- slow statements (>= SQL_SLOW_QUERY_MS), logged as warnings
+- statements repeated SQL_REPEAT_THRESHOLD times or more in one request,
+  logged once as a likely N+1 pattern
+"""
+
+import os
+import time
+import logging
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.metrics import Histogram
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SQL_SLOW_QUERY_MS = float(os.getenv("SQL_SLOW_QUERY_MS", "200"))
+SQL_REPEAT_THRESHOLD = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "false").lower() == "true"
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "Number of SQL statements executed per HTTP request",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Cumulative SQL execution time per HTTP request",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+@dataclass
+class QueryStats:
+    """Statements executed during one request."""
+
+    count: int = 0
+    total_time: float = 0.0
+    statements: Counter = field(default_factory=Counter)
+
+    def server_timing(self) -> str:
+        """Format the stats as a Server-Timing header value."""
+        return f'db;dur={self.total_time * 1000:.2f};desc="{self.count} queries"'
+
+
+_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect query stats for the duration of a block (one request)."""
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+        DB_QUERIES_PER_REQUEST.observe(stats.count)
+        DB_TIME_PER_REQUEST.observe(stats.total_time)
+
+
+def statement_operation(statement: str) -> str:
+    """Metric label of a statement: its first keyword (SELECT, WITH, ...) or OTHER."""
+    words = statement.split(None, 1)
+    operation = words[0].upper() if words else ""
+    return operation if operation in _OPERATIONS else "OTHER"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+    DB_QUERY_DURATION.labels(operation=statement_operation(statement)).observe(elapsed)
+
+    if elapsed * 1000 >= SQL_SLOW_QUERY_MS:
+        logger.warning(f"Slow SQL ({elapsed * 1000:.1f} ms): {statement[:500]}")
+
+    stats = _query_stats.get()
+    if stats is None:
+        return
+
+    stats.count += 1
+    stats.total_time += elapsed
+    stats.statements[statement] += 1
+    if stats.statements[statement] == SQL_REPEAT_THRESHOLD:
+        logger.warning(
+            f"Possible N+1: statement executed {SQL_REPEAT_THRESHOLD} times in one request: "
+            f"{statement[:500]}"
+        )
+
+
+def _handle_error(exception_context):
+    # Failed statements never reach after_cursor_execute
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def instrument_engine(engine: Engine) -> Engine:
+    """Attach the query hooks to an engine.
+
+    Args:
+        engine: SQLAlchemy engine to instrument
+
+    Returns:
+        Engine: The same engine
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+    return engine
+
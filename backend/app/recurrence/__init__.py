@@ -0,0 +1,5 @@
+"""Recurrence expansion for RecurrencePattern rows."""
+
+from app.recurrence.engine import Occurrences, PatternBatch, expand_window, next_occurrences
+
+__all__ = ["Occurrences", "PatternBatch", "expand_window", "next_occurrences"]
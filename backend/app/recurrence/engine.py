@@ -0,0 +1,413 @@
+"""Vectorized occurrence expansion for RecurrencePattern.
+
+Expands many patterns at once with NumPy datetime64 arrays instead of a
+Python loop per pattern and per occurrence:
+
+1. PatternBatch turns pattern rows into column arrays (frequency, interval,
+   weekday bitmask, day of month, local anchor date and time of day, end,
+   max occurrences, timezone code)
+2. each frequency becomes arithmetic "series": a base date plus k strides of
+   days (daily, weekly per selected weekday, custom) or months (monthly,
+   yearly); the k ranges of all series are expanded in one ragged arange
+3. local wall-clock times are converted to UTC per timezone in bulk
+
+Semantics:
+- the series starts at the pattern's created_at, in its timezone; the time
+  of day is task_template["due_time"] ("HH:MM") if set, else created_at's
+- weekly: days_of_week (0=Mon) every `interval` weeks, counted from the
+  anchor's week (default: the anchor's weekday)
+- monthly: day_of_month (default: the anchor's day) every `interval`
+  months; days past the end of a month fall on its last day (31 -> Feb 28)
+- yearly: the anchor's month and day (or day_of_month) every `interval`
+  years; Feb 29 falls on Feb 28 in other years
+- custom: every `interval` days, restricted to days_of_week when set
+- end_date (UTC, inclusive) and max_occurrences bound the series;
+  occurrence ordinals count from 0 at the first occurrence
+- DST: wall-clock times are kept across transitions; a time skipped by a
+  spring-forward gap moves forward by the gap (02:30 -> 03:30), an
+  ambiguous fall-back time resolves to its first (daylight) instance
+
+Timezone conversion relies on every UTC offset and transition being on a
+15-minute boundary, so the offset is constant inside each 15-minute bucket:
+each timezone needs one zoneinfo lookup per distinct bucket (about 100 for
+a one-day window) rather than one per occurrence.
+
+All datetimes in and out are naive UTC, as stored in the database.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DAILY, WEEKLY, MONTHLY, YEARLY, CUSTOM = range(5)
+_FREQUENCY_CODES = {"daily": DAILY, "weekly": WEEKLY, "monthly": MONTHLY, "yearly": YEARLY, "custom": CUSTOM}
+
+_NO_LIMIT = np.iinfo(np.int64).max
+_BUCKET_SECONDS = 15 * 60
+_EPOCH = datetime(1970, 1, 1)
+# Local dates to scan beyond a UTC window (UTC offsets are within +-14h)
+_DAY = np.timedelta64(1, "D")
+
+
+@lru_cache(maxsize=None)
+def _zone(name: str):
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown timezone {name!r}, using UTC")
+        return timezone.utc
+
+
+def _bucket_offsets(zone, values: np.ndarray, local: bool) -> np.ndarray:
+    """UTC offsets (timedelta64[s]) of UTC or local instants in a zone."""
+    seconds = values.astype("int64")
+    buckets, inverse = np.unique(seconds - seconds % _BUCKET_SECONDS, return_inverse=True)
+    offsets = np.empty(len(buckets), dtype="int64")
+    for i, bucket in enumerate(buckets.tolist()):
+        instant = _EPOCH + timedelta(seconds=bucket)
+        if local:
+            offset = instant.replace(tzinfo=zone).utcoffset()
+        else:
+            offset = instant.replace(tzinfo=timezone.utc).astimezone(zone).utcoffset()
+        offsets[i] = offset.total_seconds()
+    return offsets[inverse.reshape(-1)].astype("timedelta64[s]")
+
+
+def _convert(values: np.ndarray, tz_codes: np.ndarray, zones: list[str], to_utc: bool) -> np.ndarray:
+    """Convert datetime64[s] values between UTC and their timezones' local time."""
+    out = values.copy()
+    order = np.argsort(tz_codes, kind="stable")
+    bounds = np.searchsorted(tz_codes[order], np.arange(len(zones) + 1))
+    for code, name in enumerate(zones):
+        rows = order[bounds[code]:bounds[code + 1]]
+        if len(rows) == 0 or name == "UTC":
+            continue
+        offsets = _bucket_offsets(_zone(name), values[rows], local=to_utc)
+        out[rows] = values[rows] - offsets if to_utc else values[rows] + offsets
+    return out
+
+
+def _weekday(dates: np.ndarray) -> np.ndarray:
+    """Weekday (0=Mon) of datetime64[D] values; 1970-01-01 was a Thursday."""
+    return (dates.astype("int64") + 3) % 7
+
+
+def _ragged(starts: np.ndarray, counts: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Expand per-series ranges [start, start + count) into flat (series, k) arrays."""
+    counts = np.maximum(counts, 0)
+    series = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.repeat(np.cumsum(counts) - counts, counts)
+    return series, np.arange(len(series)) - offsets + np.repeat(starts, counts)
+
+
+def _ceil_div(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return -(-a // b)
+
+
+def _parse_due_time(template: Any) -> Optional[int]:
+    """Seconds after midnight from task_template["due_time"] ("HH:MM"), if valid."""
+    value = (template or {}).get("due_time") if isinstance(template, dict) else None
+    if not isinstance(value, str):
+        return None
+    try:
+        hours, minutes = (int(part) for part in value.split(":")[:2])
+    except ValueError:
+        return None
+    if 0 <= hours < 24 and 0 <= minutes < 60:
+        return hours * 3600 + minutes * 60
+    return None
+
+
+@dataclass
+class PatternBatch:
+    """Recurrence patterns as column arrays.
+
+    Attributes:
+        ids: Pattern ids, in input order
+        frequency: Frequency codes (DAILY ... CUSTOM)
+        interval: Repeat interval
+        weekday_mask: Bit d set for weekday d (0=Mon) in days_of_week
+        day_of_month: Day of month (0 = the anchor's day)
+        anchor_date: First local date of the series
+        time_of_day: Local time of day of each occurrence
+        end: Last allowed occurrence, UTC (NaT = open-ended)
+        max_occurrences: Occurrence limit (int64 max = unlimited)
+        tz_codes: Index into zones
+        zones: Timezone names
+    """
+
+    ids: list
+    frequency: np.ndarray
+    interval: np.ndarray
+    weekday_mask: np.ndarray
+    day_of_month: np.ndarray
+    anchor_date: np.ndarray
+    time_of_day: np.ndarray
+    end: np.ndarray
+    max_occurrences: np.ndarray
+    tz_codes: np.ndarray
+    zones: list[str]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any]) -> "PatternBatch":
+        """Build a batch from RecurrencePattern objects or rows with the same attributes."""
+        rows = list(rows)
+        zone_codes: dict[str, int] = {}
+        frequency, interval, mask, dom, tz_codes, max_occurrences, due_times = [], [], [], [], [], [], []
+        for row in rows:
+            freq = getattr(row.frequency, "value", row.frequency)
+            frequency.append(_FREQUENCY_CODES[freq])
+            interval.append(max(int(row.interval or 1), 1))
+            mask.append(sum(1 << (d % 7) for d in set(row.days_of_week or ())))
+            dom.append(int(row.day_of_month or 0))
+            tz_codes.append(zone_codes.setdefault(row.timezone or "UTC", len(zone_codes)))
+            max_occurrences.append(_NO_LIMIT if row.max_occurrences is None else int(row.max_occurrences))
+            due = _parse_due_time(getattr(row, "task_template", None))
+            due_times.append(-1 if due is None else due)
+
+        zones = list(zone_codes)
+        tz_codes = np.array(tz_codes, dtype="int64")
+        created = np.array([row.created_at for row in rows], dtype="datetime64[s]")
+        anchor_local = _convert(created, tz_codes, zones, to_utc=False)
+        anchor_date = anchor_local.astype("datetime64[D]")
+
+        due_times = np.array(due_times, dtype="int64")
+        time_of_day = np.where(
+            due_times >= 0,
+            due_times,
+            (anchor_local - anchor_date.astype("datetime64[s]")).astype("int64"),
+        ).astype("timedelta64[s]")
+
+        return cls(
+            ids=[row.id for row in rows],
+            frequency=np.array(frequency, dtype="int8"),
+            interval=np.array(interval, dtype="int64"),
+            weekday_mask=np.array(mask, dtype="int64"),
+            day_of_month=np.array(dom, dtype="int64"),
+            anchor_date=anchor_date,
+            time_of_day=time_of_day,
+            end=np.array([row.end_date for row in rows], dtype="datetime64[s]"),
+            max_occurrences=np.array(max_occurrences, dtype="int64"),
+            tz_codes=tz_codes,
+            zones=zones,
+        )
+
+
+@dataclass(frozen=True)
+class Occurrences:
+    """Expanded occurrences, sorted by (pattern, time).
+
+    Attributes:
+        pattern_index: Index of the pattern in its batch
+        at: Occurrence time, naive UTC (datetime64[s])
+        ordinal: 0-based position of the occurrence in its series
+    """
+
+    pattern_index: np.ndarray
+    at: np.ndarray
+    ordinal: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.at)
+
+    def for_pattern(self, index: int) -> list[datetime]:
+        """Occurrence times of one pattern as datetimes."""
+        selected = self.at[self.pattern_index == index]
+        return [value.astype(datetime) for value in selected]
+
+
+@dataclass
+class _Candidates:
+    pattern: np.ndarray
+    date: np.ndarray
+    ordinal: np.ndarray
+
+
+def _concat(parts: list[_Candidates]) -> _Candidates:
+    return _Candidates(
+        pattern=np.concatenate([p.pattern for p in parts]) if parts else np.empty(0, "int64"),
+        date=np.concatenate([p.date for p in parts]) if parts else np.empty(0, "datetime64[D]"),
+        ordinal=np.concatenate([p.ordinal for p in parts]) if parts else np.empty(0, "int64"),
+    )
+
+
+def _day_ks(base, stride, lo, hi, count):
+    """k ranges of day-stride series from local date `lo` to `hi` or for `count` steps."""
+    k0 = np.maximum(0, _ceil_div((lo - base).astype("int64"), stride))
+    if hi is None:
+        counts = np.broadcast_to(np.asarray(count, dtype="int64"), k0.shape)
+    else:
+        counts = (hi - base).astype("int64") // stride - k0 + 1
+    series, k = _ragged(k0, counts)
+    dates = base[series] + (k * stride[series]).astype("timedelta64[D]")
+    return series, k, dates
+
+
+def _daily(batch: PatternBatch, rows: np.ndarray, lo, hi, count) -> _Candidates:
+    base, stride = batch.anchor_date[rows], batch.interval[rows]
+    series, k, dates = _day_ks(base, stride, lo, hi, count)
+    return _Candidates(rows[series], dates, k)
+
+
+def _weekly(batch: PatternBatch, rows: np.ndarray, lo, hi, count) -> _Candidates:
+    anchor = batch.anchor_date[rows]
+    anchor_weekday = _weekday(anchor)
+    mask = np.where(batch.weekday_mask[rows] == 0, 1 << anchor_weekday, batch.weekday_mask[rows])
+    bits = (mask[:, None] >> np.arange(7)) & 1
+
+    # One series per (pattern, selected weekday), stepping whole weeks
+    pair_row, weekday = np.nonzero(bits)
+    per_week = bits.sum(axis=1)
+    rank = np.cumsum(bits, axis=1)[pair_row, weekday] - 1
+    skipped = np.take_along_axis(np.cumsum(bits, axis=1), anchor_weekday[:, None], axis=1)[:, 0]
+    skipped = skipped - bits[np.arange(len(rows)), anchor_weekday]
+
+    monday = anchor - anchor_weekday.astype("timedelta64[D]")
+    base = monday[pair_row] + weekday.astype("timedelta64[D]")
+    stride = 7 * batch.interval[rows][pair_row]
+    series, k, dates = _day_ks(base, stride, lo[pair_row], hi, count)
+
+    pair = pair_row[series]
+    # Weekdays before the anchor in the first week are not occurrences
+    ordinal = k * per_week[pair] + rank[series] - skipped[pair]
+    keep = ordinal >= 0
+    return _Candidates(rows[pair][keep], dates[keep], ordinal[keep])
+
+
+def _custom(batch: PatternBatch, rows: np.ndarray, lo, hi, count) -> _Candidates:
+    base, stride = batch.anchor_date[rows], batch.interval[rows]
+    # Weekday filters can skip up to 6 of every 7 steps
+    series, k, dates = _day_ks(base, stride, lo, hi, None if count is None else 7 * count)
+
+    mask = batch.weekday_mask[rows]
+    # Which of the 7 residues of k (mod 7) land on a selected weekday
+    steps = (_weekday(base)[:, None] + np.arange(7) * stride[:, None]) % 7
+    hits = np.where(mask[:, None] == 0, 1, (mask[:, None] >> steps) & 1)
+    cumulative = np.cumsum(hits, axis=1)
+
+    residue = k % 7
+    keep = hits[series, residue] == 1
+    ordinal = (k // 7) * cumulative[series, 6] + cumulative[series, residue] - 1
+    return _Candidates(rows[series][keep], dates[keep], ordinal[keep])
+
+
+def _months(batch: PatternBatch, rows: np.ndarray, lo, hi, count, months_per_step: int) -> _Candidates:
+    anchor = batch.anchor_date[rows]
+    base = anchor.astype("datetime64[M]")
+    stride = batch.interval[rows] * months_per_step
+    day = np.where(batch.day_of_month[rows] > 0, batch.day_of_month[rows], (anchor - base.astype("datetime64[D]")).astype("int64") + 1)
+
+    def clamp(months, days):
+        first = months.astype("datetime64[D]")
+        length = ((months + 1).astype("datetime64[D]") - first).astype("int64")
+        return first + (np.minimum(days, length) - 1).astype("timedelta64[D]")
+
+    k0 = np.maximum(0, _ceil_div((lo.astype("datetime64[M]") - base).astype("int64"), stride))
+    if hi is None:
+        counts = np.full(len(rows), count + 1, dtype="int64")
+    else:
+        counts = (hi.astype("datetime64[M]") - base).astype("int64") // stride - k0 + 1
+    series, k = _ragged(k0, counts)
+    dates = clamp(base[series] + (k * stride[series]).astype("timedelta64[M]"), day[series])
+
+    # A day of month before the anchor's day skips the anchor month
+    skipped_first = (clamp(base, day) < anchor).astype("int64")
+    keep = dates >= anchor[series]
+    ordinal = k - skipped_first[series]
+    return _Candidates(rows[series][keep], dates[keep], ordinal[keep])
+
+
+def _candidates(batch: PatternBatch, lo: np.ndarray, hi, count) -> _Candidates:
+    """Candidate local dates of every pattern from its own lower bound `lo`."""
+    parts = []
+    for code, expand in (
+        (DAILY, _daily),
+        (WEEKLY, _weekly),
+        (CUSTOM, _custom),
+        (MONTHLY, lambda b, r, lo, hi, n: _months(b, r, lo, hi, n, 1)),
+        (YEARLY, lambda b, r, lo, hi, n: _months(b, r, lo, hi, n, 12)),
+    ):
+        rows = np.flatnonzero(batch.frequency == code)
+        if len(rows):
+            parts.append(expand(batch, rows, lo[rows], hi, count))
+    return _concat(parts)
+
+
+def _to_utc(batch: PatternBatch, found: _Candidates) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Apply limits and convert candidates to UTC; returns (pattern, at, ordinal)."""
+    keep = found.ordinal < batch.max_occurrences[found.pattern]
+    pattern, ordinal = found.pattern[keep], found.ordinal[keep]
+    local = found.date[keep].astype("datetime64[s]") + batch.time_of_day[pattern]
+    at = _convert(local, batch.tz_codes[pattern], batch.zones, to_utc=True)
+
+    end = batch.end[pattern]
+    keep = np.isnat(end) | (at <= end)
+    return pattern[keep], at[keep], ordinal[keep]
+
+
+def _sorted(pattern, at, ordinal, limit: Optional[int] = None) -> Occurrences:
+    order = np.lexsort((at, pattern))
+    pattern, at, ordinal = pattern[order], at[order], ordinal[order]
+    if limit is not None and len(pattern):
+        starts = np.r_[True, pattern[1:] != pattern[:-1]]
+        group_start = np.maximum.accumulate(np.where(starts, np.arange(len(pattern)), 0))
+        keep = np.arange(len(pattern)) - group_start < limit
+        pattern, at, ordinal = pattern[keep], at[keep], ordinal[keep]
+    return Occurrences(pattern_index=pattern, at=at, ordinal=ordinal)
+
+
+def _per_pattern(batch: PatternBatch, value) -> np.ndarray:
+    """A datetime, or an array with one datetime per pattern, as datetime64[s] per pattern."""
+    if isinstance(value, np.ndarray):
+        return value.astype("datetime64[s]")
+    return np.full(len(batch), np.datetime64(value, "s"))
+
+
+def expand_window(batch: PatternBatch, start, end: datetime) -> Occurrences:
+    """All occurrences with start <= time < end (naive UTC) for every pattern.
+
+    Args:
+        batch: Patterns to expand
+        start: Window start, naive UTC (inclusive); a datetime, or a
+            datetime64 array with one start per pattern
+        end: Window end, naive UTC (exclusive)
+
+    Returns:
+        Occurrences: Sorted by pattern, then time
+    """
+    start64, end64 = _per_pattern(batch, start), np.datetime64(end, "s")
+    lo = start64.astype("datetime64[D]") - _DAY
+    hi = np.datetime64(end64, "D") + _DAY
+    pattern, at, ordinal = _to_utc(batch, _candidates(batch, lo, hi, None))
+    keep = (at >= start64[pattern]) & (at < end64)
+    return _sorted(pattern[keep], at[keep], ordinal[keep])
+
+
+def next_occurrences(batch: PatternBatch, after, count: int) -> Occurrences:
+    """The next `count` occurrences strictly after `after` (naive UTC) for every pattern.
+
+    Args:
+        batch: Patterns to expand
+        after: Lower bound, naive UTC (exclusive); a datetime, or a
+            datetime64 array with one bound per pattern
+        count: Occurrences per pattern (fewer when a series ends)
+
+    Returns:
+        Occurrences: Sorted by pattern, then time
+    """
+    after64 = _per_pattern(batch, after)
+    lo = after64.astype("datetime64[D]") - _DAY
+    # Scanning from the day before `after` can yield up to 3 earlier hits
+    pattern, at, ordinal = _to_utc(batch, _candidates(batch, lo, None, count + 3))
+    keep = at > after64[pattern]
+    return _sorted(pattern[keep], at[keep], ordinal[keep], limit=count)
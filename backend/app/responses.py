@@ -0,0 +1,79 @@
+"""Fast JSON serialization for hot task endpoints.
+
+The default FastAPI path for a task list validates every ORM object through
+``response_model=list[TaskResponse]`` and then encodes the result with the
+stdlib JSON encoder. For large lists that costs more than the query itself.
+
+The fast path selects only the TaskResponse columns and encodes the rows
+straight to bytes with orjson (falling back to the stdlib encoder when orjson
+is not installed). The output is field-for-field identical to TaskResponse.
+
+Enabled with FAST_JSON_RESPONSES=true.
+"""
+
+import os
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Iterable, Sequence
+
+from fastapi.responses import Response
+from dotenv import load_dotenv
+
+from app.models import Task
+from app.schemas import TaskResponse
+
+load_dotenv()
+
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+try:
+    import orjson
+
+    def dumps(content: Any) -> bytes:
+        """Encode content to JSON bytes."""
+        return orjson.dumps(content)
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    def _default(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Enum):
+            return value.value
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    def dumps(content: Any) -> bytes:
+        """Encode content to JSON bytes."""
+        return json.dumps(content, default=_default, separators=(",", ":")).encode("utf-8")
+
+    ORJSON_AVAILABLE = False
+
+
+# Column list in TaskResponse field order; select these instead of ORM objects
+TASK_RESPONSE_FIELDS: tuple[str, ...] = tuple(TaskResponse.model_fields)
+TASK_RESPONSE_COLUMNS = tuple(getattr(Task, name) for name in TASK_RESPONSE_FIELDS)
+
+
+class FastJSONResponse(Response):
+    """JSON response rendered with orjson when available."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def serialize_task_rows(rows: Iterable[Sequence[Any]]) -> bytes:
+    """Encode rows selected with TASK_RESPONSE_COLUMNS as a TaskResponse list.
+
+    Args:
+        rows: Result rows in TASK_RESPONSE_FIELDS order
+
+    Returns:
+        bytes: JSON array of task objects
+    """
+    fields = TASK_RESPONSE_FIELDS
+    return dumps([dict(zip(fields, row)) for row in rows])
@@ -1,22 +1,78 @@
-"""Chat router for AI-powered natural language todo management."""
+"""Chat router for AI-powered natural language todo management.
 
-from fastapi import APIRouter, Depends, HTTPException, status
+The agent (openai, tenacity) and the MCP tools are loaded on the first chat
+turn rather than at startup.
+"""
+
+import logging
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Header, status
 from sqlmodel import Session
-from openai import APIError, RateLimitError, APIConnectionError
+from app.context import request_context
 from app.database import get_session
 from app.dependencies import get_dev_or_current_user  # DEV-ONLY: Uses dev bypass in development mode
 from app.models import User
 from app.schemas import ChatRequest, ChatResponse
-#from app.ai.agent import TodoAgent
+from app.shutdown import chat_turns
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Loaded by _get_agent_class() on first use
+TodoAgent = None
+
+
+async def _get_agent_class():
+    """Import the agent and initialize the MCP tool definitions once."""
+    global TodoAgent
+    if TodoAgent is None:
+        try:
+            from app.mcp.server import initialize_tools
+            await initialize_tools()
+        except ImportError:
+            # MCP module not available, the agent runs without tools
+            logger.warning("MCP module not available, skipping initialization")
+
+        from app.ai.agent import TodoAgent as agent_class
+        TodoAgent = agent_class
+    return TodoAgent
+
+
+def _to_http_exception(error: Exception) -> HTTPException:
+    """Map an agent failure to the HTTP error returned to the client."""
+    # openai is already imported once the agent has run
+    from openai import APIError, RateLimitError, APIConnectionError
+
+    if isinstance(error, RateLimitError):
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="OpenAI API rate limit exceeded. Please try again later."
+        )
+
+    if isinstance(error, APIConnectionError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Unable to connect to OpenAI API. Please try again later."
+        )
+
+    if isinstance(error, APIError):
+        return HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"OpenAI API error: {str(error)}"
+        )
+
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Internal server error: {str(error)}"
+    )
 
 
 @router.post("/chat", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_dev_or_current_user)  # DEV-ONLY: Bypasses auth in development mode
+    current_user: User = Depends(get_dev_or_current_user),  # DEV-ONLY: Bypasses auth in development mode
+    x_request_id: Optional[str] = Header(None)
 ) -> ChatResponse:
     """Process a natural language message and perform task operations.
 
@@ -32,6 +88,7 @@ async def chat(
         request: ChatRequest with user message
         session: Database session
         current_user: Authenticated user from JWT
+        x_request_id: Optional trace id propagated to tools and background work
 
     Returns:
         ChatResponse with AI message and optional metadata
@@ -43,40 +100,24 @@ async def chat(
     """
     try:
         # Initialize agent
-        agent = TodoAgent()
+        agent_class = await _get_agent_class()
+        agent = agent_class()
 
-        # Process message
-        response = await agent.process_message(
-            session=session,
-            user_id=current_user.id,
-            user_message=request.message
-        )
+        # Process message within this request's context; shutdown waits for
+        # tracked turns before closing the publisher and the engine
+        with chat_turns.track(), request_context(
+            user_id=current_user.id, session=session, trace_id=x_request_id
+        ):
+            response = await agent.process_message(
+                session=session,
+                user_id=current_user.id,
+                user_message=request.message
+            )
 
         return ChatResponse(
             message=response["message"],
             metadata=response.get("metadata")
         )
 
-    except RateLimitError as e:
-        raise HTTPException(
-            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-            detail="OpenAI API rate limit exceeded. Please try again later."
-        )
-
-    except APIConnectionError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Unable to connect to OpenAI API. Please try again later."
-        )
-
-    except APIError as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"OpenAI API error: {str(e)}"
-        )
-
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
-        )
+        raise _to_http_exception(e)
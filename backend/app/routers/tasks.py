@@ -7,17 +7,27 @@ This router emits CloudEvents for all task domain events:
 - task.created: When a new task is created
 - task.updated: When a task is updated (fields or completion status)
 - task.deleted: When a task is deleted
+
+The same events are appended to the event store in the transaction of each
+change; GET /tasks/{id}/history reads them back (app.events.task_history).
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlmodel import Session, select
 from datetime import datetime
+from typing import Optional
 import logging
 
-from app.database import get_session
+from app.cache import task_cache
+from app.database import get_read_session, get_session
+from app.metrics import observe_event_publish
+from app.http_cache import etag_matches, not_modified, set_etag, task_etag, task_list_etag
+from app.responses import FAST_JSON_RESPONSES, TASK_RESPONSE_COLUMNS, FastJSONResponse, serialize_task_rows
 from app.models import Task, User
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse
-from app.dependencies import get_current_user
+from app.schemas import FieldChange, TaskCreate, TaskHistoryEntry, TaskHistoryResponse, TaskUpdate, TaskResponse
+from app.dependencies import get_current_user, get_current_user_for_read
+
+from app.events.task_history import record_task_event, task_fields, task_history
 
 # T-521: Import event publishing components
 from app.events.publisher import get_event_publisher, EventPublisher
@@ -56,17 +66,134 @@ def _get_notification_channels(reminder_config: dict | None) -> list[str]:
 
 @router.get("/", response_model=list[TaskResponse])
 async def get_tasks(
-    current_user: User = Depends(get_current_user),
-    session: Session = Depends(get_session)
+    response: Response,
+    current_user: User = Depends(get_current_user_for_read),
+    session: Session = Depends(get_read_session),
+    if_none_match: Optional[str] = Header(None)
 ):
-    """Get all tasks for the current user."""
-    statement = (
-        select(Task)
-        .where(Task.user_id == current_user.id)
-        .order_by(Task.created_at.desc())
+    """Get all tasks for the current user.
+
+    Returns 304 when the client's ETag matches the current task-set version,
+    otherwise serves the list from the task list cache.
+
+    With FAST_JSON_RESPONSES enabled, rows are encoded straight to JSON bytes,
+    bypassing response_model validation (same schema as TaskResponse).
+    """
+    etag = task_list_etag(session, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    if FAST_JSON_RESPONSES:
+        def load_body() -> bytes:
+            statement = (
+                select(*TASK_RESPONSE_COLUMNS)
+                .where(Task.user_id == current_user.id)
+                .order_by(Task.created_at.desc())
+            )
+            return serialize_task_rows(session.exec(statement).all())
+
+        # Cached as encoded bytes: a hit goes straight into the response body
+        body = task_cache.get_or_load(current_user.id, "api-fast", {"etag": etag}, load_body)
+        fast_response = FastJSONResponse(body)
+        set_etag(fast_response, etag)
+        return fast_response
+
+    set_etag(response, etag)
+
+    def load_tasks() -> list[dict]:
+        statement = (
+            select(Task)
+            .where(Task.user_id == current_user.id)
+            .order_by(Task.created_at.desc())
+        )
+        tasks = session.exec(statement).all()
+        return [
+            TaskResponse.model_validate(task.model_dump()).model_dump(mode="json")
+            for task in tasks
+        ]
+
+    # Keying on the ETag keeps per-process caches consistent with the database
+    return task_cache.get_or_load(current_user.id, "api", {"etag": etag}, load_tasks)
+
+
+@router.get("/{task_id}", response_model=TaskResponse)
+async def get_task(
+    task_id: int,
+    response: Response,
+    current_user: User = Depends(get_current_user_for_read),
+    session: Session = Depends(get_read_session),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get a single task (with ownership check).
+
+    Returns 304 when the client's ETag matches the task's updated_at.
+    """
+    version = session.exec(
+        select(Task.user_id, Task.updated_at).where(Task.id == task_id)
+    ).first()
+
+    if not version:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    owner_id, updated_at = version
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this task"
+        )
+
+    etag = task_etag(task_id, updated_at)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
+    return session.get(Task, task_id)
+
+
+@router.get("/{task_id}/history", response_model=TaskHistoryResponse)
+async def get_task_history(
+    task_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[int] = Query(None, ge=1, description="next_before of the previous page"),
+    current_user: User = Depends(get_current_user_for_read),
+    session: Session = Depends(get_read_session)
+):
+    """Get what changed on a task, newest first (with ownership check).
+
+    Pages are keyset-paginated by event position; each change shows the
+    field's old and new value.
+    """
+    owner_id = session.exec(select(Task.user_id).where(Task.id == task_id)).first()
+
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this task"
+        )
+
+    entries, next_before, truncated = task_history(session, task_id, before=before, limit=limit)
+    return TaskHistoryResponse(
+        items=[
+            TaskHistoryEntry(
+                position=entry.position,
+                event_type=entry.event_type,
+                occurred_at=entry.occurred_at,
+                changes={field: FieldChange(old=old, new=new) for field, (old, new) in entry.changes.items()}
+            )
+            for entry in entries
+        ],
+        next_before=next_before,
+        truncated=truncated
     )
-    tasks = session.exec(statement).all()
-    return tasks
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -87,8 +214,11 @@ async def create_task(
     )
 
     session.add(task)
+    session.flush()
+    record_task_event(session, "task.created", task.id, task_fields(task), current_user.id)
     session.commit()
     session.refresh(task)
+    task_cache.invalidate_user(current_user.id)
 
     # T-521: Publish task.created event
     try:
@@ -103,7 +233,8 @@ async def create_task(
                 priority=task.priority
             )
         )
-        await publisher.publish_task_event(event)
+        with observe_event_publish("task.created"):
+            await publisher.publish_task_event(event)
         logger.info(f"Published task.created event for task {task.id}")
     except Exception as e:
         # Log error but don't fail the request
@@ -126,7 +257,8 @@ async def create_task(
                     notification_channels=_get_notification_channels(task.reminder_config)
                 )
             )
-            await publisher.publish_reminder_event(reminder_event)
+            with observe_event_publish("reminder.scheduled"):
+                await publisher.publish_reminder_event(reminder_event)
             logger.info(
                 f"Published reminder.scheduled event for task {task.id} "
                 f"(scheduled_time: {task.reminder_time})"
@@ -184,8 +316,11 @@ async def update_task(
 
     task.updated_at = datetime.utcnow()
     session.add(task)
+    if changes:
+        record_task_event(session, "task.updated", task.id, changes, current_user.id)
     session.commit()
     session.refresh(task)
+    task_cache.invalidate_user(current_user.id)
 
     # T-521: Publish task.updated event if there were changes
     if changes:
@@ -200,7 +335,8 @@ async def update_task(
                     previous_values=previous_values
                 )
             )
-            await publisher.publish_task_event(event)
+            with observe_event_publish("task.updated"):
+                await publisher.publish_task_event(event)
             logger.info(
                 f"Published task.updated event for task {task.id} "
                 f"(changed fields: {list(changes.keys())})"
@@ -228,7 +364,8 @@ async def update_task(
                         cancelled_at=datetime.utcnow()
                     )
                 )
-                await publisher.publish_reminder_event(cancel_event)
+                with observe_event_publish("reminder.cancelled"):
+                    await publisher.publish_reminder_event(cancel_event)
                 logger.info(
                     f"Published reminder.cancelled event for task {task.id} "
                     f"(reason: reminder_removed)"
@@ -252,7 +389,8 @@ async def update_task(
                         notification_channels=_get_notification_channels(task.reminder_config)
                     )
                 )
-                await publisher.publish_reminder_event(schedule_event)
+                with observe_event_publish("reminder.scheduled"):
+                    await publisher.publish_reminder_event(schedule_event)
                 action = "rescheduled" if previous_reminder_time else "scheduled"
                 logger.info(
                     f"Published reminder.scheduled event for task {task.id} "
@@ -298,8 +436,10 @@ async def toggle_task(
     task.updated_at = datetime.utcnow()
 
     session.add(task)
+    record_task_event(session, "task.updated", task.id, {"is_complete": task.is_complete}, current_user.id)
     session.commit()
     session.refresh(task)
+    task_cache.invalidate_user(current_user.id)
 
     # T-521: Publish task.updated event for completion status change
     try:
@@ -313,7 +453,8 @@ async def toggle_task(
                 previous_values={"is_complete": previous_is_complete}
             )
         )
-        await publisher.publish_task_event(event)
+        with observe_event_publish("task.updated"):
+            await publisher.publish_task_event(event)
         logger.info(
             f"Published task.updated event for task {task.id} "
             f"(completion: {previous_is_complete} -> {task.is_complete})"
@@ -362,7 +503,9 @@ async def delete_task(
     had_reminder = task.reminder_time is not None
 
     session.delete(task)
+    record_task_event(session, "task.deleted", task_id_for_event, {}, current_user.id)
     session.commit()
+    task_cache.invalidate_user(current_user.id)
 
     # T-521: Publish task.deleted event
     try:
@@ -376,7 +519,8 @@ async def delete_task(
                 was_complete=was_complete_for_event
             )
         )
-        await publisher.publish_task_event(event)
+        with observe_event_publish("task.deleted"):
+            await publisher.publish_task_event(event)
         logger.info(
             f"Published task.deleted event for task {task_id_for_event} "
             f"(title: '{title_for_event}')"
@@ -400,7 +544,8 @@ async def delete_task(
                     cancelled_at=datetime.utcnow()
                 )
             )
-            await publisher.publish_reminder_event(cancel_event)
+            with observe_event_publish("reminder.cancelled"):
+                await publisher.publish_reminder_event(cancel_event)
             logger.info(
                 f"Published reminder.cancelled event for task {task_id_for_event} "
                 f"(reason: task_deleted)"
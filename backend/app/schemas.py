@@ -81,6 +81,36 @@ class TaskResponse(BaseModel):
     reminder_config: Optional[Dict[str, Any]] = None
 
 
+class FieldChange(BaseModel):
+    """Old and new value of one task field."""
+
+    old: Any = None
+    new: Any = None
+
+
+class TaskHistoryEntry(BaseModel):
+    """One change to a task, from its event stream."""
+
+    position: int
+    event_type: str
+    occurred_at: datetime
+    changes: Dict[str, FieldChange]
+
+
+class TaskHistoryResponse(BaseModel):
+    """A page of task history, newest first.
+
+    next_before is the cursor for the next (older) page; None on the last page.
+    truncated is true when the history starts after the task was created
+    (older events are not recorded); changes whose old value is unknown are
+    left out.
+    """
+
+    items: list[TaskHistoryEntry]
+    next_before: Optional[int] = None
+    truncated: bool = False
+
+
 # Phase III: Chat Schemas
 
 class ChatRequest(BaseModel):
@@ -0,0 +1,101 @@
+"""Graceful shutdown: drain in-flight work before releasing resources.
+
+Shutdown order (run from the app lifespan after uvicorn stops accepting
+connections):
+
+1. Wait for in-flight chat turns until SHUTDOWN_DRAIN_TIMEOUT, logging
+   progress
+2. Close the event publisher (after the work that publishes has finished)
+3. Dispose of the database engine
+
+uvicorn waits for open HTTP requests itself; run it with
+--timeout-graceful-shutdown at least as long as SHUTDOWN_DRAIN_TIMEOUT so
+long chat turns are not cancelled before the lifespan drain sees them. In
+Kubernetes, a preStop sleep keeps the pod serving until it has been removed
+from the Service endpoints, so no new requests hit a stopping process. The
+app cannot take itself out of rotation from here: by the time the lifespan
+runs, uvicorn has closed its listening socket and probes are refused.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "25"))
+SHUTDOWN_PROGRESS_INTERVAL = 2.0
+
+
+class InFlight:
+    """Counts units of work in progress and signals when none are left."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.count = 0
+        self._idle: Optional[asyncio.Event] = None
+
+    def _event(self) -> asyncio.Event:
+        if self._idle is None:
+            self._idle = asyncio.Event()
+            if self.count == 0:
+                self._idle.set()
+        return self._idle
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Mark a block as in-flight work."""
+        self.count += 1
+        self._event().clear()
+        try:
+            yield
+        finally:
+            self.count -= 1
+            if self.count == 0:
+                self._event().set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """Wait until no work is in flight.
+
+        Returns:
+            True if idle within the timeout
+        """
+        try:
+            await asyncio.wait_for(self._event().wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+# Chat turns last seconds (several OpenAI round trips); track them explicitly
+chat_turns = InFlight("chat turns")
+
+
+async def drain(timeout: float = SHUTDOWN_DRAIN_TIMEOUT) -> bool:
+    """Wait for in-flight chat turns.
+
+    Args:
+        timeout: Seconds to wait in total
+
+    Returns:
+        True if everything finished, False if the deadline passed
+    """
+    deadline = time.monotonic() + timeout
+
+    while chat_turns.count:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            logger.warning(f"Drain deadline passed with {chat_turns.count} chat turns still running")
+            return False
+
+        logger.info(f"Draining: {chat_turns.count} chat turns in flight, {remaining:.0f}s left")
+        await chat_turns.wait_idle(min(remaining, SHUTDOWN_PROGRESS_INTERVAL))
+
+    return True
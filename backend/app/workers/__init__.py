@@ -0,0 +1 @@
+"""Background workers that run as their own processes (python -m app.workers.<name>)."""
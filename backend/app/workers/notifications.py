@@ -0,0 +1,370 @@
+"""Notification dispatcher: delivers pending notifications through channel backends.
+
+The reminder worker queues one pending notifications row per channel. The
+dispatcher runs one loop per channel, so a slow provider (sms) never holds
+up a fast one (push). Each round of a channel loop:
+
+1. claims up to concurrency x NOTIFICATION_BATCH_PER_SLOT pending rows of the
+   channel whose next_attempt_at has passed (FOR UPDATE SKIP LOCKED) and
+   leases them by moving next_attempt_at NOTIFICATION_LEASE_SECONDS ahead;
+   the claim commits at once, so no transaction stays open while sending
+2. sends them concurrently, at most the channel's concurrency at a time
+   (NOTIFICATION_CONCURRENCY), each bounded by NOTIFICATION_SEND_TIMEOUT
+3. records every outcome in one transaction:
+   - sent: status sent, sent_at
+   - failed, attempts left: stays pending, next_attempt_at set by exponential
+     backoff with jitter (NOTIFICATION_BACKOFF_BASE doubling per attempt, up
+     to NOTIFICATION_BACKOFF_MAX)
+   - failed permanently (DeliveryError(retryable=False)) or after
+     NOTIFICATION_MAX_ATTEMPTS: dead-lettered as status failed, last_error
+     kept for inspection
+
+Throughput per channel is concurrency / provider latency, and any number of
+replicas can run side by side. A dispatcher that dies mid-send loses nothing:
+its lease expires and the rows are claimed again (delivery is at least once).
+Keep the lease above NOTIFICATION_BATCH_PER_SLOT x NOTIFICATION_SEND_TIMEOUT,
+the longest a claimed batch can take.
+
+Usage:
+    python -m app.workers.notifications
+"""
+
+import os
+import time
+import random
+import signal
+import asyncio
+import logging
+import argparse
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, select, update
+from sqlmodel import Session
+
+from app.database import engine
+from app.metrics import (
+    NOTIFICATION_DELIVERY_LAG,
+    NOTIFICATION_SEND_DURATION,
+    NOTIFICATIONS_DISPATCHED,
+    start_metrics_server,
+)
+from app.models import Notification, NotificationChannelEnum, NotificationReminder, NotificationStatusEnum
+from app.notifications import ChannelBackend, DeliveryError, Message, create_backends
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_concurrency(value: str) -> dict[str, int]:
+    """Parse "email=50,push=100" into {"email": 50, "push": 100}."""
+    limits = {}
+    for item in value.split(","):
+        channel, _, limit = item.partition("=")
+        if channel.strip() and limit.strip():
+            limits[channel.strip()] = int(limit)
+    return limits
+
+
+NOTIFICATION_CONCURRENCY = _parse_concurrency(os.getenv("NOTIFICATION_CONCURRENCY", "email=50,push=100,sms=10"))
+NOTIFICATION_DEFAULT_CONCURRENCY = 20
+NOTIFICATION_BATCH_PER_SLOT = int(os.getenv("NOTIFICATION_BATCH_PER_SLOT", "4"))
+NOTIFICATION_LEASE_SECONDS = float(os.getenv("NOTIFICATION_LEASE_SECONDS", "60"))
+NOTIFICATION_SEND_TIMEOUT = float(os.getenv("NOTIFICATION_SEND_TIMEOUT", "10"))
+NOTIFICATION_MAX_ATTEMPTS = int(os.getenv("NOTIFICATION_MAX_ATTEMPTS", "5"))
+NOTIFICATION_BACKOFF_BASE = float(os.getenv("NOTIFICATION_BACKOFF_BASE", "30"))
+NOTIFICATION_BACKOFF_MAX = float(os.getenv("NOTIFICATION_BACKOFF_MAX", "3600"))
+NOTIFICATION_POLL_INTERVAL = float(os.getenv("NOTIFICATION_POLL_INTERVAL", "1.0"))
+NOTIFICATION_METRICS_PORT = int(os.getenv("NOTIFICATION_METRICS_PORT", "9103"))
+
+_notifications = Notification.__table__
+_links = NotificationReminder.__table__
+
+
+@dataclass(frozen=True)
+class Outcome:
+    """Result of one send attempt."""
+
+    message: Message
+    error: Optional[str] = None
+    retryable: bool = True
+
+    @property
+    def sent(self) -> bool:
+        return self.error is None
+
+
+def backoff_delay(attempt: int, base: float, maximum: float, rng: random.Random) -> float:
+    """Seconds before retry number `attempt` (1-based): base x 2^(attempt-1), capped, with jitter.
+
+    The jitter (50-100% of the delay) spreads retries of a batch that failed
+    together, e.g. during a provider outage, instead of retrying in lockstep.
+    """
+    delay = min(maximum, base * 2 ** (attempt - 1))
+    return delay * rng.uniform(0.5, 1.0)
+
+
+def claim_notifications(
+    session: Session,
+    channel: str,
+    limit: int,
+    now: Optional[datetime] = None,
+    lease_seconds: float = NOTIFICATION_LEASE_SECONDS,
+) -> list[Message]:
+    """Lease up to `limit` due pending notifications of one channel, oldest due first.
+
+    Must run in its own transaction; the caller commits. Rows locked by
+    concurrent claims are skipped.
+
+    Returns:
+        list: Messages to send
+    """
+    now = now or datetime.utcnow()
+    due = (
+        select(_notifications.c.id)
+        .where(
+            _notifications.c.status == NotificationStatusEnum.pending,
+            _notifications.c.channel == NotificationChannelEnum(channel),
+            _notifications.c.next_attempt_at <= now,
+        )
+        .order_by(_notifications.c.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    statement = (
+        update(_notifications)
+        .where(_notifications.c.id == due.c.id)
+        .values(next_attempt_at=now + timedelta(seconds=lease_seconds))
+        .returning(
+            _notifications.c.id,
+            _notifications.c.user_id,
+            _notifications.c.reminder_id,
+            _notifications.c.attempt,
+            _notifications.c.created_at,
+        )
+    )
+    rows = session.execute(statement).all()
+    if not rows:
+        return []
+
+    # Every reminder each notification delivers (several for a digest)
+    reminder_ids = defaultdict(list)
+    links = session.execute(
+        select(_links.c.notification_id, _links.c.reminder_id).where(_links.c.notification_id.in_([row.id for row in rows]))
+    )
+    for link in links:
+        reminder_ids[link.notification_id].append(link.reminder_id)
+
+    return [
+        Message(
+            notification_id=row.id,
+            user_id=row.user_id,
+            reminder_id=row.reminder_id,
+            channel=channel,
+            attempt=row.attempt + 1,
+            created_at=row.created_at,
+            reminder_ids=tuple(reminder_ids.get(row.id) or [row.reminder_id]),
+        )
+        for row in rows
+    ]
+
+
+def record_outcomes(
+    session: Session,
+    outcomes: list[Outcome],
+    now: Optional[datetime] = None,
+    max_attempts: int = NOTIFICATION_MAX_ATTEMPTS,
+    backoff_base: float = NOTIFICATION_BACKOFF_BASE,
+    backoff_max: float = NOTIFICATION_BACKOFF_MAX,
+    rng: Optional[random.Random] = None,
+) -> dict[str, int]:
+    """Mark sends delivered, schedule retries and dead-letter exhausted notifications.
+
+    Rows that are no longer pending (finished by another dispatcher after a
+    lease expired) are left alone. The caller commits.
+
+    Returns:
+        dict: Count per outcome (sent, retry, dead_letter)
+    """
+    now = now or datetime.utcnow()
+    rng = rng or random.Random()
+    sent, retry, dead = [], [], []
+    for outcome in outcomes:
+        message = outcome.message
+        row = {"notification_id": message.notification_id, "attempts": message.attempt}
+        if outcome.sent:
+            sent.append(row)
+        elif outcome.retryable and message.attempt < max_attempts:
+            delay = backoff_delay(message.attempt, backoff_base, backoff_max, rng)
+            retry.append({**row, "error": outcome.error, "retry_at": now + timedelta(seconds=delay)})
+        else:
+            dead.append({**row, "error": outcome.error})
+
+    pending = update(_notifications).where(
+        _notifications.c.id == bindparam("notification_id"),
+        _notifications.c.status == NotificationStatusEnum.pending,
+    )
+    if sent:
+        session.execute(
+            pending.values(status=NotificationStatusEnum.sent, sent_at=now, attempt=bindparam("attempts"), last_error=None),
+            sent,
+        )
+    if retry:
+        session.execute(
+            pending.values(
+                attempt=bindparam("attempts"),
+                last_error=bindparam("error"),
+                next_attempt_at=bindparam("retry_at"),
+            ),
+            retry,
+        )
+    if dead:
+        session.execute(
+            pending.values(status=NotificationStatusEnum.failed, attempt=bindparam("attempts"), last_error=bindparam("error")),
+            dead,
+        )
+    return {"sent": len(sent), "retry": len(retry), "dead_letter": len(dead)}
+
+
+class NotificationDispatcher:
+    """Delivers pending notifications on every channel until stopped.
+
+    Args:
+        bind: Engine to claim on (default: the primary)
+        backends: Channel name -> backend (default: create_backends())
+        concurrency: Channel name -> concurrent sends (default: NOTIFICATION_CONCURRENCY)
+        batch_per_slot: Claim size as a multiple of the channel's concurrency
+        poll_interval: Seconds a channel sleeps once caught up
+        send_timeout: Seconds before a send counts as failed
+        rng: Random source for backoff jitter
+    """
+
+    def __init__(
+        self,
+        bind=None,
+        backends: Optional[dict[str, ChannelBackend]] = None,
+        concurrency: Optional[dict[str, int]] = None,
+        batch_per_slot: int = NOTIFICATION_BATCH_PER_SLOT,
+        poll_interval: float = NOTIFICATION_POLL_INTERVAL,
+        send_timeout: float = NOTIFICATION_SEND_TIMEOUT,
+        rng: Optional[random.Random] = None,
+    ):
+        self.bind = bind if bind is not None else engine
+        self.backends = backends if backends is not None else create_backends()
+        limits = concurrency if concurrency is not None else NOTIFICATION_CONCURRENCY
+        self.concurrency = {
+            channel: max(1, limits.get(channel, NOTIFICATION_DEFAULT_CONCURRENCY)) for channel in self.backends
+        }
+        self.batch_per_slot = batch_per_slot
+        self.poll_interval = poll_interval
+        self.send_timeout = send_timeout
+        self.rng = rng or random.Random()
+        # Created lazily: semaphores bind to the running event loop
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _claim(self, channel: str, limit: int) -> list[Message]:
+        with Session(self.bind) as session:
+            messages = claim_notifications(session, channel, limit)
+            session.commit()
+        return messages
+
+    def _record(self, outcomes: list[Outcome]) -> dict[str, int]:
+        with Session(self.bind) as session:
+            counts = record_outcomes(session, outcomes, rng=self.rng)
+            session.commit()
+        return counts
+
+    async def _send(self, backend: ChannelBackend, semaphore: asyncio.Semaphore, message: Message) -> Outcome:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await asyncio.wait_for(backend.send(message), self.send_timeout)
+                outcome = Outcome(message)
+            except DeliveryError as e:
+                outcome = Outcome(message, error=str(e), retryable=e.retryable)
+            except asyncio.TimeoutError:
+                outcome = Outcome(message, error=f"send timed out after {self.send_timeout}s")
+            except Exception as e:
+                outcome = Outcome(message, error=f"{type(e).__name__}: {e}")
+            NOTIFICATION_SEND_DURATION.labels(channel=message.channel).observe(time.perf_counter() - started)
+        return outcome
+
+    async def dispatch(self, channel: str) -> tuple[int, bool]:
+        """Run one claim/send/record round for a channel.
+
+        Returns:
+            tuple: (notifications attempted, whether the claim was full)
+        """
+        limit = self.concurrency[channel] * self.batch_per_slot
+        messages = await asyncio.to_thread(self._claim, channel, limit)
+        if not messages:
+            return 0, False
+
+        semaphore = self._semaphores.setdefault(channel, asyncio.Semaphore(self.concurrency[channel]))
+        backend = self.backends[channel]
+        outcomes = await asyncio.gather(*(self._send(backend, semaphore, message) for message in messages))
+        counts = await asyncio.to_thread(self._record, list(outcomes))
+
+        now = datetime.utcnow()
+        for outcome in outcomes:
+            if outcome.sent:
+                NOTIFICATION_DELIVERY_LAG.labels(channel=channel).observe((now - outcome.message.created_at).total_seconds())
+        for name, value in counts.items():
+            if value:
+                NOTIFICATIONS_DISPATCHED.labels(channel=channel, outcome=name).inc(value)
+        logger.info(
+            f"Dispatched {len(messages)} {channel} notifications: "
+            f"{counts['sent']} sent, {counts['retry']} retrying, {counts['dead_letter']} dead-lettered"
+        )
+        return len(messages), len(messages) >= limit
+
+    async def run_channel(self, channel: str, stop: asyncio.Event) -> None:
+        """Dispatch one channel until `stop` is set."""
+        while not stop.is_set():
+            try:
+                _, backlog = await self.dispatch(channel)
+            except Exception as e:
+                logger.error(f"Notification dispatch failed ({channel}): {e}", exc_info=True)
+                backlog = False
+
+            if not backlog:
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Dispatch every channel concurrently until `stop` is set."""
+        limits = ", ".join(f"{channel}={limit}" for channel, limit in self.concurrency.items())
+        logger.info(f"Notification dispatcher started (concurrency {limits})")
+        await asyncio.gather(*(self.run_channel(channel, stop) for channel in self.backends))
+        logger.info("Notification dispatcher stopped")
+
+
+async def _serve() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    await NotificationDispatcher().run(stop)
+    engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Notification dispatcher")
+    parser.add_argument("--metrics-port", type=int, default=NOTIFICATION_METRICS_PORT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    start_metrics_server(args.metrics_port)
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""Partition maintenance for the monthly partitioned events table.
+
+events is range-partitioned by month on created_at (migration 011), one
+partition per month named events_YYYY_MM. This job keeps the partition set
+rolling:
+
+- creates the current month and the next EVENT_PARTITIONS_AHEAD months if
+  missing, so inserts never fall through to events_default. A month's rows
+  that did land in events_default are moved into its new partition in the
+  same transaction, because ATTACH refuses a range the default partition
+  still holds rows for.
+- retires months that ended more than EVENT_RETENTION_MONTHS ago, if set:
+  DETACH keeps the month as a standalone table for export to cold storage,
+  EVENT_PARTITION_RETIREMENT=drop deletes it. Either way the rows leave
+  without a DELETE or any vacuum work.
+
+events is the source of truth for task history and projections, so by
+default every month is kept. Retiring a month removes its events from
+replay() and task_history(): histories of older tasks come back truncated
+(they start after a missing task.created), and a projection rebuilt from
+position 0 only sees the months still attached.
+
+Each partition is created or retired in its own transaction. Running the job
+twice is harmless.
+
+Usage (e.g. from a daily CronJob):
+    python -m app.workers.partition_maintenance
+"""
+
+import os
+import re
+import logging
+import argparse
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.database import engine
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+EVENT_PARTITIONS_AHEAD = int(os.getenv("EVENT_PARTITIONS_AHEAD", "3"))
+# 0 keeps every month; see the module docstring before retiring any
+EVENT_RETENTION_MONTHS = int(os.getenv("EVENT_RETENTION_MONTHS", "0"))
+EVENT_PARTITION_RETIREMENT = os.getenv("EVENT_PARTITION_RETIREMENT", "detach").lower()
+
+_PARENT = "events"
+_DEFAULT = "events_default"
+_PARTITION_NAME = re.compile(r"^events_(\d{4})_(\d{2})$")
+
+
+def add_months(month: date, months: int) -> date:
+    """First day of the month `months` after (or before) `month`."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Partition holding a month's events (events_YYYY_MM)."""
+    return f"{_PARENT}_{month:%Y_%m}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month of a monthly partition, or None for any other table."""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+@dataclass(frozen=True)
+class PartitionPlan:
+    """Months to create and partitions to retire, oldest first."""
+
+    create: list[date]
+    retire: list[str]
+
+
+def plan_partitions(existing: Iterable[str], today: date, ahead: int, retention_months: int) -> PartitionPlan:
+    """Work out which partitions to create and retire.
+
+    Args:
+        existing: Names of the current partitions of events
+        today: Current date
+        ahead: Months to keep created after the current one
+        retention_months: Full months to keep before the current one (0: all)
+
+    Returns:
+        PartitionPlan: Missing months and partitions past retention
+    """
+    current = today.replace(day=1)
+    months = {partition_month(name): name for name in existing if partition_month(name)}
+    create = [month for month in (add_months(current, i) for i in range(ahead + 1)) if month not in months]
+    retire = []
+    if retention_months > 0:
+        cutoff = add_months(current, -retention_months)
+        retire = [months[month] for month in sorted(months) if month < cutoff]
+    return PartitionPlan(create=create, retire=retire)
+
+
+def list_partitions(session: Session) -> list[str]:
+    """Names of the partitions currently attached to events."""
+    return session.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent AND parent.relnamespace = to_regnamespace(current_schema())"
+        ),
+        {"parent": _PARENT},
+    ).scalars().all()
+
+
+def create_partition(session: Session, month: date) -> int:
+    """Create and attach one month's partition; the caller commits.
+
+    Returns:
+        int: Rows moved in from events_default
+    """
+    name, lower, upper = partition_name(month), month.isoformat(), add_months(month, 1).isoformat()
+    session.execute(text(f"CREATE TABLE {name} (LIKE {_PARENT} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    moved = session.execute(
+        text(
+            f"WITH moved AS (DELETE FROM {_DEFAULT} WHERE created_at >= :lower AND created_at < :upper RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        ),
+        {"lower": month, "upper": add_months(month, 1)},
+    ).rowcount
+    session.execute(text(f"ALTER TABLE {_PARENT} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"))
+    return moved
+
+
+def retire_partition(session: Session, name: str, action: str = EVENT_PARTITION_RETIREMENT) -> None:
+    """Detach a partition, and drop it unless action is detach; the caller commits."""
+    session.execute(text(f"ALTER TABLE {_PARENT} DETACH PARTITION {name}"))
+    if action == "drop":
+        session.execute(text(f"DROP TABLE {name}"))
+
+
+def run_partition_maintenance(
+    bind=None,
+    ahead: int = EVENT_PARTITIONS_AHEAD,
+    retention_months: int = EVENT_RETENTION_MONTHS,
+    action: str = EVENT_PARTITION_RETIREMENT,
+    today: Optional[date] = None,
+) -> dict[str, int]:
+    """Create upcoming partitions and retire expired ones.
+
+    Returns:
+        dict: Partitions created and retired, rows moved out of events_default
+    """
+    bind = bind if bind is not None else engine
+    today = today or date.today()
+
+    with Session(bind) as session:
+        plan = plan_partitions(list_partitions(session), today, ahead, retention_months)
+
+    moved = 0
+    for month in plan.create:
+        with Session(bind) as session:
+            moved += create_partition(session, month)
+            session.commit()
+        logger.info(f"Partition maintenance: created {partition_name(month)}")
+    for name in plan.retire:
+        with Session(bind) as session:
+            retire_partition(session, name, action)
+            session.commit()
+        logger.info(f"Partition maintenance: {'dropped' if action == 'drop' else 'detached'} {name}")
+
+    with Session(bind) as session:
+        stray = session.execute(text(f"SELECT count(*) FROM {_DEFAULT}")).scalar()
+    if stray:
+        logger.warning(f"Partition maintenance: {stray} events outside every monthly partition in {_DEFAULT}")
+    return {"created": len(plan.create), "retired": len(plan.retire), "moved": moved}
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Create upcoming and retire expired events partitions")
+    parser.add_argument("--ahead", type=int, default=EVENT_PARTITIONS_AHEAD)
+    parser.add_argument("--retention-months", type=int, default=EVENT_RETENTION_MONTHS)
+    parser.add_argument("--retirement", choices=["detach", "drop"], default=EVENT_PARTITION_RETIREMENT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    run_partition_maintenance(ahead=args.ahead, retention_months=args.retention_months, action=args.retirement)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Projection runner: brings read models derived from the event store up to date.
+
+Each projection resumes from its checkpoint in event_checkpoints and applies
+new events in committed batches (app.events.store.run_projection), so runs
+are incremental and overlapping runs stop instead of applying events twice.
+
+Projections:
+- task_snapshots: task state every TASK_SNAPSHOT_INTERVAL events, which bounds
+  the replay behind GET /api/tasks/{id}/history
+
+Usage (e.g. from a CronJob every minute):
+    python -m app.workers.projections [--projection NAME] [--rebuild]
+"""
+
+import logging
+import argparse
+from typing import Callable, Optional
+
+from app.database import engine
+from app.events.store import EVENT_REPLAY_BATCH_SIZE, Projection, run_projection
+from app.events.task_history import TaskSnapshotProjection
+
+logger = logging.getLogger(__name__)
+
+# Name -> factory
+PROJECTIONS: dict[str, Callable[[], Projection]] = {
+    TaskSnapshotProjection.name: TaskSnapshotProjection,
+}
+
+
+def run_projections(
+    names: Optional[list[str]] = None,
+    bind=None,
+    rebuild: bool = False,
+    batch_size: int = EVENT_REPLAY_BATCH_SIZE,
+) -> dict[str, int]:
+    """Run projections once.
+
+    Args:
+        names: Projections to run (default: all)
+        bind: Engine (default: app engine)
+        rebuild: Reset the read models and replay from the start
+        batch_size: Events per transaction
+
+    Returns:
+        dict: Events applied per projection
+    """
+    bind = bind if bind is not None else engine
+    return {
+        name: run_projection(PROJECTIONS[name](), bind=bind, rebuild=rebuild, batch_size=batch_size)
+        for name in names or PROJECTIONS
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Update read models from the event store")
+    parser.add_argument("--projection", action="append", choices=sorted(PROJECTIONS), dest="names")
+    parser.add_argument("--rebuild", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=EVENT_REPLAY_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    run_projections(args.names, rebuild=args.rebuild, batch_size=args.batch_size)
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Recurring task generator: keeps each pattern's tasks generated ahead.
+
+A pattern's last_generated_at records how far its instances exist: every
+occurrence up to and including it has a task. A run (e.g. from a CronJob)
+generates up to now + RECURRENCE_HORIZON_DAYS for the patterns that are
+behind, a batch of patterns per transaction:
+
+1. select the next batch of behind patterns (new ones first, then by
+   last_generated_at, id; keyset paging, FOR UPDATE SKIP LOCKED)
+2. expand them with app.recurrence over (last_generated_at, horizon]
+3. insert the task instances in chunks with ON CONFLICT DO NOTHING on
+   recurrence_instance_id (migration 007), which is derived from (pattern,
+   occurrence number), so a rerun never duplicates a task
+4. advance last_generated_at to just before each pattern's next occurrence
+   (or far in the future once the series has ended), then commit
+
+Step 4 means a pattern is only selected again when its next occurrence
+enters the horizon, so a run costs O(new instances) rather than O(all
+patterns): a yearly pattern is touched once a year, not every night. A run
+that dies mid-way resumes where it stopped, since committed batches are no
+longer behind.
+
+The job does not invalidate the task list cache: with the default memory
+backend it could only reach its own process. Cached lists are keyed on the
+list ETag (app.http_cache), which the new rows change, so the next read
+shows them.
+
+Patterns are owned by legacy_uuid(users.id) while users have integer ids
+(see the note on Reminder). Patterns whose owner is not an existing user
+are skipped with a warning and left behind, so they are generated once the
+owner resolves.
+
+Runs can be sharded: --shards N --shard K only handles patterns whose id
+falls in the K-th of N equal ranges of the UUID space (in the Helm chart, an
+Indexed Job with one pod per shard). Pattern ids are random, unlike legacy
+owner ids, so the shards are even.
+
+Usage:
+    python -m app.workers.recurrence [--shards N --shard K]
+"""
+
+import os
+import time
+import logging
+import argparse
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID, uuid5
+
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import bindparam, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session
+
+from app.database import engine
+from app.metrics import RECURRING_TASKS_GENERATED
+from app.models import PriorityEnum, RecurrencePattern, Task, User, legacy_id
+from app.recurrence import PatternBatch, expand_window, next_occurrences
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RECURRENCE_HORIZON_DAYS = float(os.getenv("RECURRENCE_HORIZON_DAYS", "14"))
+RECURRENCE_BATCH_SIZE = int(os.getenv("RECURRENCE_BATCH_SIZE", "1000"))
+RECURRENCE_INSERT_CHUNK = int(os.getenv("RECURRENCE_INSERT_CHUNK", "5000"))
+# Pause between batches so the job yields to foreground traffic
+RECURRENCE_BATCH_PAUSE = float(os.getenv("RECURRENCE_BATCH_PAUSE", "0.05"))
+RECURRENCE_SHARDS = int(os.getenv("RECURRENCE_SHARDS", "1"))
+# Set per pod by Kubernetes Indexed Jobs
+RECURRENCE_SHARD = int(os.getenv("JOB_COMPLETION_INDEX", "0"))
+
+# last_generated_at of a pattern whose series has ended
+SERIES_ENDED = datetime(9999, 12, 31)
+
+_patterns = RecurrencePattern.__table__
+_tasks = Task.__table__
+_users = User.__table__
+_UUID_SPACE = 1 << 128
+
+
+def shard_bounds(shard: int, shards: int) -> tuple[UUID, Optional[UUID]]:
+    """Pattern id range [lower, upper) of one shard (upper is None for the last)."""
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard must be in [0, {shards})")
+    lower = UUID(int=shard * _UUID_SPACE // shards)
+    upper = UUID(int=(shard + 1) * _UUID_SPACE // shards) if shard + 1 < shards else None
+    return lower, upper
+
+
+def resolve_owners(session: Session, patterns: list) -> dict[UUID, int]:
+    """Map the patterns' owners to existing integer users.id values."""
+    owners = {pattern.user_id: legacy_id(pattern.user_id) for pattern in patterns}
+    candidates = {user_id for user_id in owners.values() if user_id is not None}
+    if not candidates:
+        return {}
+    existing = set(session.execute(select(_users.c.id).where(_users.c.id.in_(candidates))).scalars())
+    return {owner: user_id for owner, user_id in owners.items() if user_id in existing}
+
+
+def _instance(pattern, user_id: int, at: datetime, ordinal: int, now: datetime) -> dict:
+    """Task row for one occurrence, from the pattern's task_template."""
+    template = pattern.task_template or {}
+    try:
+        priority = PriorityEnum(template.get("priority", "medium"))
+    except ValueError:
+        priority = PriorityEnum.medium
+    return {
+        "user_id": user_id,
+        "title": str(template.get("title") or "Recurring task")[:200],
+        "description": str(template.get("description") or "")[:2000],
+        "priority": priority,
+        "is_complete": False,
+        "due_date": at,
+        "is_recurring": True,
+        "recurrence_pattern_id": pattern.id,
+        "recurrence_instance_id": uuid5(pattern.id, str(ordinal)),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def generate_batch(session: Session, patterns: list, until: datetime, chunk_size: int = RECURRENCE_INSERT_CHUNK) -> int:
+    """Generate task instances for `patterns` up to `until` and advance them.
+
+    Must run in the transaction that locked the patterns; the caller commits.
+    Patterns whose owner does not resolve to a user are left untouched.
+
+    Args:
+        session: Database session (primary)
+        patterns: Pattern rows (RecurrencePattern columns)
+        until: Generate occurrences up to and including this time (naive UTC)
+        chunk_size: Rows per INSERT statement
+
+    Returns:
+        int: Task instances inserted (existing instances are skipped)
+    """
+    owners = resolve_owners(session, patterns)
+    skipped = len(patterns)
+    patterns = [pattern for pattern in patterns if pattern.user_id in owners]
+    skipped -= len(patterns)
+    if skipped:
+        logger.warning(f"Recurrence: skipped {skipped} patterns whose owner is not a user")
+    if not patterns:
+        return 0
+    now = datetime.utcnow()
+    batch = PatternBatch.from_rows(patterns)
+    # New patterns start at created_at; others just after last_generated_at
+    start = np.array(
+        [p.created_at if p.last_generated_at is None else p.last_generated_at + timedelta(seconds=1) for p in patterns],
+        dtype="datetime64[s]",
+    )
+    found = expand_window(batch, start, until + timedelta(seconds=1))
+
+    inserted = 0
+    rows = [
+        _instance(patterns[index], owners[patterns[index].user_id], at.astype(datetime), ordinal, now)
+        for index, at, ordinal in zip(found.pattern_index.tolist(), found.at, found.ordinal.tolist())
+    ]
+    for offset in range(0, len(rows), chunk_size):
+        statement = (
+            insert(_tasks)
+            .on_conflict_do_nothing(index_elements=[_tasks.c.recurrence_instance_id])
+            .returning(_tasks.c.id)
+        )
+        inserted += len(session.execute(statement, rows[offset:offset + chunk_size]).all())
+
+    # Everything before the next occurrence now exists
+    generated_through = np.full(len(batch), np.datetime64(SERIES_ENDED, "s"))
+    upcoming = next_occurrences(batch, until, 1)
+    generated_through[upcoming.pattern_index] = upcoming.at - np.timedelta64(1, "s")
+    session.execute(
+        update(_patterns).where(_patterns.c.id == bindparam("pattern_id")).values(last_generated_at=bindparam("through")),
+        [
+            {"pattern_id": pattern.id, "through": through.astype(datetime)}
+            for pattern, through in zip(patterns, generated_through)
+        ],
+    )
+    return inserted
+
+
+class RecurrenceGenerator:
+    """Generates instances for every behind pattern, one committed batch at a time.
+
+    Args:
+        bind: Engine to run on (default: the primary)
+        horizon_days: How far ahead instances are generated
+        batch_size: Patterns per transaction
+        shard: (index, count) pattern shard to handle (default: all patterns)
+        pause: Seconds to sleep between batches
+    """
+
+    def __init__(
+        self,
+        bind=None,
+        horizon_days: float = RECURRENCE_HORIZON_DAYS,
+        batch_size: int = RECURRENCE_BATCH_SIZE,
+        shard: Optional[tuple[int, int]] = None,
+        pause: float = RECURRENCE_BATCH_PAUSE,
+    ):
+        self.bind = bind if bind is not None else engine
+        self.horizon = timedelta(days=horizon_days)
+        self.batch_size = batch_size
+        self.bounds = shard_bounds(*shard) if shard else None
+        self.pause = pause
+
+    def _select(self, until: datetime, new: bool, cursor: Optional[tuple]):
+        """Next page of behind patterns after `cursor`, locked for this transaction."""
+        statement = select(_patterns)
+        if new:
+            statement = statement.where(_patterns.c.last_generated_at.is_(None))
+            if cursor is not None:
+                statement = statement.where(_patterns.c.id > cursor[1])
+            statement = statement.order_by(_patterns.c.id)
+        else:
+            statement = statement.where(_patterns.c.last_generated_at < until)
+            if cursor is not None:
+                statement = statement.where(tuple_(_patterns.c.last_generated_at, _patterns.c.id) > cursor)
+            statement = statement.order_by(_patterns.c.last_generated_at, _patterns.c.id)
+
+        if self.bounds is not None:
+            lower, upper = self.bounds
+            statement = statement.where(_patterns.c.id >= lower)
+            if upper is not None:
+                statement = statement.where(_patterns.c.id < upper)
+        return statement.limit(self.batch_size).with_for_update(skip_locked=True)
+
+    def run(self, now: Optional[datetime] = None) -> dict[str, int]:
+        """Generate up to now + horizon for every behind pattern.
+
+        Returns:
+            dict: Patterns processed and task instances inserted
+        """
+        until = ((now or datetime.utcnow()) + self.horizon).replace(microsecond=0)
+        totals = {"patterns": 0, "instances": 0}
+        for new in (True, False):
+            cursor = None
+            while True:
+                with Session(self.bind) as session:
+                    patterns = session.execute(self._select(until, new, cursor)).all()
+                    inserted = generate_batch(session, patterns, until)
+                    session.commit()
+                if not patterns:
+                    break
+
+                cursor = (patterns[-1].last_generated_at, patterns[-1].id)
+                totals["patterns"] += len(patterns)
+                totals["instances"] += inserted
+                RECURRING_TASKS_GENERATED.inc(inserted)
+
+                if len(patterns) < self.batch_size:
+                    break
+                time.sleep(self.pause)
+
+        logger.info(
+            f"Recurrence: generated {totals['instances']} tasks for {totals['patterns']} patterns "
+            f"through {until:%Y-%m-%d %H:%M}"
+        )
+        return totals
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Generate recurring task instances")
+    parser.add_argument("--horizon-days", type=float, default=RECURRENCE_HORIZON_DAYS)
+    parser.add_argument("--batch-size", type=int, default=RECURRENCE_BATCH_SIZE)
+    parser.add_argument("--shards", type=int, default=RECURRENCE_SHARDS)
+    parser.add_argument("--shard", type=int, default=RECURRENCE_SHARD)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    RecurrenceGenerator(
+        horizon_days=args.horizon_days,
+        batch_size=args.batch_size,
+        shard=(args.shard, args.shards) if args.shards > 1 else None,
+    ).run()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+"""Reminder worker: fires due reminders in batches.
+
+Each tick claims up to one batch of due reminders and fires them in a single
+transaction:
+
+    WITH due AS (
+        SELECT id FROM reminders
+        WHERE status = 'pending' AND scheduled_time <= :now
+        ORDER BY scheduled_time
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE reminders SET status = 'fired', fired_at = :now
+    FROM due WHERE reminders.id = due.id
+    RETURNING ...
+
+followed by the pending notifications for the notification dispatcher, one
+per user and channel (app.notifications.digest merges reminders that fire
+together into a digest). Any number of worker replicas can run this
+loop: rows locked by another replica's claim are skipped rather than waited
+on, and only the transaction that flips a row from pending to fired queues
+its notifications, so nothing fires twice. A worker that dies mid-claim rolls
+back and the rows become claimable again.
+
+The batch size adapts to load: it doubles while claims come back full (a
+backlog, e.g. the 9am peak) and the claim stays under
+REMINDER_CLAIM_TARGET_SECONDS, halves when a claim is slower than that, and
+decays back to the minimum when idle. While a backlog remains the worker
+claims again immediately; otherwise it sleeps REMINDER_POLL_INTERVAL.
+
+Usage:
+    python -m app.workers.reminders
+"""
+
+import os
+import time
+import signal
+import asyncio
+import logging
+import argparse
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Collection, Optional
+from uuid import UUID
+
+from dotenv import load_dotenv
+from sqlalchemy import select, update
+from sqlmodel import Session
+
+from app.database import engine
+from app.metrics import (
+    REMINDER_BATCH_SIZE,
+    REMINDER_CLAIM_DURATION,
+    REMINDER_FIRE_LAG,
+    REMINDERS_FIRED,
+    start_metrics_server,
+)
+from app.models import NotificationChannelEnum, Reminder, ReminderStatusEnum
+from app.notifications.digest import coalesce
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REMINDER_BATCH_MIN = int(os.getenv("REMINDER_BATCH_MIN", "100"))
+REMINDER_BATCH_MAX = int(os.getenv("REMINDER_BATCH_MAX", "5000"))
+REMINDER_CLAIM_TARGET_SECONDS = float(os.getenv("REMINDER_CLAIM_TARGET_SECONDS", "0.5"))
+REMINDER_POLL_INTERVAL = float(os.getenv("REMINDER_POLL_INTERVAL", "1.0"))
+REMINDER_METRICS_PORT = int(os.getenv("REMINDER_METRICS_PORT", "9102"))
+
+_reminders = Reminder.__table__
+_CHANNELS = {channel.value for channel in NotificationChannelEnum}
+
+
+@dataclass(frozen=True)
+class FiredReminder:
+    """A reminder fired by a claim."""
+
+    id: UUID
+    task_id: UUID
+    user_id: UUID
+    scheduled_time: datetime
+    channels: tuple[str, ...]
+
+
+def _channels(notification_channels: Optional[dict]) -> tuple[str, ...]:
+    """Valid channels from a reminder's notification_channels (default email)."""
+    requested = (notification_channels or {}).get("channels") or ["email"]
+    channels = tuple(dict.fromkeys(c for c in requested if c in _CHANNELS))
+    return channels or ("email",)
+
+
+def claim_due_reminders(
+    session: Session,
+    limit: int,
+    now: Optional[datetime] = None,
+    task_ids: Optional[Collection[UUID]] = None,
+) -> list[FiredReminder]:
+    """Fire up to `limit` due reminders, oldest first, and queue their notifications.
+
+    Must run in its own transaction; the caller commits. Rows locked by
+    concurrent claims are skipped.
+
+    Args:
+        session: Database session (primary)
+        limit: Maximum reminders to fire
+        now: Firing time (default: utcnow)
+        task_ids: Only fire reminders of these tasks (default: any)
+
+    Returns:
+        list: The reminders this call fired
+    """
+    now = now or datetime.utcnow()
+
+    due = select(_reminders.c.id).where(
+        _reminders.c.status == ReminderStatusEnum.pending,
+        _reminders.c.scheduled_time <= now,
+    )
+    if task_ids is not None:
+        due = due.where(_reminders.c.task_id.in_(task_ids))
+    due = (
+        due.order_by(_reminders.c.scheduled_time)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    statement = (
+        update(_reminders)
+        .where(_reminders.c.id == due.c.id)
+        .values(status=ReminderStatusEnum.fired, fired_at=now)
+        .returning(
+            _reminders.c.id,
+            _reminders.c.task_id,
+            _reminders.c.user_id,
+            _reminders.c.scheduled_time,
+            _reminders.c.notification_channels,
+        )
+    )
+    fired = [
+        FiredReminder(
+            id=row.id,
+            task_id=row.task_id,
+            user_id=row.user_id,
+            scheduled_time=row.scheduled_time,
+            channels=_channels(row.notification_channels),
+        )
+        for row in session.execute(statement)
+    ]
+
+    coalesce(session, fired, now)
+    return fired
+
+
+def record_fired(fired: list[FiredReminder], elapsed: float, source: str) -> None:
+    """Record metrics and a log line for one claim."""
+    REMINDER_CLAIM_DURATION.observe(elapsed)
+    if not fired:
+        return
+    REMINDERS_FIRED.inc(len(fired))
+    now = datetime.utcnow()
+    for reminder in fired:
+        REMINDER_FIRE_LAG.observe((now - reminder.scheduled_time).total_seconds())
+    logger.info(f"Fired {len(fired)} reminders ({source}) in {elapsed * 1000:.0f} ms")
+
+
+class BatchSizer:
+    """Claim batch size that follows the backlog and the claim latency.
+
+    Args:
+        minimum: Smallest batch
+        maximum: Largest batch
+        target_seconds: Claim latency above which the batch shrinks
+    """
+
+    def __init__(
+        self,
+        minimum: int = REMINDER_BATCH_MIN,
+        maximum: int = REMINDER_BATCH_MAX,
+        target_seconds: float = REMINDER_CLAIM_TARGET_SECONDS,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_seconds = target_seconds
+        self.size = minimum
+
+    def update(self, claimed: int, elapsed: float) -> int:
+        """Adjust the batch size after a claim.
+
+        Args:
+            claimed: Reminders the claim fired
+            elapsed: Claim transaction duration in seconds
+
+        Returns:
+            int: The next batch size
+        """
+        if elapsed > self.target_seconds:
+            self.size = max(self.minimum, self.size // 2)
+        elif claimed >= self.size:
+            self.size = min(self.maximum, self.size * 2)
+        elif claimed < self.size // 4:
+            self.size = max(self.minimum, self.size - self.size // 4)
+        return self.size
+
+
+class ReminderWorker:
+    """Claims and fires due reminders until stopped.
+
+    Args:
+        bind: Engine to claim on (default: the primary)
+        sizer: Batch size policy
+        poll_interval: Seconds to sleep once caught up
+    """
+
+    def __init__(self, bind=None, sizer: Optional[BatchSizer] = None, poll_interval: float = REMINDER_POLL_INTERVAL):
+        self.bind = bind if bind is not None else engine
+        self.sizer = sizer or BatchSizer()
+        self.poll_interval = poll_interval
+
+    def tick(self) -> tuple[list[FiredReminder], bool]:
+        """Run one claim transaction.
+
+        Returns:
+            tuple: (reminders fired, whether the batch was full)
+        """
+        limit = self.sizer.size
+        started = time.perf_counter()
+        with Session(self.bind) as session:
+            fired = claim_due_reminders(session, limit)
+            session.commit()
+        elapsed = time.perf_counter() - started
+
+        REMINDER_BATCH_SIZE.set(self.sizer.update(len(fired), elapsed))
+        record_fired(fired, elapsed, source="sweep")
+        return fired, len(fired) >= limit
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Claim until `stop` is set; claims run in a worker thread."""
+        logger.info(f"Reminder worker started (batch {self.sizer.minimum}-{self.sizer.maximum})")
+        while not stop.is_set():
+            try:
+                _, backlog = await asyncio.to_thread(self.tick)
+            except Exception as e:
+                logger.error(f"Reminder claim failed: {e}", exc_info=True)
+                backlog = False
+
+            if not backlog:
+                try:
+                    await asyncio.wait_for(stop.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info("Reminder worker stopped")
+
+
+async def _serve() -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    await ReminderWorker().run(stop)
+    engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Reminder worker")
+    parser.add_argument("--metrics-port", type=int, default=REMINDER_METRICS_PORT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    start_metrics_server(args.metrics_port)
+    asyncio.run(_serve())
+
+
+if __name__ == "__main__":
+    main()
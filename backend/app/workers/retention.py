@@ -0,0 +1,194 @@
+"""Retention job: moves finished reminders and old notifications to archive tables.
+
+Fired and cancelled reminders make up almost all of the reminders table over
+time, and delivered notifications pile up the same way. This job moves them
+to reminders_archive / notifications_archive (migration 006) in batches, so
+the hot tables only hold pending work plus a short recent history:
+
+- reminders fired or cancelled more than REMINDER_RETENTION_DAYS ago are
+  archived together with their notifications, unless a notification is still
+  pending delivery
+- sent or failed notifications older than NOTIFICATION_RETENTION_DAYS are
+  archived on their own
+
+Each batch is one transaction: select ids (FOR UPDATE SKIP LOCKED, so it can
+run next to the reminder workers), INSERT ... SELECT into the archive, then
+DELETE. Rows are copied inside the database; only the ids travel.
+
+Usage (e.g. from a nightly CronJob):
+    python -m app.workers.retention
+"""
+
+import os
+import time
+import logging
+import argparse
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, exists, func, insert, literal, select
+from sqlmodel import Session
+
+from app.database import engine
+from app.metrics import ROWS_ARCHIVED
+from app.models import (
+    Notification,
+    NotificationReminder,
+    NotificationStatusEnum,
+    Reminder,
+    ReminderStatusEnum,
+    notifications_archive,
+    reminders_archive,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REMINDER_RETENTION_DAYS = float(os.getenv("REMINDER_RETENTION_DAYS", "7"))
+NOTIFICATION_RETENTION_DAYS = float(os.getenv("NOTIFICATION_RETENTION_DAYS", "30"))
+RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "5000"))
+# Pause between batches so the job yields to foreground traffic
+RETENTION_BATCH_PAUSE = float(os.getenv("RETENTION_BATCH_PAUSE", "0.1"))
+
+_reminders = Reminder.__table__
+_notifications = Notification.__table__
+_links = NotificationReminder.__table__
+
+
+def _move(session: Session, source, archive, where, now: datetime) -> int:
+    """Copy rows matching `where` into the archive, then delete them."""
+    columns = [column.name for column in source.columns]
+    session.execute(
+        insert(archive).from_select(
+            columns + ["archived_at"],
+            select(*(source.c[name] for name in columns), literal(now, archive.c.archived_at.type)).where(where),
+        )
+    )
+    return session.execute(delete(source).where(where)).rowcount
+
+
+def archive_reminders(session: Session, cutoff: datetime, limit: int, now: Optional[datetime] = None) -> int:
+    """Archive one batch of finished reminders (and their notifications).
+
+    Args:
+        session: Database session (primary); the caller commits
+        cutoff: Archive reminders fired/cancelled before this time
+        limit: Batch size
+        now: archived_at value (default: utcnow)
+
+    Returns:
+        int: Reminders archived
+    """
+    now = now or datetime.utcnow()
+    pending_delivery = exists().where(
+        _notifications.c.reminder_id == _reminders.c.id,
+        _notifications.c.status == NotificationStatusEnum.pending,
+    )
+    # A reminder may also be delivered by another reminder's digest
+    pending_digest = exists().where(
+        _links.c.reminder_id == _reminders.c.id,
+        _links.c.notification_id == _notifications.c.id,
+        _notifications.c.status == NotificationStatusEnum.pending,
+    )
+    ids = session.execute(
+        select(_reminders.c.id)
+        .where(
+            _reminders.c.status.in_([ReminderStatusEnum.fired, ReminderStatusEnum.cancelled]),
+            func.coalesce(_reminders.c.fired_at, _reminders.c.created_at) < cutoff,
+            ~pending_delivery,
+            ~pending_digest,
+        )
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not ids:
+        return 0
+
+    # Notifications first: their foreign key cascades on reminder deletion
+    moved_notifications = _move(session, _notifications, notifications_archive, _notifications.c.reminder_id.in_(ids), now)
+    moved = _move(session, _reminders, reminders_archive, _reminders.c.id.in_(ids), now)
+    ROWS_ARCHIVED.labels(table="notifications").inc(moved_notifications)
+    ROWS_ARCHIVED.labels(table="reminders").inc(moved)
+    return moved
+
+
+def archive_notifications(session: Session, cutoff: datetime, limit: int, now: Optional[datetime] = None) -> int:
+    """Archive one batch of delivered or failed notifications created before `cutoff`.
+
+    Returns:
+        int: Notifications archived
+    """
+    now = now or datetime.utcnow()
+    ids = session.execute(
+        select(_notifications.c.id)
+        .where(
+            _notifications.c.status.in_([NotificationStatusEnum.sent, NotificationStatusEnum.failed]),
+            _notifications.c.created_at < cutoff,
+        )
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).scalars().all()
+    if not ids:
+        return 0
+
+    moved = _move(session, _notifications, notifications_archive, _notifications.c.id.in_(ids), now)
+    ROWS_ARCHIVED.labels(table="notifications").inc(moved)
+    return moved
+
+
+def run_retention(
+    bind=None,
+    reminder_days: float = REMINDER_RETENTION_DAYS,
+    notification_days: float = NOTIFICATION_RETENTION_DAYS,
+    batch_size: int = RETENTION_BATCH_SIZE,
+    pause: float = RETENTION_BATCH_PAUSE,
+    now: Optional[datetime] = None,
+) -> dict[str, int]:
+    """Archive everything past retention, one committed batch at a time.
+
+    Returns:
+        dict: Rows archived per step
+    """
+    bind = bind if bind is not None else engine
+    now = now or datetime.utcnow()
+    steps = (
+        ("reminders", archive_reminders, now - timedelta(days=reminder_days)),
+        ("notifications", archive_notifications, now - timedelta(days=notification_days)),
+    )
+
+    totals = {}
+    for name, archive_batch, cutoff in steps:
+        totals[name] = 0
+        while True:
+            with Session(bind) as session:
+                moved = archive_batch(session, cutoff, batch_size, now)
+                session.commit()
+            totals[name] += moved
+            if moved < batch_size:
+                break
+            time.sleep(pause)
+        logger.info(f"Retention: archived {totals[name]} {name} older than {cutoff:%Y-%m-%d %H:%M}")
+    return totals
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Archive finished reminders and old notifications")
+    parser.add_argument("--reminder-days", type=float, default=REMINDER_RETENTION_DAYS)
+    parser.add_argument("--notification-days", type=float, default=NOTIFICATION_RETENTION_DAYS)
+    parser.add_argument("--batch-size", type=int, default=RETENTION_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    run_retention(
+        reminder_days=args.reminder_days,
+        notification_days=args.notification_days,
+        batch_size=args.batch_size,
+    )
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
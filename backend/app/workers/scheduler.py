@@ -0,0 +1,361 @@
+"""Hybrid reminder scheduler: in-memory heap for near-term reminders, DB sweep as backstop.
+
+Polling the reminders table every second wastes database capacity and
+polling every minute makes reminders late. The scheduler instead keeps the
+reminders due within REMINDER_PRELOAD_MINUTES in a heap and sleeps until the
+earliest one, so reminders fire within milliseconds of their scheduled time:
+
+- preload: every REMINDER_PRELOAD_INTERVAL seconds one indexed range query
+  loads the pending reminders due before now + REMINDER_PRELOAD_MINUTES (the
+  horizon is longer than the interval, so consecutive windows overlap)
+- events: reminder.scheduled and reminder.cancelled (published by
+  app/routers/tasks.py, delivered by Dapr pub/sub to /events/reminders) add,
+  move or drop entries between preloads
+- firing: due entries are fired through claim_due_reminders restricted to
+  their task ids, so the database stays the source of truth: a reminder
+  cancelled or already fired by another replica is simply not claimed
+- backstop: a ReminderWorker sweep every REMINDER_SWEEP_INTERVAL seconds
+  fires anything the heap missed (lost events, restarts)
+
+When the database fails, a preload is retried after a backoff (1s,
+doubling, capped at the preload interval), and reminders whose claim failed
+go back into the heap to be claimed again after the same backoff.
+
+Database load is one preload query per interval plus one claim per firing
+instant, independent of how often reminders are due. Cancellation is lazy:
+cancelled or moved entries stay in the heap and are skipped when popped.
+
+Reminders are keyed by the reminders table's task id, which is how the
+events identify them. The tasks API emits integer task ids; those map to
+legacy_uuid(task_id), the id reminder rows of integer tasks carry (see the
+note on Reminder). Events with any other task id are left to the preload
+and sweep.
+
+Usage:
+    python -m app.workers.scheduler --port 8002
+"""
+
+import os
+import time
+import heapq
+import signal
+import asyncio
+import logging
+import argparse
+from datetime import datetime, timedelta, timezone
+from itertools import count
+from typing import Any, Optional
+from uuid import UUID
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlmodel import Session
+
+from app.database import engine
+from app.metrics import start_metrics_server
+from app.models import Reminder, ReminderStatusEnum, legacy_uuid
+from app.workers.reminders import (
+    REMINDER_BATCH_MAX,
+    REMINDER_METRICS_PORT,
+    ReminderWorker,
+    claim_due_reminders,
+    record_fired,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+REMINDER_PRELOAD_MINUTES = float(os.getenv("REMINDER_PRELOAD_MINUTES", "5"))
+REMINDER_PRELOAD_INTERVAL = float(os.getenv("REMINDER_PRELOAD_INTERVAL", "60"))
+REMINDER_SWEEP_INTERVAL = float(os.getenv("REMINDER_SWEEP_INTERVAL", "30"))
+DAPR_PUBSUB_NAME = os.getenv("DAPR_PUBSUB_NAME", "todo-pubsub")
+REMINDER_EVENTS_TOPIC = os.getenv("REMINDER_EVENTS_TOPIC", "reminder-events")
+
+_reminders = Reminder.__table__
+
+
+class ReminderHeap:
+    """Min-heap of (fire time, task id) with lazy cancellation."""
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int, UUID]] = []
+        self._scheduled: dict[UUID, datetime] = {}
+        self._sequence = count()
+
+    def __len__(self) -> int:
+        return len(self._scheduled)
+
+    def schedule(self, task_id: UUID, fire_at: datetime) -> None:
+        """Add or move a task's reminder."""
+        if self._scheduled.get(task_id) == fire_at:
+            return
+        self._scheduled[task_id] = fire_at
+        heapq.heappush(self._heap, (fire_at, next(self._sequence), task_id))
+        # Moved and cancelled entries linger until popped; rebuild if they dominate
+        if len(self._heap) > 2 * len(self._scheduled) + 1024:
+            self._rebuild()
+
+    def cancel(self, task_id: UUID) -> None:
+        """Drop a task's reminder (its heap entry is skipped when popped)."""
+        self._scheduled.pop(task_id, None)
+
+    def next_due(self) -> Optional[datetime]:
+        """Fire time of the earliest live entry, or None when empty."""
+        while self._heap:
+            fire_at, _, task_id = self._heap[0]
+            if self._scheduled.get(task_id) == fire_at:
+                return fire_at
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: datetime) -> list[UUID]:
+        """Remove and return the task ids due at `now`."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, _, task_id = heapq.heappop(self._heap)
+            if self._scheduled.get(task_id) == fire_at:
+                del self._scheduled[task_id]
+                due.append(task_id)
+        return due
+
+    def _rebuild(self) -> None:
+        self._heap = [(fire_at, next(self._sequence), task_id) for task_id, fire_at in self._scheduled.items()]
+        heapq.heapify(self._heap)
+
+
+def _as_utc_naive(value: Any) -> datetime:
+    """Parse an event timestamp into the naive UTC the reminders table stores."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _task_key(value: Any) -> Optional[UUID]:
+    """Reminders table task id for an event's task id (integer or UUID)."""
+    if isinstance(value, UUID):
+        return value
+    if isinstance(value, int) and not isinstance(value, bool) or isinstance(value, str) and value.isdigit():
+        return legacy_uuid(int(value))
+    try:
+        return UUID(str(value))
+    except ValueError:
+        return None
+
+
+class ReminderScheduler:
+    """Fires near-term reminders from an in-memory heap.
+
+    Args:
+        bind: Engine to preload and claim on (default: the primary)
+        horizon: How far ahead the preload looks
+        preload_interval: Seconds between preloads
+    """
+
+    def __init__(
+        self,
+        bind=None,
+        horizon: timedelta = timedelta(minutes=REMINDER_PRELOAD_MINUTES),
+        preload_interval: float = REMINDER_PRELOAD_INTERVAL,
+    ):
+        self.bind = bind if bind is not None else engine
+        self.horizon = horizon
+        self.preload_interval = preload_interval
+        self.heap = ReminderHeap()
+        self._preloaded_until = datetime.min
+        self._wakeup = asyncio.Event()
+        self._failures = 0
+
+    def _backoff(self) -> float:
+        """Seconds to wait after another consecutive failure."""
+        self._failures += 1
+        return min(2.0 ** (self._failures - 1), self.preload_interval)
+
+    def load_window(self, now: Optional[datetime] = None) -> tuple[list, datetime]:
+        """Query the pending reminders due within the horizon (thread-safe).
+
+        Returns:
+            tuple: ((task id, scheduled time) rows, end of the window)
+        """
+        until = (now or datetime.utcnow()) + self.horizon
+        statement = (
+            select(_reminders.c.task_id, _reminders.c.scheduled_time)
+            .where(
+                _reminders.c.status == ReminderStatusEnum.pending,
+                _reminders.c.scheduled_time <= until,
+            )
+            .order_by(_reminders.c.scheduled_time)
+        )
+        with Session(self.bind) as session:
+            return session.execute(statement).all(), until
+
+    def apply_window(self, rows: list, until: datetime) -> None:
+        """Merge a loaded window into the heap."""
+        for task_id, scheduled_time in rows:
+            self.heap.schedule(task_id, scheduled_time)
+        self._preloaded_until = until
+
+    def preload(self, now: Optional[datetime] = None) -> int:
+        """Load pending reminders due within the horizon into the heap.
+
+        Returns:
+            int: Reminders loaded
+        """
+        rows, until = self.load_window(now)
+        self.apply_window(rows, until)
+        return len(rows)
+
+    def handle_event(self, event_type: str, data: dict) -> None:
+        """Apply a reminder.scheduled / reminder.cancelled event to the heap."""
+        task_id = _task_key(data.get("task_id"))
+        if task_id is None:
+            return
+
+        if event_type.endswith("reminder.cancelled"):
+            self.heap.cancel(task_id)
+        elif event_type.endswith("reminder.scheduled"):
+            fire_at = _as_utc_naive(data["scheduled_time"])
+            if fire_at <= self._preloaded_until:
+                self.heap.schedule(task_id, fire_at)
+                self._wakeup.set()
+            else:
+                # Beyond the window: a later preload picks it up
+                self.heap.cancel(task_id)
+
+    def claim(self, task_ids: list[UUID], now: datetime) -> int:
+        """Fire the due reminders of these tasks (thread-safe).
+
+        Returns:
+            int: Reminders fired
+        """
+        fired = 0
+        for start in range(0, len(task_ids), REMINDER_BATCH_MAX):
+            chunk = task_ids[start:start + REMINDER_BATCH_MAX]
+            started = time.perf_counter()
+            with Session(self.bind) as session:
+                claimed = claim_due_reminders(session, len(chunk), now=now, task_ids=chunk)
+                session.commit()
+            record_fired(claimed, time.perf_counter() - started, source="scheduler")
+            fired += len(claimed)
+        return fired
+
+    def fire_due(self, now: Optional[datetime] = None) -> int:
+        """Claim the reminders whose heap entries are due.
+
+        Returns:
+            int: Reminders fired
+        """
+        now = now or datetime.utcnow()
+        return self.claim(self.heap.pop_due(now), now)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Preload and fire until `stop` is set."""
+        logger.info(f"Reminder scheduler started (horizon {self.horizon}, preload every {self.preload_interval:g}s)")
+        next_preload = 0.0
+        while not stop.is_set():
+            # Queries run in threads; the heap is only touched on the loop
+            if time.monotonic() >= next_preload:
+                try:
+                    rows, until = await asyncio.to_thread(self.load_window)
+                    self.apply_window(rows, until)
+                    logger.info(f"Preloaded {len(rows)} reminders ({len(self.heap)} scheduled)")
+                    next_preload = time.monotonic() + self.preload_interval
+                    self._failures = 0
+                except Exception as e:
+                    delay = self._backoff()
+                    logger.error(f"Reminder preload failed, retrying in {delay:g}s: {e}", exc_info=True)
+                    next_preload = time.monotonic() + delay
+
+            now = datetime.utcnow()
+            due = self.heap.pop_due(now)
+            if due:
+                try:
+                    await asyncio.to_thread(self.claim, due, now)
+                    self._failures = 0
+                except Exception as e:
+                    # Retry them from the heap; already claimed ones are simply not claimed again
+                    delay = self._backoff()
+                    logger.error(f"Firing {len(due)} reminders failed, retrying in {delay:g}s: {e}", exc_info=True)
+                    for task_id in due:
+                        self.heap.schedule(task_id, now + timedelta(seconds=delay))
+
+            # Sleep until the earliest reminder, the next preload, a new event or stop
+            timeout = next_preload - time.monotonic()
+            next_due = self.heap.next_due()
+            if next_due is not None:
+                timeout = min(timeout, (next_due - datetime.utcnow()).total_seconds())
+            self._wakeup.clear()
+            if timeout > 0:
+                waiters = [asyncio.ensure_future(stop.wait()), asyncio.ensure_future(self._wakeup.wait())]
+                await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for waiter in waiters:
+                    waiter.cancel()
+        logger.info("Reminder scheduler stopped")
+
+
+def create_app(scheduler: ReminderScheduler):
+    """Dapr subscription endpoints for reminder events."""
+    from fastapi import FastAPI, Request
+
+    app = FastAPI(title="Reminder scheduler", docs_url=None, redoc_url=None)
+
+    @app.get("/dapr/subscribe")
+    def subscribe():
+        return [{"pubsubname": DAPR_PUBSUB_NAME, "topic": REMINDER_EVENTS_TOPIC, "route": "/events/reminders"}]
+
+    @app.post("/events/reminders")
+    async def reminder_event(request: Request):
+        event = await request.json()
+        try:
+            scheduler.handle_event(event.get("type", ""), event.get("data") or {})
+        except (KeyError, TypeError, ValueError) as e:
+            # Malformed events are dropped, not retried; the preload covers them
+            logger.warning(f"Dropped reminder event {event.get('id')}: {e}")
+            return {"status": "DROP"}
+        return {"status": "SUCCESS"}
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok", "scheduled": len(scheduler.heap)}
+
+    return app
+
+
+async def _serve(host: str, port: int) -> None:
+    import uvicorn
+
+    stop = asyncio.Event()
+    scheduler = ReminderScheduler()
+    sweeper = ReminderWorker(poll_interval=REMINDER_SWEEP_INTERVAL)
+    server = uvicorn.Server(uvicorn.Config(create_app(scheduler), host=host, port=port, log_level="warning"))
+    # Let our handlers stop the scheduler; the server exits when it is done
+    server.install_signal_handlers = lambda: None
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    serving = asyncio.create_task(server.serve())
+    await asyncio.gather(scheduler.run(stop), sweeper.run(stop))
+    server.should_exit = True
+    await serving
+    engine.dispose()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description="Hybrid reminder scheduler")
+    parser.add_argument("--host", default=os.getenv("REMINDER_SCHEDULER_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("REMINDER_SCHEDULER_PORT", "8002")))
+    parser.add_argument("--metrics-port", type=int, default=REMINDER_METRICS_PORT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    start_metrics_server(args.metrics_port)
+    asyncio.run(_serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
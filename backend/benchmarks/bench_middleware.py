@@ -0,0 +1,139 @@
+"""Benchmark: BaseHTTPMiddleware vs the pure ASGI HTTPLayerMiddleware.
+
+Builds two otherwise identical apps (CORS, /health, the tasks router) and
+drives them in-process through httpx's ASGI transport, so the numbers show
+middleware overhead rather than network or server costs:
+
+- base-http: security headers via ``@app.middleware("http")``
+- asgi: HTTPLayerMiddleware (security headers + metrics + query timing)
+
+The database is in-memory SQLite, as in tests/conftest.py.
+
+Usage (from backend/):
+    python -m benchmarks.bench_middleware --requests 2000 --tasks 50
+"""
+
+import os
+import time
+import asyncio
+import argparse
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+
+import httpx
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from app.database import get_read_session, get_session
+from app.dependencies import get_current_user, get_current_user_for_read
+from app.middleware import HTTPLayerMiddleware
+from app.models import Task, User
+from app.query_stats import instrument_engine
+from app.routers import tasks
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kwargs):
+    # Task.reminder_config is JSONB; plain JSON storage is enough here
+    return "JSON"
+
+
+def build_app(stack: str, session: Session, user: User) -> FastAPI:
+    """Build a benchmark app with the given middleware stack."""
+    app = FastAPI()
+    app.add_middleware(CORSMiddleware, allow_origins=["http://localhost:3000"], allow_credentials=True)
+
+    if stack == "asgi":
+        app.add_middleware(HTTPLayerMiddleware)
+    else:
+        @app.middleware("http")
+        async def add_security_headers(request, call_next):
+            response = await call_next(request)
+            response.headers["X-Content-Type-Options"] = "nosniff"
+            response.headers["X-Frame-Options"] = "DENY"
+            response.headers["X-XSS-Protection"] = "1; mode=block"
+            return response
+
+    app.include_router(tasks.router, prefix="/api")
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    # Reads and writes both go to the in-memory database
+    app.dependency_overrides[get_session] = lambda: session
+    app.dependency_overrides[get_read_session] = lambda: session
+    app.dependency_overrides[get_current_user] = lambda: user
+    app.dependency_overrides[get_current_user_for_read] = lambda: user
+    return app
+
+
+def seed(task_count: int) -> tuple[Session, User]:
+    """Create an in-memory database with one user and task_count tasks."""
+    engine = instrument_engine(create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    ))
+    # Only the tables the tasks list reads; other Phase V tables use Postgres-only types
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, Task.__table__])
+    session = Session(engine)
+
+    user = User(email="bench@example.com", hashed_password="-", name="Bench")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+    session.add_all(
+        Task(user_id=user.id, title=f"Task {i}", priority="medium")
+        for i in range(task_count)
+    )
+    session.commit()
+    return session, user
+
+
+async def measure(app: FastAPI, path: str, requests: int) -> float:
+    """Send requests sequentially and return requests per second."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(requests // 10, 100)):
+            (await client.get(path)).raise_for_status()
+
+        started = time.perf_counter()
+        for _ in range(requests):
+            response = await client.get(path)
+        elapsed = time.perf_counter() - started
+
+        response.raise_for_status()
+        assert response.headers["x-frame-options"] == "DENY"
+    return requests / elapsed
+
+
+async def run(args: argparse.Namespace) -> None:
+    session, user = seed(args.tasks)
+    apps = {stack: build_app(stack, session, user) for stack in ("base-http", "asgi")}
+
+    print(f"requests: {args.requests}  tasks: {args.tasks}")
+    for path in ("/health", "/api/tasks/"):
+        results = {stack: await measure(app, path, args.requests) for stack, app in apps.items()}
+        gain = results["asgi"] / results["base-http"]
+        print(
+            f"{path:<12} base-http: {results['base-http']:8.0f} req/s   "
+            f"asgi: {results['asgi']:8.0f} req/s   gain: {gain:5.2f}x"
+        )
+    session.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tasks", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
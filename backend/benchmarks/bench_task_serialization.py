@@ -0,0 +1,83 @@
+"""Benchmark: task list serialization, default path vs fast path.
+
+Default path: ORM Task objects -> response_model=list[TaskResponse]
+validation -> JSON encoding (what FastAPI does for GET /api/tasks).
+Fast path: column rows -> serialize_task_rows (orjson), as enabled by
+FAST_JSON_RESPONSES.
+
+Usage (from backend/):
+    python -m benchmarks.bench_task_serialization --tasks 10000
+"""
+
+import os
+import json
+import argparse
+import timeit
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models import Task
+from app.responses import ORJSON_AVAILABLE, TASK_RESPONSE_FIELDS, serialize_task_rows
+from app.schemas import TaskResponse
+
+
+def build_tasks(count: int) -> list[Task]:
+    """Build detached Task objects shaped like real rows."""
+    base = datetime(2026, 1, 1, 9, 0, 0, 123456)
+    return [
+        Task(
+            id=i,
+            user_id=1,
+            title=f"Task number {i}",
+            description="Pick up groceries and remember the oat milk" if i % 3 else "",
+            priority=("low", "medium", "high")[i % 3],
+            is_complete=bool(i % 2),
+            created_at=base + timedelta(minutes=i),
+            updated_at=base + timedelta(minutes=i, seconds=30),
+            reminder_time=base + timedelta(days=1) if i % 5 == 0 else None,
+            reminder_config={"channels": ["email"]} if i % 5 == 0 else None,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def default_path(tasks: list[Task], adapter: TypeAdapter) -> bytes:
+    """Mimic FastAPI: validate into response_model, then JSON-encode."""
+    validated = adapter.validate_python([task.model_dump() for task in tasks])
+    content = jsonable_encoder(adapter.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows: list[tuple]) -> bytes:
+    """Encode column rows directly."""
+    return serialize_task_rows(rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = build_tasks(args.tasks)
+    rows = [tuple(getattr(task, name) for name in TASK_RESPONSE_FIELDS) for task in tasks]
+    adapter = TypeAdapter(list[TaskResponse])
+
+    # Both paths must produce the same document
+    assert json.loads(default_path(tasks, adapter)) == json.loads(fast_path(rows))
+
+    default_s = min(timeit.repeat(lambda: default_path(tasks, adapter), number=1, repeat=args.repeat))
+    fast_s = min(timeit.repeat(lambda: fast_path(rows), number=1, repeat=args.repeat))
+
+    print(f"tasks: {args.tasks}  encoder: {'orjson' if ORJSON_AVAILABLE else 'json'}")
+    print(f"default (validate + json): {default_s * 1000:8.2f} ms")
+    print(f"fast (rows -> bytes):      {fast_s * 1000:8.2f} ms")
+    print(f"speedup:                   {default_s / fast_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Shared fixtures for the pytest-benchmark microbenchmarks.
+
+Run from backend/ (not collected by the regular test run):
+    pytest benchmarks -m "not slow"
+    pytest benchmarks --benchmark-json=results/micro.json   # includes 100k
+
+Datasets are seeded (same rows every run) and built once per size in an
+in-memory SQLite database. Every benchmark also records the peak and
+retained allocations of one extra call under tracemalloc in
+``extra_info`` (outside the timed rounds, so timings are unaffected).
+"""
+
+import os
+import random
+import asyncio
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Callable
+
+os.environ.setdefault("DATABASE_URL", "postgresql://localhost/benchmark")
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import pytest
+from sqlalchemy import DDL, event, insert
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+from sqlmodel import Session, create_engine, select
+from sqlmodel.pool import StaticPool
+
+from app.models import ConversationHistory, Event, Task, User
+
+SEED = 20260101
+DATASET_SIZES = [10, 1_000, pytest.param(100_000, marks=pytest.mark.slow)]
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kwargs):
+    # Task.reminder_config is JSONB; plain JSON storage is enough here
+    return "JSON"
+
+
+@compiles(CreateColumn, "sqlite")
+def _compile_event_position_sqlite(create, compiler, **kwargs):
+    # The task tools append to events; SQLite has no sequences, so
+    # events.position is filled from the rowid by the trigger below
+    if create.element is Event.__table__.c.position:
+        return "position INTEGER NOT NULL DEFAULT 0"
+    return compiler.visit_create_column(create, **kwargs)
+
+
+event.listen(
+    Event.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS events_position AFTER INSERT ON events "
+        "BEGIN UPDATE events SET position = NEW.rowid WHERE rowid = NEW.rowid; END"
+    ).execute_if(dialect="sqlite"),
+)
+
+
+def build_task_rows(user_id: int, count: int, seed: int = SEED) -> list[dict]:
+    """Generate deterministic task rows for one user."""
+    rng = random.Random(seed + count)
+    base = datetime(2026, 1, 1, 9, 0, 0)
+    words = ("groceries", "report", "dentist", "invoice", "laundry", "gym", "call mom", "taxes")
+    rows = []
+    for i in range(count):
+        created = base + timedelta(minutes=i)
+        has_reminder = rng.random() < 0.2
+        rows.append({
+            "user_id": user_id,
+            "title": f"{rng.choice(words).title()} #{i}",
+            "description": "" if rng.random() < 0.3 else f"Details for {rng.choice(words)} " * rng.randint(1, 8),
+            "priority": rng.choice(("low", "medium", "high")),
+            "is_complete": rng.random() < 0.4,
+            "created_at": created,
+            "updated_at": created + timedelta(seconds=rng.randint(0, 86_400)),
+            "reminder_time": created + timedelta(days=1) if has_reminder else None,
+            "reminder_config": {"channels": ["email"]} if has_reminder else None,
+        })
+    return rows
+
+
+class Dataset:
+    """A seeded database with one user owning ``size`` tasks."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        tables = [User.__table__, Task.__table__, ConversationHistory.__table__, Event.__table__]
+        User.metadata.create_all(self.engine, tables=tables)
+
+        with Session(self.engine) as session:
+            user = User(email=f"bench-{size}@example.com", hashed_password="-", name="Bench")
+            session.add(user)
+            session.commit()
+            self.user_id = user.id
+
+            session.execute(insert(Task), build_task_rows(self.user_id, size))
+            session.execute(insert(ConversationHistory), [
+                {
+                    "user_id": self.user_id,
+                    "role": "user" if i % 2 == 0 else "assistant",
+                    "content": f"Message {i}: please add a task to buy groceries",
+                    "created_at": datetime(2026, 1, 1) + timedelta(seconds=i),
+                }
+                for i in range(50)
+            ])
+            session.commit()
+
+        self.session = Session(self.engine)
+        self.task_ids = list(self.session.exec(select(Task.id).order_by(Task.id)).all())
+
+    def close(self) -> None:
+        self.session.close()
+        self.engine.dispose()
+
+
+@pytest.fixture(scope="session", params=DATASET_SIZES, ids=lambda size: f"{size}-tasks")
+def dataset(request) -> Dataset:
+    """Seeded dataset, built once per size."""
+    data = Dataset(request.param)
+    yield data
+    data.close()
+
+
+@pytest.fixture(scope="session")
+def event_loop_runner() -> Callable:
+    """Run coroutines on one long-lived loop (no per-call loop setup)."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture
+def measure(benchmark) -> Callable:
+    """Benchmark a callable and record its allocations.
+
+    Usage:
+        result = measure(lambda: fn(x), setup=optional_setup)
+
+    With a setup callable or a fixed number of rounds, it runs in pedantic
+    mode (setup runs before every round, default 50 rounds).
+    """
+    def _measure(fn: Callable, setup: Callable | None = None, rounds: int | None = None):
+        if setup:
+            setup()
+        tracemalloc.start()
+        try:
+            fn()
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info["alloc_peak_kib"] = round(peak / 1024, 1)
+        benchmark.extra_info["alloc_retained_kib"] = round(retained / 1024, 1)
+
+        if setup or rounds:
+            return benchmark.pedantic(fn, setup=setup, rounds=rounds or 50, warmup_rounds=1)
+        return benchmark(fn)
+
+    return _measure
@@ -0,0 +1,185 @@
+"""Stub OpenAI-compatible server for load tests.
+
+Serves POST /v1/chat/completions with a configurable delay and scripted
+tool calls, so chat turns exercise the real agent loop, MCP tools and
+database without calling OpenAI. Point the backend at it with
+OPENAI_BASE_URL=http://127.0.0.1:<port>/v1 (any OPENAI_API_KEY works).
+
+A script is a JSON file of rules; the first rule whose "match" substring
+occurs in the latest user message is used:
+
+    {
+      "rules": [
+        {
+          "match": "add",
+          "tool_calls": [{"name": "create_task", "arguments": {"title": "Buy milk"}}],
+          "reply": "Added it."
+        }
+      ],
+      "default_reply": "Sure."
+    }
+
+When the conversation ends with a user message, the rule's tool calls are
+returned (or its reply if it has none). Once tool results come back, the
+rule's reply ends the turn.
+
+Usage (from backend/):
+    python -m benchmarks.mock_openai --port 8089 --latency-ms 400 --jitter-ms 150
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from itertools import count
+from typing import Any, Optional
+
+from fastapi import FastAPI, Request
+
+DEFAULT_SCRIPT: dict[str, Any] = {
+    "rules": [
+        {
+            "match": "add",
+            "tool_calls": [{"name": "create_task", "arguments": {"title": "Load test task", "priority": "medium"}}],
+            "reply": "I've added that task.",
+        },
+        {
+            "match": "show",
+            "tool_calls": [{"name": "list_tasks", "arguments": {}}],
+            "reply": "Here are your tasks.",
+        },
+        {
+            "match": "done",
+            "tool_calls": [{"name": "list_tasks", "arguments": {"is_complete": False}}],
+            "reply": "Which one did you finish?",
+        },
+    ],
+    "default_reply": "I can add, show or complete tasks for you.",
+}
+
+
+def create_app(
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    script: Optional[dict[str, Any]] = None,
+) -> FastAPI:
+    """Build the stub server.
+
+    Args:
+        latency_ms: Mean delay before each completion is returned
+        jitter_ms: Uniform +/- variation of the delay
+        script: Tool-call script (defaults to DEFAULT_SCRIPT)
+
+    Returns:
+        FastAPI: ASGI app serving /v1/chat/completions
+    """
+    app = FastAPI(title="Mock OpenAI")
+    script = script or DEFAULT_SCRIPT
+    ids = count(1)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+
+        delay = max(0.0, latency_ms + random.uniform(-jitter_ms, jitter_ms)) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+
+        return build_completion(messages, body.get("model", "mock"), script, next(ids))
+
+    return app
+
+
+def build_completion(
+    messages: list[dict[str, Any]],
+    model: str,
+    script: dict[str, Any],
+    n: int,
+) -> dict[str, Any]:
+    """Build the scripted chat.completion response for a conversation.
+
+    Args:
+        messages: Request messages (OpenAI format)
+        model: Model name to echo back
+        script: Tool-call script
+        n: Sequence number, used for response and tool call ids
+
+    Returns:
+        dict: chat.completion response body
+    """
+    rule = _match_rule(script, _last_user_message(messages))
+    tool_calls = rule.get("tool_calls") if rule else None
+
+    if tool_calls and messages and messages[-1].get("role") == "user":
+        message = {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {
+                    "id": f"call_{n}_{i}",
+                    "type": "function",
+                    "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}))},
+                }
+                for i, call in enumerate(tool_calls)
+            ],
+        }
+        finish_reason = "tool_calls"
+    else:
+        reply = rule.get("reply") if rule else None
+        message = {"role": "assistant", "content": reply or script.get("default_reply", "OK")}
+        finish_reason = "stop"
+
+    prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+    completion_tokens = len(str(message.get("content") or "")) // 4 + 10
+    return {
+        "id": f"chatcmpl-mock-{n}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _last_user_message(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return str(message.get("content") or "").lower()
+    return ""
+
+
+def _match_rule(script: dict[str, Any], text: str) -> Optional[dict[str, Any]]:
+    for rule in script.get("rules", []):
+        if rule.get("match", "").lower() in text:
+            return rule
+    return None
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency-ms", type=float, default=400.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--script", help="Path to a JSON tool-call script")
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script) as f:
+            script = json.load(f)
+
+    app = create_app(args.latency_ms, args.jitter_ms, script)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
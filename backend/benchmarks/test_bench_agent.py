@@ -0,0 +1,103 @@
+"""Microbenchmarks: agent context building, message assembly and metadata.
+
+process_message runs against a scripted in-process completions client (the
+same responses as benchmarks.mock_openai), so the numbers are the agent's
+own CPU cost: history query, message assembly, tool-call argument parsing,
+tool execution and metadata, with no network or model latency.
+"""
+
+import json
+from itertools import count
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+from app.ai.agent import TodoAgent
+from app.mcp.server import initialize_tools
+from benchmarks.mock_openai import DEFAULT_SCRIPT, build_completion
+
+
+class ScriptedCompletions:
+    """Stands in for client.chat.completions."""
+
+    def __init__(self, script=DEFAULT_SCRIPT):
+        self.script = script
+        self.ids = count(1)
+
+    async def create(self, *, model, messages, **kwargs) -> ChatCompletion:
+        return ChatCompletion.model_validate(build_completion(messages, model, self.script, next(self.ids)))
+
+
+class ScriptedClient:
+    def __init__(self):
+        self.chat = type("Chat", (), {"completions": ScriptedCompletions()})()
+
+
+@pytest.fixture(scope="module")
+def agent(event_loop_runner) -> TodoAgent:
+    event_loop_runner(initialize_tools())
+    todo_agent = TodoAgent()
+    todo_agent.client = ScriptedClient()
+    return todo_agent
+
+
+class TestGenerateMetadata:
+    """_generate_metadata for each tool result shape."""
+
+    @pytest.mark.parametrize("tool_name,tool_result", [
+        ("create_task", {"success": True, "task": {"id": 42, "title": "Milk", "is_complete": False}}),
+        ("toggle_task_completion", {"success": True, "task": {"id": 42, "is_complete": True}}),
+        ("list_tasks", {"success": True, "tasks": [{"id": i} for i in range(50)], "count": 50}),
+        ("delete_task", {"success": False, "error": "Task not found"}),
+    ])
+    def test_generate_metadata(self, measure, agent, tool_name, tool_result):
+        measure(lambda: agent._generate_metadata(tool_name, tool_result))
+
+
+class TestContextBuilding:
+    """History query and message assembly."""
+
+    @pytest.mark.parametrize("limit", [10, 50])
+    def test_get_conversation_context(self, measure, agent, dataset, event_loop_runner, limit):
+        history = measure(
+            lambda: event_loop_runner(agent.get_conversation_context(dataset.session, dataset.user_id, limit))
+        )
+        assert len(history) == limit
+
+    def test_tool_round_assembly(self, measure, agent, dataset, event_loop_runner):
+        history = event_loop_runner(agent.get_conversation_context(dataset.session, dataset.user_id))
+        response = ChatCompletion.model_validate(build_completion(
+            [{"role": "user", "content": "add milk"}], "gpt-4o", DEFAULT_SCRIPT, 1
+        ))
+        tool_result = {"success": True, "task": {"id": 1, "title": "Load test task", "is_complete": False}}
+
+        # The per-round work process_message does around execute_tool
+        def assemble():
+            messages = [{"role": "system", "content": "system prompt"}] + history
+            for tool_call in response.choices[0].message.tool_calls:
+                json.loads(tool_call.function.arguments)
+                messages.append({
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [{
+                        "id": tool_call.id,
+                        "type": "function",
+                        "function": {"name": tool_call.function.name, "arguments": tool_call.function.arguments},
+                    }],
+                })
+                messages.append({"role": "tool", "tool_call_id": tool_call.id, "content": json.dumps(tool_result)})
+            return messages
+
+        assert len(measure(assemble)) == len(history) + 3
+
+
+class TestProcessMessage:
+    """Full chat turns with scripted completions."""
+
+    @pytest.mark.parametrize("message", ["add buy milk", "show me my tasks", "hello"])
+    def test_process_message(self, measure, agent, dataset, event_loop_runner, message):
+        result = measure(
+            lambda: event_loop_runner(agent.process_message(dataset.session, dataset.user_id, message)),
+            rounds=20,
+        )
+        assert result["message"]
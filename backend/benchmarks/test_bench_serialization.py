@@ -0,0 +1,62 @@
+"""Microbenchmarks: task list serialization per dataset size."""
+
+import json
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlmodel import select
+
+from app.models import Task
+from app.responses import TASK_RESPONSE_COLUMNS, serialize_task_rows
+from app.schemas import TaskResponse
+
+
+@pytest.fixture(scope="module")
+def task_list_adapter() -> TypeAdapter:
+    return TypeAdapter(list[TaskResponse])
+
+
+class TestTaskListSerialization:
+    """ORM objects through response_model vs column rows through orjson."""
+
+    def test_response_model_path(self, measure, dataset, task_list_adapter):
+        tasks = dataset.session.exec(select(Task).where(Task.user_id == dataset.user_id)).all()
+
+        def encode():
+            validated = task_list_adapter.validate_python([task.model_dump() for task in tasks])
+            content = jsonable_encoder(task_list_adapter.dump_python(validated, mode="json"))
+            return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+        body = measure(encode)
+        assert body.startswith(b"[")
+
+    def test_fast_path(self, measure, dataset):
+        rows = dataset.session.exec(select(*TASK_RESPONSE_COLUMNS).where(Task.user_id == dataset.user_id)).all()
+        body = measure(lambda: serialize_task_rows(rows))
+        assert body.startswith(b"[")
+
+    def test_mcp_task_dicts(self, measure, dataset):
+        tasks = dataset.session.exec(select(Task).where(Task.user_id == dataset.user_id)).all()
+
+        # Same dict building as tools.list_tasks, plus the json.dumps the
+        # agent applies to every tool result
+        def build():
+            return json.dumps({
+                "success": True,
+                "tasks": [
+                    {
+                        "id": task.id,
+                        "title": task.title,
+                        "description": task.description,
+                        "priority": task.priority,
+                        "is_complete": task.is_complete,
+                        "created_at": task.created_at.isoformat(),
+                        "updated_at": task.updated_at.isoformat(),
+                    }
+                    for task in tasks
+                ],
+                "count": len(tasks),
+            })
+
+        assert measure(build)
@@ -0,0 +1,76 @@
+"""Microbenchmarks: MCP tool calls (query + dict building) per dataset size."""
+
+import pytest
+
+from app.cache import task_cache
+from app.mcp import tools
+
+
+class TestListTasks:
+    """list_tasks, cold (cache invalidated every round) and warm."""
+
+    @pytest.mark.parametrize("limit", [50, 1000])
+    def test_list_tasks_cold(self, measure, dataset, event_loop_runner, limit):
+        result = measure(
+            lambda: event_loop_runner(tools.list_tasks(dataset.session, dataset.user_id, limit=limit)),
+            setup=lambda: task_cache.invalidate_user(dataset.user_id),
+        )
+        # Other benchmarks add tasks to the shared dataset
+        assert min(limit, dataset.size) <= result["count"] <= limit
+
+    def test_list_tasks_warm(self, measure, dataset, event_loop_runner):
+        result = measure(lambda: event_loop_runner(tools.list_tasks(dataset.session, dataset.user_id)))
+        assert result["success"]
+
+    def test_list_tasks_title_query(self, measure, dataset, event_loop_runner):
+        result = measure(
+            lambda: event_loop_runner(
+                tools.list_tasks(dataset.session, dataset.user_id, title_query="grocery", limit=1000)
+            ),
+            setup=lambda: task_cache.invalidate_user(dataset.user_id),
+        )
+        assert result["success"]
+
+
+class TestSingleTaskTools:
+    """Tools that touch one task."""
+
+    def test_get_task(self, measure, dataset, event_loop_runner):
+        task_id = dataset.task_ids[len(dataset.task_ids) // 2]
+        result = measure(lambda: event_loop_runner(tools.get_task(dataset.session, dataset.user_id, task_id)))
+        assert result["success"]
+
+    def test_create_task(self, measure, dataset, event_loop_runner):
+        result = measure(
+            lambda: event_loop_runner(tools.create_task(dataset.session, dataset.user_id, "Benchmark task"))
+        )
+        assert result["success"]
+
+    def test_update_task(self, measure, dataset, event_loop_runner):
+        task_id = dataset.task_ids[0]
+        result = measure(
+            lambda: event_loop_runner(tools.update_task(dataset.session, dataset.user_id, task_id, title="Renamed"))
+        )
+        assert result["success"]
+
+    def test_toggle_task_completion(self, measure, dataset, event_loop_runner):
+        task_id = dataset.task_ids[-1]
+        result = measure(
+            lambda: event_loop_runner(
+                tools.toggle_task_completion(dataset.session, dataset.user_id, task_id, is_complete=True)
+            )
+        )
+        assert result["success"]
+
+    def test_delete_task(self, measure, dataset, event_loop_runner):
+        created = []
+
+        def setup():
+            result = event_loop_runner(tools.create_task(dataset.session, dataset.user_id, "To delete"))
+            created.append(result["task"]["id"])
+
+        result = measure(
+            lambda: event_loop_runner(tools.delete_task(dataset.session, dataset.user_id, created[-1])),
+            setup=setup,
+        )
+        assert result["success"]
@@ -4,15 +4,60 @@ import os
 import pytest
 from typing import Generator
 from fastapi.testclient import TestClient
+from sqlalchemy import DDL, event
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
 from sqlmodel import Session, create_engine, SQLModel
 from sqlmodel.pool import StaticPool
 
 from app.main import app
-from app.database import get_session
-from app.models import User, Task, ConversationHistory
+from app.database import get_read_session, get_session
+from app.models import (
+    User, Task, ConversationHistory, RecurrencePattern, Reminder, Event, EventCheckpoint, EventSnapshot,
+    Notification, NotificationReminder, reminders_archive, notifications_archive
+)
 from app.auth import hash_password, create_jwt
 
 
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kwargs):
+    # Phase V tables use JSONB; plain JSON storage is enough for tests
+    return "JSON"
+
+
+@compiles(ARRAY, "sqlite")
+def _compile_array_sqlite(type_, compiler, **kwargs):
+    # recurrence_patterns.days_of_week is an ARRAY; SQLite stores it as JSON
+    return "JSON"
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kwargs):
+    # A column declared UUID gets numeric affinity, which turns all-digit hex
+    # ids such as legacy_uuid(1) into integers; store them as text
+    return "CHAR(32)"
+
+
+@compiles(CreateColumn, "sqlite")
+def _compile_event_position_sqlite(create, compiler, **kwargs):
+    # SQLite has no sequences: events.position is filled from the rowid by
+    # the trigger below, so it needs a placeholder to pass NOT NULL
+    if create.element is Event.__table__.c.position:
+        return "position INTEGER NOT NULL DEFAULT 0"
+    return compiler.visit_create_column(create, **kwargs)
+
+
+event.listen(
+    Event.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER events_position AFTER INSERT ON events "
+        "BEGIN UPDATE events SET position = NEW.rowid WHERE rowid = NEW.rowid; END"
+    ).execute_if(dialect="sqlite"),
+)
+
+
 # Use in-memory SQLite for testing
 @pytest.fixture(name="session")
 def session_fixture() -> Generator[Session, None, None]:
@@ -27,6 +72,51 @@ def session_fixture() -> Generator[Session, None, None]:
         yield session
 
 
+@pytest.fixture(name="worker_engine")
+def worker_engine_fixture():
+    """In-memory SQLite engine with the reminder and notification tables (and archives)."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(
+        engine,
+        tables=[
+            Reminder.__table__,
+            Notification.__table__,
+            NotificationReminder.__table__,
+            reminders_archive,
+            notifications_archive,
+        ],
+    )
+    return engine
+
+
+@pytest.fixture(name="generator_engine")
+def generator_engine_fixture():
+    """In-memory SQLite engine with the users, tasks and recurrence_patterns tables."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, Task.__table__, RecurrencePattern.__table__])
+    return engine
+
+
+@pytest.fixture(name="event_engine")
+def event_engine_fixture():
+    """In-memory SQLite engine with the event store tables."""
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[Event.__table__, EventCheckpoint.__table__, EventSnapshot.__table__])
+    return engine
+
+
 @pytest.fixture(name="client")
 def client_fixture(session: Session) -> Generator[TestClient, None, None]:
     """Create a test client with database override."""
@@ -34,6 +124,7 @@ def client_fixture(session: Session) -> Generator[TestClient, None, None]:
         return session
 
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_read_session] = get_session_override
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
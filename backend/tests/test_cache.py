@@ -0,0 +1,103 @@
+"""Tests for the per-user task list cache."""
+
+from app.cache import MemoryBackend, RedisBackend, TaskListCache
+from app.mcp import tools
+from app.models import Task
+
+
+class TestTaskListCache:
+    """Test suite for TaskListCache with the in-memory backend."""
+
+    def test_second_read_is_served_from_cache(self):
+        """Test that repeated reads only call the loader once."""
+        cache = TaskListCache(MemoryBackend())
+        calls = []
+
+        def loader():
+            calls.append(1)
+            return [{"id": 1}]
+
+        assert cache.get_or_load(1, "api", {}, loader) == [{"id": 1}]
+        assert cache.get_or_load(1, "api", {}, loader) == [{"id": 1}]
+        assert len(calls) == 1
+
+    def test_filters_are_cached_separately(self):
+        """Test that different filters never share an entry."""
+        cache = TaskListCache(MemoryBackend())
+
+        cache.get_or_load(1, "mcp", {"priority": "high"}, lambda: ["high"])
+        result = cache.get_or_load(1, "mcp", {"priority": "low"}, lambda: ["low"])
+
+        assert result == ["low"]
+
+    def test_invalidate_user_only_affects_that_user(self):
+        """Test that a write invalidates the writer's lists only."""
+        cache = TaskListCache(MemoryBackend())
+        cache.get_or_load(1, "api", {}, lambda: ["old"])
+        cache.get_or_load(2, "api", {}, lambda: ["other"])
+
+        cache.invalidate_user(1)
+
+        assert cache.get_or_load(1, "api", {}, lambda: ["new"]) == ["new"]
+        assert cache.get_or_load(2, "api", {}, lambda: ["reloaded"]) == ["other"]
+
+    def test_expired_entries_are_reloaded(self):
+        """Test that entries older than the TTL are not served."""
+        cache = TaskListCache(MemoryBackend(), ttl=0)
+        cache.get_or_load(1, "api", {}, lambda: ["old"])
+
+        assert cache.get_or_load(1, "api", {}, lambda: ["new"]) == ["new"]
+
+    def test_evicted_version_is_never_reused(self):
+        """Test that a user whose version was evicted gets a new version."""
+        backend = MemoryBackend(max_entries=1)
+        first_version = backend.get_version(1)
+
+        # Tracking another user evicts user 1's version
+        backend.get_version(2)
+
+        assert backend.get_version(1) != first_version
+
+
+class FakeRedis:
+    """The subset of redis.Redis used by RedisBackend.get/set."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, px=None, nx=False):
+        self.data[key] = value if isinstance(value, bytes) else value.encode()
+
+
+class TestRedisBackend:
+    """Test suite for RedisBackend value encoding."""
+
+    def test_bytes_and_json_round_trip(self):
+        """Test encoded response bodies come back as bytes and lists as JSON."""
+        backend = RedisBackend.__new__(RedisBackend)
+        backend.client, backend.prefix = FakeRedis(), "test"
+
+        backend.set("body", b'[{"id":1}]', ttl=10)
+        backend.set("list", [{"id": 1}], ttl=10)
+
+        assert backend.get("body") == b'[{"id":1}]'
+        assert backend.get("list") == [{"id": 1}]
+        assert backend.get("missing") is None
+
+
+class TestMcpListTasksCache:
+    """Test suite for the cached MCP list_tasks tool."""
+
+    async def test_sees_writes_made_without_invalidation(self, session, test_user, monkeypatch):
+        """Test a task inserted by another process (no invalidate_user) is listed on the next call."""
+        monkeypatch.setattr(tools, "task_cache", TaskListCache(MemoryBackend()))
+        assert (await tools.list_tasks(session, test_user.id))["count"] == 0
+
+        session.add(Task(user_id=test_user.id, title="Generated elsewhere"))
+        session.commit()
+
+        result = await tools.list_tasks(session, test_user.id)
+        assert [task["title"] for task in result["tasks"]] == ["Generated elsewhere"]
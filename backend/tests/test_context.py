@@ -0,0 +1,54 @@
+"""Tests for the request-scoped context."""
+
+import asyncio
+
+from app.context import get_request_context, request_context
+
+
+class TestRequestContext:
+    """Test suite for app.context."""
+
+    def test_context_is_reset_after_block(self):
+        """Test that no context leaks once the block exits."""
+        assert get_request_context() is None
+
+        with request_context(user_id=1, trace_id="abc") as ctx:
+            assert get_request_context() is ctx
+            assert ctx.user_id == 1
+
+        assert get_request_context() is None
+
+    def test_nested_binding_inherits_trace_id(self):
+        """Test that a nested binding keeps values it does not override."""
+        with request_context(user_id=1, trace_id="outer"):
+            with request_context(session="session") as inner:
+                assert inner.user_id == 1
+                assert inner.trace_id == "outer"
+                assert inner.session == "session"
+            assert get_request_context().session is None
+
+    async def test_concurrent_tasks_are_isolated(self):
+        """Test that concurrent requests never see each other's user."""
+        async def handle(user_id: int) -> int:
+            with request_context(user_id=user_id):
+                await asyncio.sleep(0)
+                return get_request_context().user_id
+
+        results = await asyncio.gather(*(handle(i) for i in range(1, 51)))
+        assert results == list(range(1, 51))
+
+    async def test_background_task_keeps_context(self):
+        """Test that a task started in a request sees its context after the request ends."""
+        seen = asyncio.Event()
+        captured = {}
+
+        async def background():
+            await seen.wait()
+            captured["user_id"] = get_request_context().user_id
+
+        with request_context(user_id=7):
+            task = asyncio.create_task(background())
+
+        seen.set()
+        await task
+        assert captured["user_id"] == 7
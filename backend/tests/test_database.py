@@ -0,0 +1,155 @@
+"""Tests for read-replica routing and read-your-writes stickiness."""
+
+import os
+import sys
+import time
+import subprocess
+from pathlib import Path
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+import app.database as database
+import app.middleware as middleware
+from app.middleware import HTTPLayerMiddleware
+from app.models import ConversationHistory, Task, User
+
+
+def _sqlite_engine():
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    SQLModel.metadata.create_all(engine, tables=[User.__table__, Task.__table__, ConversationHistory.__table__])
+    return engine
+
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Separate primary and replica engines."""
+    primary, replica = _sqlite_engine(), _sqlite_engine()
+    monkeypatch.setattr(database, "_engine", primary)
+    monkeypatch.setattr(database, "_read_engine", replica)
+    monkeypatch.setattr(middleware, "_has_replica", True)
+    return primary, replica
+
+
+def _user(session: Session) -> User:
+    user = User(email="rw@example.com", hashed_password="x", name="RW")
+    session.add(user)
+    session.commit()
+    return user
+
+
+class TestReadRouting:
+    """Test suite for reads_use_primary and read_session."""
+
+    def test_no_replica_reads_primary(self, monkeypatch):
+        """Test that without DATABASE_READ_URL every read uses the primary."""
+        monkeypatch.setattr(database, "_read_engine", database.get_engine())
+        assert database.reads_use_primary()
+
+    def test_outside_request_reads_replica(self, engines):
+        """Test that untracked reads go to the replica."""
+        assert not database.reads_use_primary()
+
+    def test_write_pins_only_written_tables(self, engines):
+        """Test that a commit pins reads of the tables it wrote."""
+        primary, _ = engines
+        with database.track_writes() as writes, Session(primary) as session:
+            _user(session)
+            assert writes.tables == {"users"}
+            assert database.reads_use_primary("users")
+            assert not database.reads_use_primary("tasks")
+            assert database.reads_use_primary()
+
+    def test_rollback_records_nothing(self, engines):
+        """Test that flushed but rolled-back writes do not pin reads."""
+        primary, _ = engines
+        with database.track_writes() as writes, Session(primary) as session:
+            session.add(User(email="gone@example.com", hashed_password="x", name="Gone"))
+            session.flush()
+            session.rollback()
+            assert not writes.wrote
+
+    def test_sticky_pins_everything(self, engines):
+        """Test that a recent-write cookie pins all reads."""
+        with database.track_writes(sticky=True):
+            assert database.reads_use_primary("tasks")
+
+    def test_read_session_swaps_primary_session(self, engines):
+        """Test that read_session opens a replica session for a primary one."""
+        primary, replica = engines
+        with Session(primary) as session, database.read_session(session, "tasks") as reader:
+            assert reader is not session
+            assert reader.get_bind() is replica
+
+    def test_read_session_keeps_foreign_session(self, engines):
+        """Test that sessions on other engines (tests, tools) are kept."""
+        with Session(_sqlite_engine()) as session, database.read_session(session) as reader:
+            assert reader is session
+
+    def test_read_session_creates_no_engine(self, monkeypatch):
+        """Test that read_session on another pool never builds the API engine."""
+        monkeypatch.setattr(database, "_engine", None)
+        monkeypatch.setattr(database, "DATABASE_URL", None)
+        with Session(_sqlite_engine()) as session, database.read_session(session, "tasks") as reader:
+            assert reader is session
+        assert database._engine is None
+
+
+class TestLazyEngine:
+    """Test suite for creating the engines on first use."""
+
+    def test_mcp_server_imports_without_database_url(self):
+        """Test that the standalone MCP server needs no DATABASE_URL and opens no API pool."""
+        env = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+        code = "import app.database, app.mcp.standalone; assert app.database._engine is None"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).resolve().parents[1],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+
+
+class TestPrimaryCookie:
+    """Test suite for the db_primary_until cookie."""
+
+    def test_parse(self):
+        """Test that only an unexpired cookie pins reads."""
+        future, past = time.time() + 5, time.time() - 5
+        assert database.primary_until_cookie(f"a=1; db_primary_until={future:.0f}")
+        assert not database.primary_until_cookie(f"db_primary_until={past:.0f}")
+        assert not database.primary_until_cookie("db_primary_until=junk")
+        assert not database.primary_until_cookie(None)
+
+    def test_set_after_write_and_read_back(self, engines):
+        """Test that a write sets the cookie and the next request is sticky."""
+        primary, _ = engines
+        app = FastAPI()
+        app.add_middleware(HTTPLayerMiddleware)
+
+        @app.post("/write")
+        def write():
+            with Session(primary) as session:
+                _user(session)
+            return {}
+
+        @app.get("/read")
+        def read():
+            return {"primary": database.reads_use_primary()}
+
+        client = TestClient(app)
+        assert client.get("/read").json() == {"primary": False}
+        assert "db_primary_until" not in client.get("/read").headers.get("set-cookie", "")
+
+        response = client.post("/write")
+        assert "db_primary_until=" in response.headers["set-cookie"]
+        assert client.get("/read").json() == {"primary": True}
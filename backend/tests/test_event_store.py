@@ -0,0 +1,149 @@
+"""Tests for the event store."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from app.events import NewEvent, append, load_checkpoint, read_stream, replay, run_projection
+from app.models import Event
+
+NOW = datetime(2026, 3, 2, 9, 0, 0)
+
+
+def _append(engine, events, now=NOW) -> list:
+    with Session(engine) as session:
+        ids = append(session, events, now=now)
+        session.commit()
+    return ids
+
+
+def _task_events(task_id, count, start=0) -> list:
+    return [
+        NewEvent("task.updated", "task", task_id, {"revision": start + i})
+        for i in range(count)
+    ]
+
+
+class CountingProjection:
+    """Counts events per aggregate into an in-memory read model."""
+
+    name = "counts"
+    event_types = None
+
+    def __init__(self):
+        self.counts = {}
+        self.batches = 0
+
+    def reset(self, session):
+        self.counts = {}
+
+    def apply(self, session, events):
+        self.batches += 1
+        for stored in events:
+            self.counts[stored.aggregate_id] = self.counts.get(stored.aggregate_id, 0) + 1
+
+
+class TestAppend:
+    """Test suite for append and read_stream."""
+
+    def test_streams_keep_append_order(self, event_engine):
+        """Test each aggregate reads back its own events, in order, with keyset paging."""
+        task_a, task_b = uuid4(), uuid4()
+        _append(event_engine, _task_events(task_a, 3) + _task_events(task_b, 2))
+        _append(event_engine, _task_events(task_a, 2, start=3))
+
+        with Session(event_engine) as session:
+            stream = read_stream(session, "task", task_a)
+            page = read_stream(session, "task", task_a, after=stream[1].position, limit=2)
+
+        assert [e.payload["revision"] for e in stream] == [0, 1, 2, 3, 4]
+        assert [e.payload["revision"] for e in page] == [2, 3]
+        assert all(e.aggregate_id == task_a for e in stream)
+
+    def test_batches_into_chunks(self, event_engine):
+        """Test appends larger than a chunk are split and all stored."""
+        task_id = uuid4()
+        with Session(event_engine) as session:
+            ids = append(session, _task_events(task_id, 25), now=NOW, chunk_size=10)
+            session.commit()
+            stored = session.execute(select(func.count()).select_from(Event)).scalar()
+
+        assert len(ids) == len(set(ids)) == 25
+        assert stored == 25
+
+    def test_metadata_round_trip(self, event_engine):
+        """Test event metadata is stored in the metadata column."""
+        task_id = uuid4()
+        _append(event_engine, [NewEvent("task.created", "task", task_id, {}, metadata={"source": "api"})])
+
+        with Session(event_engine) as session:
+            [stored] = read_stream(session, "task", task_id)
+        assert stored.metadata == {"source": "api"}
+
+
+class TestReplay:
+    """Test suite for replay."""
+
+    def test_batches_in_position_order(self, event_engine):
+        """Test replay yields bounded batches covering every event after the cursor."""
+        _append(event_engine, _task_events(uuid4(), 7) + [NewEvent("task.deleted", "task", uuid4(), {})])
+
+        batches = list(replay(event_engine, batch_size=3))
+        positions = [e.position for batch in batches for e in batch]
+
+        assert [len(batch) for batch in batches] == [3, 3, 2]
+        assert positions == sorted(positions)
+        assert [e.position for batch in replay(event_engine, after=positions[4]) for e in batch] == positions[5:]
+        assert [e.event_type for batch in replay(event_engine, event_types={"task.deleted"}) for e in batch] == [
+            "task.deleted"
+        ]
+
+
+class TestRunProjection:
+    """Test suite for run_projection."""
+
+    def test_resumes_from_checkpoint(self, event_engine):
+        """Test a projection applies each event once across runs."""
+        task_id = uuid4()
+        projection = CountingProjection()
+        _append(event_engine, _task_events(task_id, 5))
+
+        assert run_projection(projection, bind=event_engine, batch_size=2, now=NOW + timedelta(minutes=1)) == 5
+        assert projection.batches == 3
+
+        _append(event_engine, _task_events(task_id, 2), now=NOW + timedelta(minutes=1))
+        assert run_projection(projection, bind=event_engine, now=NOW + timedelta(minutes=2)) == 2
+        assert run_projection(projection, bind=event_engine, now=NOW + timedelta(minutes=2)) == 0
+        assert projection.counts == {task_id: 7}
+
+    def test_waits_for_events_to_settle(self, event_engine):
+        """Test events younger than the settle delay are left for the next run."""
+        projection = CountingProjection()
+        _append(event_engine, _task_events(uuid4(), 2))
+
+        assert run_projection(projection, bind=event_engine, settle_seconds=5, now=NOW + timedelta(seconds=1)) == 0
+        assert run_projection(projection, bind=event_engine, settle_seconds=5, now=NOW + timedelta(seconds=6)) == 2
+
+    def test_rebuild(self, event_engine):
+        """Test rebuild resets the read model and replays from the start."""
+        task_id = uuid4()
+        projection = CountingProjection()
+        _append(event_engine, _task_events(task_id, 3))
+        later = NOW + timedelta(minutes=1)
+        run_projection(projection, bind=event_engine, now=later)
+
+        assert run_projection(projection, bind=event_engine, rebuild=True, now=later) == 3
+        assert projection.counts == {task_id: 3}
+
+    def test_filtered_projection_skips_other_types(self, event_engine):
+        """Test the checkpoint moves past events the projection does not read."""
+        projection = CountingProjection()
+        projection.event_types = {"task.created"}
+        _append(event_engine, [NewEvent("task.created", "task", uuid4(), {})] + _task_events(uuid4(), 3))
+
+        assert run_projection(projection, bind=event_engine, now=NOW + timedelta(minutes=1)) == 1
+        with Session(event_engine) as session:
+            head = session.execute(select(func.max(Event.position))).scalar()
+            assert load_checkpoint(session, "counts") == head
@@ -0,0 +1,72 @@
+"""Tests for readiness checks."""
+
+import asyncio
+
+from app.health import ReadinessChecks
+
+
+def _counting_check(ok: bool = True):
+    calls = []
+
+    async def check():
+        calls.append(1)
+        return ok, "checked"
+
+    return check, calls
+
+
+class TestReadinessChecks:
+    """Test suite for ReadinessChecks."""
+
+    def test_results_are_cached(self):
+        """Test that repeated probes within the TTL reuse the result."""
+        check, calls = _counting_check()
+        checks = ReadinessChecks({"db": check}, ttl=60)
+
+        async def probe_many():
+            return [await checks.run() for _ in range(5)]
+
+        results = asyncio.run(probe_many())
+        assert all(ok for ok, _ in results)
+        assert len(calls) == 1
+
+    def test_concurrent_probes_share_one_check(self):
+        """Test that concurrent probes wait for a single in-flight check."""
+        calls = []
+
+        async def slow_check():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return True, "ok"
+
+        checks = ReadinessChecks({"db": slow_check}, ttl=60)
+
+        async def probe_concurrently():
+            return await asyncio.gather(*(checks.run() for _ in range(10)))
+
+        asyncio.run(probe_concurrently())
+        assert len(calls) == 1
+
+    def test_failure_and_timeout(self):
+        """Test that failing, raising and hanging checks report not ready."""
+        async def raises():
+            raise ConnectionError("refused")
+
+        async def hangs():
+            await asyncio.sleep(10)
+            return True, "too late"
+
+        failing, _ = _counting_check(ok=False)
+        passing, _ = _counting_check()
+        checks = ReadinessChecks(
+            {"fails": failing, "raises": raises, "hangs": hangs, "passes": passing},
+            ttl=60,
+            timeout=0.05,
+        )
+
+        ok, results = asyncio.run(checks.run())
+        assert not ok
+        assert results["passes"].ok
+        assert not results["fails"].ok
+        assert "ConnectionError" in results["raises"].detail
+        assert "timed out" in results["hangs"].detail
@@ -0,0 +1,26 @@
+"""Tests for ETag helpers."""
+
+from app.http_cache import etag_matches, weak_etag
+
+
+class TestETags:
+    """Test suite for If-None-Match handling."""
+
+    def test_matching_etag(self):
+        """Test that the current ETag matches (weak or strong form)."""
+        etag = weak_etag("tasks", 1, 3, "2026-01-01T00:00:00")
+        assert etag_matches(etag, etag)
+        assert etag_matches(etag.removeprefix("W/"), etag)
+
+    def test_etag_in_list(self):
+        """Test that any ETag in a comma-separated list matches."""
+        etag = weak_etag("tasks", 1, 3)
+        assert etag_matches(f'W/"stale", {etag}', etag)
+        assert etag_matches("*", etag)
+
+    def test_changed_version_does_not_match(self):
+        """Test that a new task-set version invalidates the client's copy."""
+        old = weak_etag("tasks", 1, 3, "2026-01-01T00:00:00")
+        new = weak_etag("tasks", 1, 4, "2026-01-01T00:00:05")
+        assert not etag_matches(old, new)
+        assert not etag_matches(None, new)
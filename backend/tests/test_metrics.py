@@ -0,0 +1,104 @@
+"""Tests for Prometheus metrics."""
+
+import sys
+import importlib.util
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+import app.main
+from app.metrics import observe_event_publish
+from app.middleware import HTTPLayerMiddleware
+
+
+def _sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def _requests(route: str, status: str = "200") -> float:
+    return _sample("http_request_duration_seconds_count", method="GET", route=route, status=status)
+
+
+class TestMetricsEndpoint:
+    """Test suite for GET /metrics."""
+
+    def test_renders_prometheus_text(self, client):
+        """Test the exposition format is served with the collected metrics."""
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert "event_publish_duration_seconds" in response.text
+
+    def test_unavailable_without_prometheus_client(self, client, monkeypatch):
+        """Test /metrics answers 503 when prometheus_client is missing."""
+        monkeypatch.setattr(app.main, "PROMETHEUS_AVAILABLE", False)
+        assert client.get("/metrics").status_code == 503
+
+
+class TestRouteLabels:
+    """Test suite for request metrics labels."""
+
+    def test_labelled_by_route_template(self):
+        """Test requests are labelled by route template, not by raw path."""
+        api = FastAPI()
+        api.add_middleware(HTTPLayerMiddleware)
+
+        @api.get("/items/{item_id}")
+        def item(item_id: int):
+            return {"id": item_id}
+
+        before = _requests("/items/{item_id}")
+        unmatched = _requests("unmatched", status="404")
+        client = TestClient(api)
+        client.get("/items/123")
+        client.get("/items/456")
+        client.get("/nowhere/789")
+
+        assert _requests("/items/{item_id}") == before + 2
+        assert _requests("/items/123") == 0
+        assert _requests("unmatched", status="404") == unmatched + 1
+
+
+class TestObserveEventPublish:
+    """Test suite for observe_event_publish."""
+
+    def test_records_outcome(self):
+        """Test successful and failing publishes are timed under their outcome."""
+        name = "event_publish_duration_seconds_count"
+        ok = _sample(name, event_type="test.published", outcome="ok")
+        error = _sample(name, event_type="test.published", outcome="error")
+
+        with observe_event_publish("test.published"):
+            pass
+        with pytest.raises(RuntimeError):
+            with observe_event_publish("test.published"):
+                raise RuntimeError("sidecar down")
+
+        assert _sample(name, event_type="test.published", outcome="ok") == ok + 1
+        assert _sample(name, event_type="test.published", outcome="error") == error + 1
+
+
+class TestWithoutPrometheusClient:
+    """Test suite for the no-op fallback."""
+
+    def test_metrics_are_no_ops(self, monkeypatch):
+        """Test every metric accepts the calls the app makes and records nothing."""
+        # A None entry makes `import prometheus_client` raise ImportError
+        monkeypatch.setitem(sys.modules, "prometheus_client", None)
+        spec = importlib.util.find_spec("app.metrics")
+        metrics = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(metrics)
+
+        assert metrics.PROMETHEUS_AVAILABLE is False
+        metrics.HTTP_REQUEST_DURATION.labels(method="GET", route="/", status="200").observe(0.1)
+        metrics.HTTP_REQUESTS_IN_FLIGHT.labels(method="GET").inc()
+        metrics.REMINDER_BATCH_SIZE.set(10)
+        metrics.REMINDERS_FIRED.inc(3)
+        with metrics.observe_event_publish("task.created"):
+            pass
+        metrics.start_metrics_server(9100)
+        metrics.mark_worker_dead()
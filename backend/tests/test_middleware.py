@@ -0,0 +1,119 @@
+"""Tests for the pure ASGI HTTP layer and response compression."""
+
+import asyncio
+import zlib
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.middleware import CompressionMiddleware, HTTPLayerMiddleware, negotiate_encoding
+
+
+def _client(**options) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(HTTPLayerMiddleware, **options)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    @app.get("/framed")
+    def framed():
+        return Response("ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+    return TestClient(app)
+
+
+class TestHTTPLayerMiddleware:
+    """Test suite for HTTPLayerMiddleware."""
+
+    def test_security_headers(self):
+        """Test that every response carries the security headers."""
+        response = _client().get("/ping")
+        assert response.status_code == 200
+        assert response.headers["x-content-type-options"] == "nosniff"
+        assert response.headers["x-frame-options"] == "DENY"
+        assert response.headers["x-xss-protection"] == "1; mode=block"
+
+    def test_security_headers_replace_existing(self):
+        """Test that a handler's own value is replaced, not duplicated."""
+        response = _client().get("/framed")
+        assert response.headers.get_list("x-frame-options") == ["DENY"]
+
+    def test_server_timing_is_opt_in(self):
+        """Test that DB timings are only sent when enabled."""
+        assert "server-timing" not in _client().get("/ping").headers
+        response = _client(server_timing=True).get("/ping")
+        assert response.headers["server-timing"].startswith("db;dur=")
+
+    def test_unmatched_route(self):
+        """Test that 404s still get headers."""
+        response = _client().get("/missing")
+        assert response.status_code == 404
+        assert response.headers["x-frame-options"] == "DENY"
+
+
+def _compression_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/large")
+    def large():
+        return [{"id": i, "title": f"Task {i}"} for i in range(200)]
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+class TestCompressionMiddleware:
+    """Test suite for CompressionMiddleware."""
+
+    def test_negotiation(self):
+        """Test Accept-Encoding parsing, including q=0 opt-outs."""
+        assert negotiate_encoding(None) is None
+        assert negotiate_encoding("gzip, deflate") == "gzip"
+        assert negotiate_encoding("gzip;q=0, identity") is None
+        assert negotiate_encoding("br;q=0, *") == "gzip"
+
+    def test_large_body_is_gzipped(self):
+        """Test that a large JSON body is compressed with a correct length."""
+        response = _compression_client().get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert len(response.json()) == 200
+
+    def test_small_body_is_not_compressed(self):
+        """Test that bodies under the threshold are sent as is."""
+        response = _compression_client().get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_streaming_chunks_are_flushed(self):
+        """Test that each streamed event is decodable as soon as it is sent."""
+        async def app(scope, receive, send):
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"text/event-stream")],
+            })
+            for i in range(3):
+                await send({"type": "http.response.body", "body": f"data: {i}\n\n".encode(), "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "method": "GET", "headers": [(b"accept-encoding", b"gzip")]}
+        asyncio.run(CompressionMiddleware(app)(scope, None, send))
+
+        assert (b"content-encoding", b"gzip") in sent[0]["headers"]
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        events = [decoder.decompress(message["body"]) for message in sent[1:4]]
+        assert events == [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+        decoder.decompress(sent[4]["body"])
+        assert decoder.eof
@@ -0,0 +1,149 @@
+"""Tests for digest coalescing of reminder notifications."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import event, select
+from sqlmodel import Session
+
+from app.models import Notification, NotificationReminder, Reminder
+from app.notifications.digest import coalesce
+from app.workers.notifications import claim_notifications
+from app.workers.reminders import FiredReminder, claim_due_reminders
+
+NOW = datetime(2026, 3, 2, 9, 0, 0)
+
+
+def _add_reminders(engine, users, channels=("email",), at=NOW) -> list:
+    reminders = [
+        Reminder(
+            id=uuid4(),
+            task_id=uuid4(),
+            user_id=user_id,
+            scheduled_time=at - timedelta(seconds=1),
+            notification_channels={"channels": list(channels)},
+        )
+        for user_id in users
+    ]
+    ids = [reminder.id for reminder in reminders]
+    with Session(engine) as session:
+        session.add_all(reminders)
+        session.commit()
+    return ids
+
+
+def _fire(engine, now=NOW) -> None:
+    with Session(engine) as session:
+        claim_due_reminders(session, limit=100, now=now)
+        session.commit()
+
+
+def _digests(engine) -> list:
+    """(user_id, channel, linked reminder ids) per notification."""
+    with Session(engine) as session:
+        notifications = session.exec(select(Notification)).scalars().all()
+        linked = {}
+        for link in session.exec(select(NotificationReminder)).scalars():
+            linked.setdefault(link.notification_id, set()).add(link.reminder_id)
+        return [(n.user_id, n.channel.value, linked.get(n.id, set())) for n in notifications]
+
+
+class TestCoalesce:
+    """Test suite for coalesce."""
+
+    def test_merges_per_user_and_channel(self, worker_engine):
+        """Test reminders fired together share one notification per user and channel."""
+        alice, bob = uuid4(), uuid4()
+        alice_reminders = _add_reminders(worker_engine, [alice, alice, alice], channels=("email", "push"))
+        [bob_reminder] = _add_reminders(worker_engine, [bob])
+
+        _fire(worker_engine)
+
+        digests = sorted(_digests(worker_engine), key=lambda d: (str(d[0]), d[1]))
+        assert len(digests) == 3
+        assert {(d[0], d[1]) for d in digests} == {(alice, "email"), (alice, "push"), (bob, "email")}
+        for user_id, _, reminders in digests:
+            assert reminders == (set(alice_reminders) if user_id == alice else {bob_reminder})
+
+    def test_joins_open_digest(self, worker_engine):
+        """Test a reminder fired later joins the user's digest while it is unclaimed."""
+        user_id = uuid4()
+        first = _add_reminders(worker_engine, [user_id])
+        _fire(worker_engine)
+        later = _add_reminders(worker_engine, [user_id], at=NOW + timedelta(seconds=20))
+        _fire(worker_engine, now=NOW + timedelta(seconds=20))
+
+        [(_, _, reminders)] = _digests(worker_engine)
+        assert reminders == set(first + later)
+
+    def test_only_matching_channels_are_locked(self, worker_engine):
+        """Test the open-digest lookup is limited to the fired (user, channel) pairs in SQL."""
+        user_id = uuid4()
+        _add_reminders(worker_engine, [user_id], channels=("email", "push"))
+        _fire(worker_engine)
+
+        lookups = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if "notifications.attempt" in statement:
+                lookups.append(statement)
+
+        event.listen(worker_engine, "before_cursor_execute", capture)
+        try:
+            later = _add_reminders(worker_engine, [user_id], at=NOW + timedelta(seconds=20))
+            _fire(worker_engine, now=NOW + timedelta(seconds=20))
+        finally:
+            event.remove(worker_engine, "before_cursor_execute", capture)
+
+        [lookup] = lookups
+        assert "(notifications.user_id, notifications.channel) IN" in lookup
+        digests = {channel: reminders for _, channel, reminders in _digests(worker_engine)}
+        assert set(later) <= digests["email"]
+        assert not set(later) & digests["push"]
+
+    def test_claimed_digest_is_closed(self, worker_engine):
+        """Test a reminder never joins a notification a dispatcher already claimed."""
+        user_id = uuid4()
+        _add_reminders(worker_engine, [user_id])
+        _fire(worker_engine)
+        with Session(worker_engine) as session:
+            claim_notifications(session, "email", limit=10, now=NOW + timedelta(seconds=1))
+            session.commit()
+
+        _add_reminders(worker_engine, [user_id], at=NOW + timedelta(seconds=5))
+        _fire(worker_engine, now=NOW + timedelta(seconds=5))
+
+        assert len(_digests(worker_engine)) == 2
+
+    def test_window_expires(self, worker_engine):
+        """Test an unclaimed notification older than the window takes no new reminders."""
+        user_id = uuid4()
+        _add_reminders(worker_engine, [user_id])
+        _fire(worker_engine)
+        _add_reminders(worker_engine, [user_id], at=NOW + timedelta(minutes=5))
+        _fire(worker_engine, now=NOW + timedelta(minutes=5))
+
+        assert len(_digests(worker_engine)) == 2
+
+    def test_zero_window_disables_coalescing(self, worker_engine):
+        """Test window=0 queues one notification per reminder and channel."""
+        user_id = uuid4()
+        fired = [FiredReminder(uuid4(), uuid4(), user_id, NOW, ("email",)) for _ in range(3)]
+
+        with Session(worker_engine) as session:
+            assert coalesce(session, fired, NOW, window=0) == 3
+            session.commit()
+
+        assert sorted(len(reminders) for _, _, reminders in _digests(worker_engine)) == [1, 1, 1]
+
+    def test_dispatcher_receives_every_reminder(self, worker_engine):
+        """Test the claimed message of a digest carries all of its reminders."""
+        user_id = uuid4()
+        reminders = _add_reminders(worker_engine, [user_id, user_id])
+        _fire(worker_engine)
+
+        with Session(worker_engine) as session:
+            [message] = claim_notifications(session, "email", limit=10, now=NOW)
+
+        assert set(message.reminder_ids) == set(reminders)
+        assert message.reminder_id in message.reminder_ids
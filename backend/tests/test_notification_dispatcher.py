@@ -0,0 +1,153 @@
+"""Tests for the notification dispatcher."""
+
+import asyncio
+import random
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlmodel import Session
+
+from app.models import Notification, NotificationChannelEnum, NotificationStatusEnum
+from app.notifications import DeliveryError
+from app.notifications.channels import FakeChannel, FakeEmail, FakePush, FakeSms
+from app.workers.notifications import NotificationDispatcher, backoff_delay, claim_notifications
+
+NOW = datetime(2026, 3, 2, 9, 0, 0)
+
+
+def _add_notifications(engine, count, channel="email", **fields) -> list:
+    rows = [
+        Notification(
+            id=uuid4(),
+            reminder_id=uuid4(),
+            user_id=uuid4(),
+            channel=NotificationChannelEnum(channel),
+            created_at=fields.get("next_attempt_at", NOW - timedelta(seconds=5)),
+            next_attempt_at=fields.get("next_attempt_at", NOW - timedelta(seconds=5)),
+            attempt=fields.get("attempt", 0),
+        )
+        for _ in range(count)
+    ]
+    ids = [row.id for row in rows]
+    with Session(engine) as session:
+        session.add_all(rows)
+        session.commit()
+    return ids
+
+
+def _notifications(engine) -> dict:
+    with Session(engine) as session:
+        rows = session.exec(select(Notification)).scalars().all()
+        session.expunge_all()
+    return {row.id: row for row in rows}
+
+
+class FailingChannel(FakeChannel):
+    """Fake channel whose every send fails."""
+
+    def __init__(self, retryable=True):
+        super().__init__("email", latency=0)
+        self.retryable = retryable
+
+    async def send(self, message):
+        raise DeliveryError("mailbox unavailable", retryable=self.retryable)
+
+
+class TestClaimNotifications:
+    """Test suite for claim_notifications."""
+
+    def test_leases_due_rows_of_one_channel(self, worker_engine):
+        """Test only due rows of the channel are claimed, and not twice within the lease."""
+        due = _add_notifications(worker_engine, 2)
+        _add_notifications(worker_engine, 1, next_attempt_at=NOW + timedelta(minutes=5))
+        _add_notifications(worker_engine, 1, channel="sms")
+
+        with Session(worker_engine) as session:
+            messages = claim_notifications(session, "email", limit=10, now=NOW, lease_seconds=60)
+            session.commit()
+        assert {m.notification_id for m in messages} == set(due)
+        assert all(m.attempt == 1 for m in messages)
+
+        with Session(worker_engine) as session:
+            assert claim_notifications(session, "email", limit=10, now=NOW + timedelta(seconds=30)) == []
+            # The lease expired: a crashed dispatcher's rows come back
+            assert len(claim_notifications(session, "email", limit=10, now=NOW + timedelta(seconds=61))) == 2
+
+
+class TestNotificationDispatcher:
+    """Test suite for NotificationDispatcher."""
+
+    async def test_sends_every_channel(self, worker_engine):
+        """Test pending notifications are delivered and marked sent."""
+        ids = _add_notifications(worker_engine, 3) + _add_notifications(worker_engine, 2, channel="push")
+        backends = {"email": FakeEmail(latency=0), "push": FakePush(latency=0), "sms": FakeSms(latency=0)}
+        dispatcher = NotificationDispatcher(bind=worker_engine, backends=backends)
+
+        for channel in backends:
+            await dispatcher.dispatch(channel)
+
+        rows = _notifications(worker_engine)
+        assert all(rows[i].status == NotificationStatusEnum.sent and rows[i].attempt == 1 for i in ids)
+        assert len(backends["email"].sent) == 3 and len(backends["push"].sent) == 2
+
+    async def test_retries_with_backoff(self, worker_engine):
+        """Test a failed send stays pending with an error and a later next_attempt_at."""
+        [notification_id] = _add_notifications(worker_engine, 1)
+        dispatcher = NotificationDispatcher(bind=worker_engine, backends={"email": FailingChannel()})
+
+        before = datetime.utcnow()
+        await dispatcher.dispatch("email")
+
+        row = _notifications(worker_engine)[notification_id]
+        assert row.status == NotificationStatusEnum.pending
+        assert row.attempt == 1
+        assert row.last_error == "mailbox unavailable"
+        assert row.next_attempt_at > before
+
+    async def test_dead_letters(self, worker_engine):
+        """Test permanent failures and exhausted retries end as failed."""
+        [permanent] = _add_notifications(worker_engine, 1)
+        dispatcher = NotificationDispatcher(bind=worker_engine, backends={"email": FailingChannel(retryable=False)})
+        await dispatcher.dispatch("email")
+
+        [exhausted] = _add_notifications(worker_engine, 1, attempt=4)
+        dispatcher = NotificationDispatcher(bind=worker_engine, backends={"email": FailingChannel()})
+        await dispatcher.dispatch("email")
+
+        rows = _notifications(worker_engine)
+        assert rows[permanent].status == NotificationStatusEnum.failed
+        assert rows[exhausted].status == NotificationStatusEnum.failed
+        assert rows[exhausted].attempt == 5
+
+    async def test_channel_concurrency_limit(self, worker_engine):
+        """Test sends run concurrently, up to the channel's limit."""
+        _add_notifications(worker_engine, 12)
+
+        class CountingChannel(FakeChannel):
+            in_flight = peak = 0
+
+            async def send(self, message):
+                CountingChannel.in_flight += 1
+                CountingChannel.peak = max(CountingChannel.peak, CountingChannel.in_flight)
+                await asyncio.sleep(0.01)
+                CountingChannel.in_flight -= 1
+
+        dispatcher = NotificationDispatcher(
+            bind=worker_engine, backends={"email": CountingChannel("email")}, concurrency={"email": 3}
+        )
+        attempted, full = await dispatcher.dispatch("email")
+
+        assert attempted == 12 and full
+        assert CountingChannel.peak == 3
+
+
+class TestBackoff:
+    """Test suite for backoff_delay."""
+
+    def test_doubles_and_caps(self):
+        """Test the delay doubles per attempt within the jitter range and stops at the cap."""
+        rng = random.Random(0)
+        for attempt, full in [(1, 30), (2, 60), (3, 120), (10, 3600)]:
+            delay = backoff_delay(attempt, base=30, maximum=3600, rng=rng)
+            assert full * 0.5 <= delay <= full
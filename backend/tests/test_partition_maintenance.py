@@ -0,0 +1,49 @@
+"""Tests for events partition planning."""
+
+from datetime import date
+
+from app.workers.partition_maintenance import add_months, partition_month, partition_name, plan_partitions
+
+
+class TestPartitionNames:
+    """Test suite for partition naming helpers."""
+
+    def test_round_trip(self):
+        """Test names encode the month and parse back; other tables are ignored."""
+        assert partition_name(date(2026, 3, 1)) == "events_2026_03"
+        assert partition_month("events_2026_03") == date(2026, 3, 1)
+        assert partition_month("events_default") is None
+        assert partition_month("events_2026_03_old") is None
+
+    def test_add_months_crosses_years(self):
+        """Test month arithmetic across year boundaries in both directions."""
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -13) == date(2024, 12, 1)
+
+
+class TestPlanPartitions:
+    """Test suite for plan_partitions."""
+
+    def test_creates_missing_months_ahead(self):
+        """Test the current month and the months ahead are created when missing."""
+        plan = plan_partitions(["events_2026_10", "events_default"], date(2026, 10, 19), ahead=3, retention_months=0)
+
+        assert plan.create == [date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)]
+        assert plan.retire == []
+
+    def test_retires_months_past_retention(self):
+        """Test only months older than the retention window are retired, oldest first."""
+        existing = [partition_name(add_months(date(2026, 10, 1), -i)) for i in range(16)] + ["events_default"]
+
+        plan = plan_partitions(existing, date(2026, 10, 19), ahead=0, retention_months=12)
+
+        assert plan.create == []
+        assert plan.retire == ["events_2025_07", "events_2025_08", "events_2025_09"]
+
+    def test_nothing_to_do(self):
+        """Test a complete partition set needs no changes."""
+        existing = ["events_2026_09", "events_2026_10", "events_2026_11", "events_default"]
+
+        plan = plan_partitions(existing, date(2026, 10, 1), ahead=1, retention_months=1)
+
+        assert plan.create == [] and plan.retire == []
@@ -0,0 +1,78 @@
+"""Tests for SQL query instrumentation."""
+
+import logging
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import query_stats
+from app.query_stats import instrument_engine, statement_operation, track_queries
+
+
+@pytest.fixture(name="engine")
+def engine_fixture(session):
+    """The conftest SQLite engine with the query hooks attached."""
+    return instrument_engine(session.get_bind())
+
+
+def _run(engine, *statements) -> None:
+    with engine.connect() as connection:
+        for statement in statements:
+            connection.execute(text(statement))
+
+
+class TestStatementOperation:
+    """Test suite for the db_query_duration_seconds operation label."""
+
+    def test_first_keyword(self):
+        """Test CTEs and leading whitespace are labelled by their first keyword."""
+        assert statement_operation("  select 1") == "SELECT"
+        assert statement_operation("WITH moved AS (DELETE FROM t RETURNING *) INSERT INTO u SELECT * FROM moved") == "WITH"
+        assert statement_operation("WITH due AS (SELECT id FROM reminders FOR UPDATE SKIP LOCKED) UPDATE r") == "WITH"
+        assert statement_operation("CREATE TABLE t (id INTEGER)") == "OTHER"
+        assert statement_operation("") == "OTHER"
+
+
+class TestTrackQueries:
+    """Test suite for per-request query stats."""
+
+    def test_counts_statements_in_block(self, engine):
+        """Test only statements run inside track_queries are counted."""
+        _run(engine, "SELECT 1")
+        with track_queries() as stats:
+            _run(engine, "SELECT 1", "SELECT 2", "SELECT 3")
+
+        assert stats.count == 3
+        assert stats.total_time > 0
+        assert stats.server_timing().endswith('desc="3 queries"')
+
+    def test_slow_statement_is_logged(self, engine, monkeypatch, caplog):
+        """Test statements over SQL_SLOW_QUERY_MS are logged as warnings."""
+        monkeypatch.setattr(query_stats, "SQL_SLOW_QUERY_MS", 0)
+        with caplog.at_level(logging.WARNING, logger="app.query_stats"):
+            _run(engine, "SELECT 42")
+
+        assert any(record.getMessage().startswith("Slow SQL") and "SELECT 42" in record.getMessage()
+                   for record in caplog.records)
+
+    def test_repeated_statement_is_logged_once(self, engine, monkeypatch, caplog):
+        """Test a statement repeated SQL_REPEAT_THRESHOLD times is flagged once as N+1."""
+        monkeypatch.setattr(query_stats, "SQL_REPEAT_THRESHOLD", 3)
+        with caplog.at_level(logging.WARNING, logger="app.query_stats"), track_queries():
+            _run(engine, *["SELECT 7"] * 5, "SELECT 8")
+
+        warnings = [record.getMessage() for record in caplog.records if "Possible N+1" in record.getMessage()]
+        assert len(warnings) == 1
+        assert "SELECT 7" in warnings[0]
+
+    def test_failed_statement_does_not_skew_timing(self, engine):
+        """Test a failing statement's start time is dropped, not paired with the next statement."""
+        with track_queries() as stats, engine.connect() as connection:
+            with pytest.raises(OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+            assert connection.info["query_started"] == []
+            connection.execute(text("SELECT 1"))
+            assert connection.info["query_started"] == []
+
+        assert stats.count == 1
@@ -0,0 +1,215 @@
+"""Tests for the vectorized recurrence engine."""
+
+import calendar
+import random
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+from zoneinfo import ZoneInfo
+
+from app.models import FrequencyEnum, RecurrencePattern
+from app.recurrence import PatternBatch, expand_window, next_occurrences
+
+
+def _pattern(frequency, created_at, **fields) -> RecurrencePattern:
+    return RecurrencePattern(
+        id=uuid4(),
+        user_id=uuid4(),
+        task_template=fields.pop("task_template", {"title": "Recurring"}),
+        frequency=frequency,
+        created_at=created_at,
+        **fields,
+    )
+
+
+def _window(pattern, start, end) -> list[datetime]:
+    return expand_window(PatternBatch.from_rows([pattern]), start, end).for_pattern(0)
+
+
+def _reference(pattern, start, end) -> list[datetime]:
+    """Day-by-day expansion of one pattern, the slow way."""
+    zone = ZoneInfo(pattern.timezone)
+    local = pattern.created_at.replace(tzinfo=timezone.utc).astimezone(zone)
+    anchor, time_of_day = local.date(), local.time().replace(tzinfo=None)
+    mask = set(pattern.days_of_week or ())
+    interval = pattern.interval
+    dom = pattern.day_of_month or anchor.day
+
+    def clamped(year, month):
+        return date(year, month, min(dom, calendar.monthrange(year, month)[1]))
+
+    def matches(day):
+        months = (day.year - anchor.year) * 12 + day.month - anchor.month
+        if pattern.frequency == FrequencyEnum.daily:
+            return (day - anchor).days % interval == 0
+        if pattern.frequency == FrequencyEnum.custom:
+            return (day - anchor).days % interval == 0 and (not mask or day.weekday() in mask)
+        if pattern.frequency == FrequencyEnum.weekly:
+            weeks = ((day - timedelta(days=day.weekday())) - (anchor - timedelta(days=anchor.weekday()))).days // 7
+            return day.weekday() in (mask or {anchor.weekday()}) and weeks % interval == 0
+        step = interval * (12 if pattern.frequency == FrequencyEnum.yearly else 1)
+        return months % step == 0 and day == clamped(day.year, day.month)
+
+    found, ordinal, day = [], 0, anchor
+    while day <= end.date() + timedelta(days=1):
+        if matches(day):
+            if pattern.max_occurrences is not None and ordinal >= pattern.max_occurrences:
+                break
+            at = datetime.combine(day, time_of_day, zone).astimezone(timezone.utc).replace(tzinfo=None)
+            if pattern.end_date is not None and at > pattern.end_date:
+                break
+            if start <= at < end:
+                found.append(at)
+            ordinal += 1
+        day += timedelta(days=1)
+    return found
+
+
+class TestCalendarRules:
+    """Test frequency rules and limits."""
+
+    def test_daily_interval(self):
+        """Test every-other-day expansion from the anchor."""
+        pattern = _pattern(FrequencyEnum.daily, datetime(2026, 1, 1, 9, 0), interval=2)
+        assert _window(pattern, datetime(2026, 1, 4), datetime(2026, 1, 10)) == [
+            datetime(2026, 1, 5, 9, 0),
+            datetime(2026, 1, 7, 9, 0),
+            datetime(2026, 1, 9, 9, 0),
+        ]
+
+    def test_weekly_days_and_max_occurrences(self):
+        """Test Mon/Wed/Fri starting on a Wednesday, capped at 4."""
+        pattern = _pattern(
+            FrequencyEnum.weekly, datetime(2026, 1, 7, 8, 0), days_of_week=[0, 2, 4], max_occurrences=4
+        )
+        assert _window(pattern, datetime(2026, 1, 1), datetime(2026, 2, 1)) == [
+            datetime(2026, 1, 7, 8, 0),
+            datetime(2026, 1, 9, 8, 0),
+            datetime(2026, 1, 12, 8, 0),
+            datetime(2026, 1, 14, 8, 0),
+        ]
+
+    def test_monthly_day_31_clamps_to_month_end(self):
+        """Test day_of_month=31 in short months."""
+        pattern = _pattern(FrequencyEnum.monthly, datetime(2026, 1, 10, 12, 0), day_of_month=31)
+        assert [at.date() for at in _window(pattern, datetime(2026, 1, 1), datetime(2026, 5, 1))] == [
+            date(2026, 1, 31),
+            date(2026, 2, 28),
+            date(2026, 3, 31),
+            date(2026, 4, 30),
+        ]
+
+    def test_monthly_day_before_anchor_starts_next_month(self):
+        """Test the first occurrence is never before created_at."""
+        pattern = _pattern(FrequencyEnum.monthly, datetime(2026, 1, 20, 12, 0), day_of_month=5)
+        occurrences = expand_window(PatternBatch.from_rows([pattern]), datetime(2026, 1, 1), datetime(2026, 4, 1))
+        assert [at.date() for at in occurrences.for_pattern(0)] == [date(2026, 2, 5), date(2026, 3, 5)]
+        assert occurrences.ordinal.tolist() == [0, 1]
+
+    def test_yearly_leap_day(self):
+        """Test Feb 29 falls on Feb 28 in common years."""
+        pattern = _pattern(FrequencyEnum.yearly, datetime(2024, 2, 29, 7, 0))
+        assert [at.date() for at in _window(pattern, datetime(2024, 1, 1), datetime(2029, 1, 1))] == [
+            date(2024, 2, 29),
+            date(2025, 2, 28),
+            date(2026, 2, 28),
+            date(2027, 2, 28),
+            date(2028, 2, 29),
+        ]
+
+    def test_end_date_is_inclusive(self):
+        """Test end_date bounds the series."""
+        pattern = _pattern(FrequencyEnum.daily, datetime(2026, 1, 1, 9, 0), end_date=datetime(2026, 1, 3, 9, 0))
+        assert len(_window(pattern, datetime(2026, 1, 1), datetime(2026, 2, 1))) == 3
+
+    def test_due_time_from_template(self):
+        """Test task_template due_time overrides created_at's time of day."""
+        pattern = _pattern(FrequencyEnum.daily, datetime(2026, 1, 1, 15, 42), task_template={"due_time": "18:30"})
+        assert _window(pattern, datetime(2026, 1, 2), datetime(2026, 1, 3)) == [datetime(2026, 1, 2, 18, 30)]
+
+
+class TestTimezones:
+    """Test local wall-clock times across DST transitions (America/New_York)."""
+
+    def test_wall_clock_kept_across_spring_forward(self):
+        """Test 09:00 local moves from 14:00 to 13:00 UTC on 2026-03-08."""
+        pattern = _pattern(FrequencyEnum.daily, datetime(2026, 3, 1, 14, 0), timezone="America/New_York")
+        assert _window(pattern, datetime(2026, 3, 7), datetime(2026, 3, 10)) == [
+            datetime(2026, 3, 7, 14, 0),
+            datetime(2026, 3, 8, 13, 0),
+            datetime(2026, 3, 9, 13, 0),
+        ]
+
+    def test_time_in_gap_moves_forward(self):
+        """Test 02:30 on the spring-forward day fires at 03:30 EDT."""
+        pattern = _pattern(
+            FrequencyEnum.daily,
+            datetime(2026, 3, 1, 12, 0),
+            timezone="America/New_York",
+            task_template={"due_time": "02:30"},
+        )
+        assert _window(pattern, datetime(2026, 3, 8), datetime(2026, 3, 9)) == [datetime(2026, 3, 8, 7, 30)]
+
+    def test_ambiguous_time_uses_first_instance(self):
+        """Test 01:30 on the fall-back day resolves to 01:30 EDT."""
+        pattern = _pattern(
+            FrequencyEnum.daily,
+            datetime(2026, 10, 1, 12, 0),
+            timezone="America/New_York",
+            task_template={"due_time": "01:30"},
+        )
+        assert _window(pattern, datetime(2026, 11, 1), datetime(2026, 11, 2)) == [datetime(2026, 11, 1, 5, 30)]
+
+    def test_anchor_date_is_local(self):
+        """Test a UTC evening created_at anchors on the next local day in Tokyo."""
+        pattern = _pattern(FrequencyEnum.weekly, datetime(2026, 1, 4, 23, 0), timezone="Asia/Tokyo")
+        # 2026-01-05 08:00 JST is a Monday
+        assert _window(pattern, datetime(2026, 1, 1), datetime(2026, 1, 20)) == [
+            datetime(2026, 1, 4, 23, 0),
+            datetime(2026, 1, 11, 23, 0),
+            datetime(2026, 1, 18, 23, 0),
+        ]
+
+
+class TestBatchExpansion:
+    """Test many patterns at once against a per-pattern reference."""
+
+    def test_matches_reference(self):
+        """Test random patterns expand like the day-by-day reference."""
+        rng = random.Random(44)
+        zones = ["UTC", "America/New_York", "Europe/London", "Asia/Kolkata", "Australia/Lord_Howe"]
+        patterns = []
+        for _ in range(300):
+            frequency = rng.choice(list(FrequencyEnum))
+            created_at = datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(0, 500 * 24 * 60, 15))
+            patterns.append(_pattern(
+                frequency,
+                created_at,
+                interval=rng.choice([1, 1, 2, 3]),
+                days_of_week=rng.sample(range(7), rng.randint(1, 3)) if rng.random() < 0.6 else None,
+                day_of_month=rng.choice([None, 1, 15, 29, 30, 31]),
+                end_date=created_at + timedelta(days=rng.randint(30, 400)) if rng.random() < 0.3 else None,
+                max_occurrences=rng.randint(1, 40) if rng.random() < 0.3 else None,
+                timezone=rng.choice(zones),
+            ))
+
+        start, end = datetime(2026, 1, 1), datetime(2026, 7, 1)
+        occurrences = expand_window(PatternBatch.from_rows(patterns), start, end)
+        for index, pattern in enumerate(patterns):
+            assert occurrences.for_pattern(index) == _reference(pattern, start, end), pattern
+
+    def test_next_occurrences(self):
+        """Test the next n occurrences after a point in time."""
+        patterns = [
+            _pattern(FrequencyEnum.daily, datetime(2026, 1, 1, 9, 0)),
+            _pattern(FrequencyEnum.monthly, datetime(2026, 1, 31, 9, 0)),
+            _pattern(FrequencyEnum.daily, datetime(2026, 1, 1, 9, 0), max_occurrences=2),
+        ]
+        occurrences = next_occurrences(PatternBatch.from_rows(patterns), datetime(2026, 2, 10, 9, 0), 3)
+        assert occurrences.for_pattern(0) == [datetime(2026, 2, day, 9, 0) for day in (11, 12, 13)]
+        assert occurrences.for_pattern(1) == [
+            datetime(2026, 2, 28, 9, 0),
+            datetime(2026, 3, 31, 9, 0),
+            datetime(2026, 4, 30, 9, 0),
+        ]
+        assert occurrences.ordinal[occurrences.pattern_index == 1].tolist() == [1, 2, 3]
+        assert occurrences.for_pattern(2) == []
@@ -0,0 +1,160 @@
+"""Tests for the recurring task generator."""
+
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+
+from sqlalchemy import func, select, update
+from sqlmodel import Session
+
+from app.models import FrequencyEnum, RecurrencePattern, Task, User, legacy_uuid
+from app.workers.recurrence import SERIES_ENDED, RecurrenceGenerator, shard_bounds
+
+NOW = datetime(2026, 3, 2, 12, 0, 0)
+
+
+def _owner(session) -> UUID:
+    user = User(email=f"{uuid4()}@example.com", hashed_password="x")
+    session.add(user)
+    session.flush()
+    return legacy_uuid(user.id)
+
+
+def _pattern(session, frequency, created_at, user_id=None, pattern_id=None, **fields) -> UUID:
+    pattern = RecurrencePattern(
+        id=pattern_id or uuid4(),
+        user_id=user_id or _owner(session),
+        task_template={"title": "Water plants", "priority": "high"},
+        frequency=frequency,
+        created_at=created_at,
+        updated_at=created_at,
+        **fields,
+    )
+    session.add(pattern)
+    return pattern.id
+
+
+def _tasks(session, pattern_id=None) -> list[Task]:
+    statement = select(Task).order_by(Task.due_date)
+    if pattern_id is not None:
+        statement = statement.where(Task.recurrence_pattern_id == pattern_id)
+    return session.exec(statement).scalars().all()
+
+
+def _generator(engine, **kwargs) -> RecurrenceGenerator:
+    return RecurrenceGenerator(bind=engine, horizon_days=7, pause=0, **kwargs)
+
+
+class TestRecurrenceGenerator:
+    """Test suite for RecurrenceGenerator."""
+
+    def test_generates_through_horizon(self, generator_engine):
+        """Test instances up to now + horizon and the advanced last_generated_at."""
+        with Session(generator_engine) as session:
+            daily = _pattern(session, FrequencyEnum.daily, datetime(2026, 3, 1, 9, 0))
+            session.commit()
+
+        totals = _generator(generator_engine).run(now=NOW)
+
+        with Session(generator_engine) as session:
+            tasks = _tasks(session)
+            assert [task.due_date for task in tasks] == [datetime(2026, 3, day, 9, 0) for day in range(1, 10)]
+            assert all(task.title == "Water plants" and task.is_recurring for task in tasks)
+            assert {legacy_uuid(task.user_id) for task in tasks} == {session.get(RecurrencePattern, daily).user_id}
+            assert len({task.recurrence_instance_id for task in tasks}) == 9
+            # Generated through just before the next occurrence (Mar 10 09:00)
+            assert session.get(RecurrencePattern, daily).last_generated_at == datetime(2026, 3, 10, 8, 59, 59)
+        assert totals == {"patterns": 1, "instances": 9}
+
+    def test_rerun_does_not_duplicate(self, generator_engine):
+        """Test reruns, including after losing last_generated_at, insert nothing new."""
+        with Session(generator_engine) as session:
+            _pattern(session, FrequencyEnum.daily, datetime(2026, 3, 1, 9, 0))
+            session.commit()
+
+        generator = _generator(generator_engine)
+        assert generator.run(now=NOW)["instances"] == 9
+        assert generator.run(now=NOW) == {"patterns": 0, "instances": 0}
+
+        with Session(generator_engine) as session:
+            session.execute(update(RecurrencePattern.__table__).values(last_generated_at=None))
+            session.commit()
+        assert generator.run(now=NOW) == {"patterns": 1, "instances": 0}
+
+        with Session(generator_engine) as session:
+            assert len(_tasks(session)) == 9
+
+    def test_only_touches_patterns_with_new_instances(self, generator_engine):
+        """Test a later run selects patterns whose next occurrence entered the horizon."""
+        with Session(generator_engine) as session:
+            daily = _pattern(session, FrequencyEnum.daily, datetime(2026, 3, 1, 9, 0))
+            yearly = _pattern(session, FrequencyEnum.yearly, datetime(2026, 3, 1, 9, 0))
+            session.commit()
+
+        generator = _generator(generator_engine)
+        assert generator.run(now=NOW) == {"patterns": 2, "instances": 10}
+        assert generator.run(now=NOW + timedelta(days=1)) == {"patterns": 1, "instances": 1}
+
+        with Session(generator_engine) as session:
+            assert len(_tasks(session, daily)) == 10
+            assert session.get(RecurrencePattern, yearly).last_generated_at == datetime(2027, 3, 1, 8, 59, 59)
+
+    def test_ended_series(self, generator_engine):
+        """Test max_occurrences caps instances and parks the pattern."""
+        with Session(generator_engine) as session:
+            pattern = _pattern(session, FrequencyEnum.daily, datetime(2026, 3, 1, 9, 0), max_occurrences=3)
+            session.commit()
+
+        _generator(generator_engine).run(now=NOW)
+
+        with Session(generator_engine) as session:
+            assert len(_tasks(session)) == 3
+            assert session.get(RecurrencePattern, pattern).last_generated_at == SERIES_ENDED
+
+    def test_pages_through_batches(self, generator_engine):
+        """Test every pattern is processed when there are more than one batch."""
+        with Session(generator_engine) as session:
+            for _ in range(5):
+                _pattern(session, FrequencyEnum.weekly, datetime(2026, 3, 2, 9, 0))
+            session.commit()
+
+        assert _generator(generator_engine, batch_size=2).run(now=NOW) == {"patterns": 5, "instances": 10}
+
+    def test_skips_patterns_without_a_user(self, generator_engine):
+        """Test a pattern whose owner is not a user gets no tasks and stays behind."""
+        with Session(generator_engine) as session:
+            orphan = _pattern(session, FrequencyEnum.daily, datetime(2026, 3, 1, 9, 0), user_id=legacy_uuid(999))
+            _pattern(session, FrequencyEnum.daily, datetime(2026, 3, 1, 9, 0))
+            session.commit()
+
+        assert _generator(generator_engine).run(now=NOW) == {"patterns": 2, "instances": 9}
+        with Session(generator_engine) as session:
+            assert _tasks(session, orphan) == []
+            assert session.get(RecurrencePattern, orphan).last_generated_at is None
+
+
+class TestSharding:
+    """Test pattern-range sharding."""
+
+    def test_bounds_cover_uuid_space(self):
+        """Test shard ranges are contiguous and cover every pattern id."""
+        bounds = [shard_bounds(shard, 3) for shard in range(3)]
+        assert bounds[0][0] == UUID(int=0)
+        assert bounds[0][1] == bounds[1][0] and bounds[1][1] == bounds[2][0]
+        assert bounds[2][1] is None
+
+    def test_shards_split_patterns_by_id(self, generator_engine):
+        """Test each shard only generates for its own patterns."""
+        low_id, high_id = UUID("0fffffff-0000-4000-8000-000000000000"), UUID("ffffffff-0000-4000-8000-000000000000")
+        with Session(generator_engine) as session:
+            low = _pattern(session, FrequencyEnum.weekly, datetime(2026, 3, 2, 9, 0), pattern_id=low_id)
+            high = _pattern(session, FrequencyEnum.weekly, datetime(2026, 3, 2, 9, 0), pattern_id=high_id)
+            session.commit()
+
+        assert _generator(generator_engine, shard=(3, 4)).run(now=NOW)["patterns"] == 1
+        with Session(generator_engine) as session:
+            assert len(_tasks(session, high)) == 2
+            assert _tasks(session, low) == []
+
+        assert _generator(generator_engine).run(now=NOW)["patterns"] == 1
+        with Session(generator_engine) as session:
+            assert session.exec(select(func.count()).select_from(Task)).scalar_one() == 4
@@ -0,0 +1,184 @@
+"""Tests for the hybrid reminder scheduler."""
+
+import asyncio
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.models import Reminder, ReminderStatusEnum, legacy_uuid
+from app.workers.scheduler import ReminderHeap, ReminderScheduler, create_app
+
+NOW = datetime(2026, 3, 2, 9, 0, 0)
+
+
+def _add_reminder(engine, offset_seconds: float, task_id=None) -> Reminder:
+    reminder = Reminder(
+        id=uuid4(),
+        task_id=task_id or uuid4(),
+        user_id=uuid4(),
+        scheduled_time=NOW + timedelta(seconds=offset_seconds),
+        notification_channels={"channels": ["email"]},
+    )
+    with Session(engine) as session:
+        session.add(reminder)
+        session.commit()
+        session.refresh(reminder)
+        session.expunge(reminder)
+    return reminder
+
+
+class TestReminderHeap:
+    """Test suite for ReminderHeap."""
+
+    def test_pops_in_time_order(self):
+        """Test that due entries come out earliest first and later ones stay."""
+        heap = ReminderHeap()
+        a, b, c = uuid4(), uuid4(), uuid4()
+        heap.schedule(a, NOW + timedelta(seconds=2))
+        heap.schedule(b, NOW + timedelta(seconds=1))
+        heap.schedule(c, NOW + timedelta(seconds=10))
+
+        assert heap.next_due() == NOW + timedelta(seconds=1)
+        assert heap.pop_due(NOW + timedelta(seconds=5)) == [b, a]
+        assert len(heap) == 1
+
+    def test_move_and_cancel_are_lazy(self):
+        """Test that moved and cancelled entries are skipped when popped."""
+        heap = ReminderHeap()
+        moved, cancelled = uuid4(), uuid4()
+        heap.schedule(moved, NOW)
+        heap.schedule(cancelled, NOW)
+        heap.schedule(moved, NOW + timedelta(minutes=1))
+        heap.cancel(cancelled)
+
+        assert heap.pop_due(NOW) == []
+        assert heap.next_due() == NOW + timedelta(minutes=1)
+        assert heap.pop_due(NOW + timedelta(minutes=1)) == [moved]
+
+
+class TestReminderScheduler:
+    """Test suite for ReminderScheduler."""
+
+    def test_preload_window_and_fire(self, worker_engine):
+        """Test that only reminders inside the horizon are preloaded and fired."""
+        soon = _add_reminder(worker_engine, 30)
+        _add_reminder(worker_engine, 3600)
+        scheduler = ReminderScheduler(bind=worker_engine, horizon=timedelta(minutes=5))
+
+        assert scheduler.preload(now=NOW) == 1
+        assert scheduler.fire_due(now=NOW) == 0
+        assert scheduler.fire_due(now=NOW + timedelta(seconds=30)) == 1
+
+        with Session(worker_engine) as session:
+            assert session.get(Reminder, soon.id).status == ReminderStatusEnum.fired
+
+    def test_cancelled_in_database_is_not_fired(self, worker_engine):
+        """Test that the claim, not the heap, decides whether a reminder fires."""
+        reminder = _add_reminder(worker_engine, 1)
+        scheduler = ReminderScheduler(bind=worker_engine)
+        scheduler.preload(now=NOW)
+
+        with Session(worker_engine) as session:
+            session.get(Reminder, reminder.id).status = ReminderStatusEnum.cancelled
+            session.commit()
+
+        assert scheduler.fire_due(now=NOW + timedelta(seconds=1)) == 0
+
+    def test_events_update_the_heap(self, worker_engine):
+        """Test scheduled/cancelled events inside and beyond the preload window."""
+        scheduler = ReminderScheduler(bind=worker_engine, horizon=timedelta(minutes=5))
+        scheduler.preload(now=NOW)
+        task_id = uuid4()
+
+        scheduler.handle_event("reminder.scheduled", {"task_id": str(task_id), "scheduled_time": "2026-03-02T09:01:00Z"})
+        assert scheduler.heap.next_due() == NOW + timedelta(minutes=1)
+
+        scheduler.handle_event("reminder.cancelled", {"task_id": str(task_id)})
+        assert len(scheduler.heap) == 0
+
+        scheduler.handle_event("reminder.scheduled", {"task_id": str(task_id), "scheduled_time": "2026-03-02T12:00:00"})
+        assert len(scheduler.heap) == 0
+
+        # Task ids that are neither integers nor UUIDs are left to the preload and sweep
+        scheduler.handle_event("reminder.scheduled", {"task_id": "task-42", "scheduled_time": "2026-03-02T09:01:00"})
+        assert len(scheduler.heap) == 0
+
+    def test_events_from_the_tasks_api(self, worker_engine):
+        """Test the integer task ids app/routers/tasks.py publishes reach the task's reminder."""
+        scheduler = ReminderScheduler(bind=worker_engine, horizon=timedelta(minutes=5))
+        scheduler.preload(now=NOW)
+        reminder = _add_reminder(worker_engine, 60, task_id=legacy_uuid(42))
+        data = {
+            "task_id": 42,
+            "user_id": 7,
+            "scheduled_time": "2026-03-02T09:01:00",
+            "notification_channels": ["email"],
+        }
+
+        scheduler.handle_event("com.todo.reminder.scheduled", data)
+        assert scheduler.heap.next_due() == NOW + timedelta(minutes=1)
+        assert scheduler.fire_due(now=NOW + timedelta(minutes=1)) == 1
+        with Session(worker_engine) as session:
+            assert session.get(Reminder, reminder.id).status == ReminderStatusEnum.fired
+
+        scheduler.handle_event("com.todo.reminder.scheduled", {**data, "scheduled_time": "2026-03-02T09:02:00"})
+        scheduler.handle_event("com.todo.reminder.cancelled", {"task_id": 42, "user_id": 7})
+        assert len(scheduler.heap) == 0
+
+    async def test_failed_preload_backs_off(self, worker_engine, monkeypatch):
+        """Test a failing database is retried after a delay, not on every loop pass."""
+        scheduler = ReminderScheduler(bind=worker_engine)
+        calls = []
+
+        def load_window(now=None):
+            calls.append(1)
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(scheduler, "load_window", load_window)
+        stop = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.3, stop.set)
+        await scheduler.run(stop)
+
+        assert len(calls) == 1
+
+    async def test_failed_claim_goes_back_into_the_heap(self, worker_engine, monkeypatch):
+        """Test reminders whose claim raised are retried from the heap after the backoff."""
+        scheduler = ReminderScheduler(bind=worker_engine)
+        task_id = uuid4()
+        calls = []
+
+        def claim(task_ids, now):
+            calls.append(task_ids)
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(scheduler, "load_window", lambda now=None: ([(task_id, datetime.utcnow())], datetime.max))
+        monkeypatch.setattr(scheduler, "claim", claim)
+        stop = asyncio.Event()
+        asyncio.get_running_loop().call_later(0.3, stop.set)
+        await scheduler.run(stop)
+
+        assert calls == [[task_id]]
+        assert len(scheduler.heap) == 1
+        assert scheduler.heap.next_due() > datetime.utcnow()
+
+    def test_dapr_endpoints(self, worker_engine):
+        """Test the subscription list and event delivery route."""
+        scheduler = ReminderScheduler(bind=worker_engine)
+        scheduler.preload(now=NOW)
+        client = TestClient(create_app(scheduler))
+
+        subscriptions = client.get("/dapr/subscribe").json()
+        assert subscriptions[0]["route"] == "/events/reminders"
+
+        event = {
+            "id": "1",
+            "type": "reminder.scheduled",
+            "data": {"task_id": str(uuid4()), "scheduled_time": "2026-03-02T09:00:30"},
+        }
+        assert client.post("/events/reminders", json=event).json() == {"status": "SUCCESS"}
+        assert len(scheduler.heap) == 1
+
+        bad = {"id": "2", "type": "reminder.scheduled", "data": {"task_id": str(uuid4())}}
+        assert client.post("/events/reminders", json=bad).json() == {"status": "DROP"}
@@ -0,0 +1,114 @@
+"""Tests for the reminder worker's batch claims."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlmodel import Session
+
+from app.models import Notification, Reminder, ReminderStatusEnum
+from app.workers.reminders import BatchSizer, ReminderWorker, claim_due_reminders
+
+NOW = datetime(2026, 3, 2, 9, 0, 0)
+
+
+def _add_reminders(engine, offsets_seconds, channels=None) -> list[Reminder]:
+    reminders = [
+        Reminder(
+            id=uuid4(),
+            task_id=uuid4(),
+            user_id=uuid4(),
+            scheduled_time=NOW + timedelta(seconds=offset),
+            notification_channels={"channels": channels or ["email"]},
+        )
+        for offset in offsets_seconds
+    ]
+    with Session(engine) as session:
+        session.add_all(reminders)
+        session.commit()
+        for reminder in reminders:
+            session.refresh(reminder)
+        session.expunge_all()
+    return reminders
+
+
+class TestClaimDueReminders:
+    """Test suite for claim_due_reminders."""
+
+    def test_fires_due_reminders_oldest_first(self, worker_engine):
+        """Test that only due reminders fire, oldest first, up to the limit."""
+        reminders = _add_reminders(worker_engine, [-30, -10, -20, 60])
+
+        with Session(worker_engine) as session:
+            fired = claim_due_reminders(session, limit=2, now=NOW)
+            session.commit()
+
+        assert [r.id for r in fired] == [reminders[0].id, reminders[2].id]
+
+        with Session(worker_engine) as session:
+            statuses = {r.id: r.status for r in session.exec(select(Reminder)).scalars()}
+        assert statuses[reminders[0].id] == ReminderStatusEnum.fired
+        assert statuses[reminders[1].id] == ReminderStatusEnum.pending
+        assert statuses[reminders[3].id] == ReminderStatusEnum.pending
+
+    def test_never_fires_twice(self, worker_engine):
+        """Test that a fired reminder is not claimed again."""
+        _add_reminders(worker_engine, [-5, -4, -3])
+
+        with Session(worker_engine) as session:
+            first = claim_due_reminders(session, limit=10, now=NOW)
+            session.commit()
+            second = claim_due_reminders(session, limit=10, now=NOW)
+            session.commit()
+
+        assert len(first) == 3
+        assert second == []
+
+    def test_queues_one_notification_per_channel(self, worker_engine):
+        """Test that firing inserts pending notifications for each valid channel."""
+        _add_reminders(worker_engine, [-1], channels=["email", "push", "push", "pager"])
+
+        with Session(worker_engine) as session:
+            claim_due_reminders(session, limit=10, now=NOW)
+            session.commit()
+            channels = sorted(session.exec(select(Notification.channel)).scalars())
+
+        assert [c.value for c in channels] == ["email", "push"]
+
+
+class TestBatchSizer:
+    """Test suite for the adaptive batch size."""
+
+    def test_grows_on_backlog_and_caps(self):
+        """Test that full, fast claims double the batch up to the maximum."""
+        sizer = BatchSizer(minimum=100, maximum=500, target_seconds=0.5)
+        assert sizer.update(claimed=100, elapsed=0.01) == 200
+        assert sizer.update(claimed=200, elapsed=0.01) == 400
+        assert sizer.update(claimed=400, elapsed=0.01) == 500
+
+    def test_shrinks_when_slow_or_idle(self):
+        """Test that slow claims halve the batch and idle ones decay it."""
+        sizer = BatchSizer(minimum=100, maximum=5000, target_seconds=0.5)
+        sizer.size = 4000
+        assert sizer.update(claimed=4000, elapsed=0.9) == 2000
+        assert sizer.update(claimed=0, elapsed=0.01) == 1500
+        for _ in range(20):
+            sizer.update(claimed=0, elapsed=0.01)
+        assert sizer.size == 100
+
+
+class TestReminderWorker:
+    """Test suite for ReminderWorker.tick."""
+
+    def test_tick_drains_backlog(self, worker_engine):
+        """Test that ticks report a backlog until every due reminder fired."""
+        _add_reminders(worker_engine, [-60 - i for i in range(25)])
+        worker = ReminderWorker(bind=worker_engine, sizer=BatchSizer(minimum=10, maximum=10))
+
+        ticks = []
+        backlog = True
+        while backlog:
+            fired, backlog = worker.tick()
+            ticks.append(len(fired))
+
+        assert ticks == [10, 10, 5]
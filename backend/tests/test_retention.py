@@ -0,0 +1,87 @@
+"""Tests for the reminder/notification retention job."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from app.models import (
+    Notification,
+    NotificationChannelEnum,
+    NotificationStatusEnum,
+    Reminder,
+    ReminderStatusEnum,
+    notifications_archive,
+    reminders_archive,
+)
+from app.workers.retention import run_retention
+
+NOW = datetime(2026, 3, 20, 3, 0, 0)
+
+
+def _reminder(session, status, days_ago, notification_status=None) -> Reminder:
+    at = NOW - timedelta(days=days_ago)
+    reminder = Reminder(
+        id=uuid4(),
+        task_id=uuid4(),
+        user_id=uuid4(),
+        scheduled_time=at,
+        status=status,
+        notification_channels={"channels": ["email"]},
+        created_at=at,
+        fired_at=at if status == ReminderStatusEnum.fired else None,
+    )
+    session.add(reminder)
+    if notification_status:
+        session.add(Notification(
+            id=uuid4(),
+            reminder_id=reminder.id,
+            user_id=reminder.user_id,
+            channel=NotificationChannelEnum.email,
+            status=notification_status,
+            created_at=at,
+        ))
+    return reminder
+
+
+def _count(session, table) -> int:
+    return session.exec(select(func.count()).select_from(table)).scalar_one()
+
+
+class TestRetention:
+    """Test suite for run_retention."""
+
+    def test_moves_only_rows_past_retention(self, worker_engine):
+        """Test which reminders and notifications are archived."""
+        with Session(worker_engine) as session:
+            old_fired = _reminder(session, ReminderStatusEnum.fired, 10, NotificationStatusEnum.sent)
+            old_cancelled = _reminder(session, ReminderStatusEnum.cancelled, 10)
+            recent = _reminder(session, ReminderStatusEnum.fired, 1, NotificationStatusEnum.sent)
+            undelivered = _reminder(session, ReminderStatusEnum.fired, 10, NotificationStatusEnum.pending)
+            pending = _reminder(session, ReminderStatusEnum.pending, 10)
+            session.commit()
+            kept = {recent.id, undelivered.id, pending.id}
+            archived = {old_fired.id, old_cancelled.id}
+
+        totals = run_retention(bind=worker_engine, reminder_days=7, notification_days=30, batch_size=1, pause=0, now=NOW)
+        assert totals == {"reminders": 2, "notifications": 0}
+
+        with Session(worker_engine) as session:
+            assert set(session.exec(select(Reminder.id)).scalars()) == kept
+            assert set(session.exec(select(reminders_archive.c.id)).scalars()) == archived
+            # The archived reminder's notification moved with it
+            assert _count(session, Notification.__table__) == 2
+            assert _count(session, notifications_archive) == 1
+            row = session.exec(select(reminders_archive).where(reminders_archive.c.id == old_fired.id)).one()
+            assert row.archived_at == NOW
+            assert row.notification_channels == {"channels": ["email"]}
+
+    def test_archives_old_notifications_of_live_reminders(self, worker_engine):
+        """Test that delivered notifications age out on their own."""
+        with Session(worker_engine) as session:
+            _reminder(session, ReminderStatusEnum.fired, 40, NotificationStatusEnum.failed)
+            session.commit()
+
+        totals = run_retention(bind=worker_engine, reminder_days=365, notification_days=30, pause=0, now=NOW)
+        assert totals == {"reminders": 0, "notifications": 1}
@@ -0,0 +1,72 @@
+"""Tests for graceful shutdown draining."""
+
+import asyncio
+
+import pytest
+
+from app import shutdown
+from app.shutdown import InFlight, drain
+
+
+@pytest.fixture(name="chat_turns")
+def chat_turns_fixture(monkeypatch):
+    """A fresh chat turn counter (its idle event binds to one event loop)."""
+    turns = InFlight("chat turns")
+    monkeypatch.setattr(shutdown, "chat_turns", turns)
+    return turns
+
+
+class TestDrain:
+    """Test suite for the shutdown drain."""
+
+    def test_in_flight_tracking(self):
+        """Test that wait_idle returns once tracked work finishes."""
+        work = InFlight("work")
+
+        async def scenario():
+            async def turn():
+                with work.track():
+                    await asyncio.sleep(0.05)
+
+            task = asyncio.create_task(turn())
+            await asyncio.sleep(0)
+            assert work.count == 1
+            assert await work.wait_idle(1.0)
+            await task
+            return work.count
+
+        assert asyncio.run(scenario()) == 0
+
+    def test_drain_waits_for_chat_turns(self, chat_turns):
+        """Test that drain returns after in-flight chat turns complete."""
+        finished = []
+
+        async def scenario():
+            async def turn(delay: float):
+                with chat_turns.track():
+                    await asyncio.sleep(delay)
+                finished.append(delay)
+
+            asyncio.create_task(turn(0.05))
+            asyncio.create_task(turn(0.1))
+            await asyncio.sleep(0)
+            return await drain(timeout=2.0)
+
+        assert asyncio.run(scenario())
+        assert finished == [0.05, 0.1]
+
+    def test_drain_gives_up_at_deadline(self, chat_turns):
+        """Test that drain returns False when a chat turn outlasts the timeout."""
+        async def scenario():
+            async def turn():
+                with chat_turns.track():
+                    await asyncio.sleep(10)
+
+            task = asyncio.create_task(turn())
+            await asyncio.sleep(0)
+            drained = await drain(timeout=0.1)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            return drained, chat_turns.count
+
+        assert asyncio.run(scenario()) == (False, 0)
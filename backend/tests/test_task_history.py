@@ -0,0 +1,122 @@
+"""Tests for task activity history."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlmodel import Session
+
+from app.auth import create_jwt, hash_password
+from app.events import run_projection
+from app.events.task_history import TaskSnapshotProjection, record_task_event, task_history, task_stream_id
+from app.models import EventSnapshot, User
+
+
+def _edit_task(engine, task_id, revisions) -> None:
+    """Record a task's creation and `revisions` title changes."""
+    with Session(engine) as session:
+        record_task_event(session, "task.created", task_id, {"title": "v0", "is_complete": False})
+        for revision in range(1, revisions + 1):
+            record_task_event(session, "task.updated", task_id, {"title": f"v{revision}"})
+        session.commit()
+
+
+class TestTaskHistoryEndpoint:
+    """Test suite for GET /api/tasks/{id}/history."""
+
+    def test_lists_changes_newest_first(self, client, auth_headers):
+        """Test creation, edits and toggles appear with old and new values."""
+        task_id = client.post("/api/tasks/", json={"title": "Draft"}, headers=auth_headers).json()["id"]
+        client.put(f"/api/tasks/{task_id}", json={"title": "Final", "priority": "high"}, headers=auth_headers)
+        client.patch(f"/api/tasks/{task_id}/toggle", headers=auth_headers)
+
+        response = client.get(f"/api/tasks/{task_id}/history", headers=auth_headers)
+
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [item["event_type"] for item in items] == ["task.updated", "task.updated", "task.created"]
+        assert items[0]["changes"] == {"is_complete": {"old": False, "new": True}}
+        assert items[1]["changes"] == {
+            "title": {"old": "Draft", "new": "Final"},
+            "priority": {"old": "medium", "new": "high"},
+        }
+        assert items[2]["changes"]["title"] == {"old": None, "new": "Draft"}
+        assert response.json()["next_before"] is None
+        assert response.json()["truncated"] is False
+
+    def test_keyset_pagination(self, client, auth_headers):
+        """Test pages follow next_before without gaps or overlaps."""
+        task_id = client.post("/api/tasks/", json={"title": "t0"}, headers=auth_headers).json()["id"]
+        for revision in range(1, 5):
+            client.put(f"/api/tasks/{task_id}", json={"title": f"t{revision}"}, headers=auth_headers)
+
+        first = client.get(f"/api/tasks/{task_id}/history?limit=3", headers=auth_headers).json()
+        second = client.get(
+            f"/api/tasks/{task_id}/history?limit=3&before={first['next_before']}", headers=auth_headers
+        ).json()
+
+        titles = [item["changes"]["title"]["new"] for item in first["items"] + second["items"]]
+        assert titles == ["t4", "t3", "t2", "t1", "t0"]
+        assert second["items"][0]["changes"]["title"] == {"old": "t0", "new": "t1"}
+        assert second["next_before"] is None
+
+    def test_task_without_creation_event_is_truncated(self, client, auth_headers, test_task):
+        """Test a task created before history was recorded shows no invented old values."""
+        client.put(f"/api/tasks/{test_task.id}", json={"title": "Renamed"}, headers=auth_headers)
+        client.put(f"/api/tasks/{test_task.id}", json={"title": "Renamed again"}, headers=auth_headers)
+
+        body = client.get(f"/api/tasks/{test_task.id}/history", headers=auth_headers).json()
+
+        assert body["truncated"] is True
+        assert body["items"][0]["changes"] == {"title": {"old": "Renamed", "new": "Renamed again"}}
+        # The first recorded edit's old title predates the stream
+        assert body["items"][1]["changes"] == {}
+
+    def test_requires_owner(self, client, session, test_task):
+        """Test unknown tasks are 404 and other users' tasks 403."""
+        other = User(email="other@example.com", hashed_password=hash_password("password123"), name="Other")
+        session.add(other)
+        session.commit()
+        headers = {"Cookie": f"access_token={create_jwt(other.id)}"}
+
+        assert client.get(f"/api/tasks/{test_task.id}/history", headers=headers).status_code == 403
+        assert client.get("/api/tasks/99999/history", headers=headers).status_code == 404
+
+
+class TestTaskSnapshots:
+    """Test suite for TaskSnapshotProjection."""
+
+    def test_snapshots_every_interval(self, event_engine):
+        """Test snapshots are taken once enough events accumulate since the last one."""
+        _edit_task(event_engine, 1, revisions=14)
+        _edit_task(event_engine, 2, revisions=2)
+
+        later = datetime.utcnow() + timedelta(minutes=1)
+        run_projection(TaskSnapshotProjection(interval=5), bind=event_engine, batch_size=4, now=later)
+
+        with Session(event_engine) as session:
+            snapshots = session.exec(select(EventSnapshot).order_by(EventSnapshot.position)).scalars().all()
+        # Task 1 is positions 1-15: a snapshot at the end of the first batch
+        # with 5 pending events (8), then at 15 (7 pending); task 2 has 3 events
+        assert {s.aggregate_id for s in snapshots} == {task_stream_id(1)}
+        assert [(s.position, s.state["title"]) for s in snapshots] == [(8, "v7"), (15, "v14")]
+
+    def test_history_is_unchanged_by_snapshots(self, event_engine):
+        """Test every page reads the same with and without snapshots."""
+        _edit_task(event_engine, 1, revisions=20)
+
+        def pages():
+            result, before = [], None
+            with Session(event_engine) as session:
+                while True:
+                    entries, before, _ = task_history(session, 1, before=before, limit=4)
+                    result.extend(entries)
+                    if before is None:
+                        return result
+
+        without = pages()
+        later = datetime.utcnow() + timedelta(minutes=1)
+        run_projection(TaskSnapshotProjection(interval=5), bind=event_engine, now=later)
+
+        assert pages() == without
+        assert [entry.changes["title"] for entry in without[:2]] == [("v19", "v20"), ("v18", "v19")]
+        assert len(without) == 21